@@ -0,0 +1,85 @@
+"""
+Replay DeltaNeutralStrategy over recorded or synthetic prices.
+
+    python -m backtest --synthetic 200000 --interval-minutes 5 --fee-bps 4.5
+    python -m backtest --csv prices.csv --config config.yaml
+    python -m backtest --ticks ticks --symbols BTC,BTCUSDT --step 1
+    python -m backtest --synthetic 200000 --sweep --notionals 100,200 --intervals 1,5,15 --thresholds 0,5,10,20
+"""
+import argparse, time, yaml
+import numpy as np
+from backtest.data import PriceSeries
+from backtest.engine import ReplayEngine
+from backtest.sweep import sweep
+from market_data.recorder import TickReader
+from models.asset import ExchangeName
+from utils import logger
+
+def floats(text: str) -> list[float]:
+    return [float(x) for x in text.split(",")]
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m backtest", description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--csv", help="CSV with columns ts,price_a,price_b (A = Hyperliquid, B = Binance)")
+    source.add_argument("--synthetic", type=int, metavar="TICKS", help="generate a random-walk series of this many 1s ticks")
+    source.add_argument("--ticks", metavar="DIR", help="directory written by the market data tick recorder")
+    parser.add_argument("--symbols", default="BTC,BTCUSDT", help="Hyperliquid,Binance symbols to read from --ticks")
+    parser.add_argument("--step", type=float, default=1.0, help="resampling step in seconds for --ticks")
+    parser.add_argument("--config", help="config.yaml to take the pair, notional, interval and trigger from")
+    parser.add_argument("--notional", type=float, default=200)
+    parser.add_argument("--interval-minutes", type=float, default=5)
+    parser.add_argument("--min-spread-bps", type=float, default=0)
+    parser.add_argument("--netting", action="store_true", help="rebalance by the difference instead of closing and reopening")
+    parser.add_argument("--fee-bps", type=float, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--half-spread-bps", type=float, default=0)
+    parser.add_argument("--sweep", action="store_true", help="vectorized grid over --notionals x --intervals x --thresholds")
+    parser.add_argument("--notionals", type=floats, default=[200])
+    parser.add_argument("--intervals", type=floats, default=[1, 5, 15])
+    parser.add_argument("--thresholds", type=floats, default=[0, 5, 10, 20])
+    args = parser.parse_args()
+
+    if args.csv:
+        series = PriceSeries.from_csv(args.csv)
+    elif args.ticks:
+        symbol_a, symbol_b = args.symbols.split(",")
+        reader = TickReader(args.ticks)
+        series = PriceSeries.from_ticks(reader, (ExchangeName.HYPERLIQUID.value, symbol_a), (ExchangeName.BINANCE.value, symbol_b), args.step)
+    else:
+        series = PriceSeries.synthetic(args.synthetic)
+    costs = dict(fee_bps=args.fee_bps, latency_ms=args.latency_ms, half_spread_bps=args.half_spread_bps)
+    hours = (series.ts[-1] - series.ts[0]) / 3600
+    print(f"{len(series)} ticks covering {hours:.1f} hours")
+
+    if args.sweep:
+        started = time.perf_counter()
+        result = sweep(series, args.notionals, args.intervals, args.thresholds, **costs)
+        elapsed = time.perf_counter() - started
+        print(f"{result['pnl'].size} parameter sets in {elapsed * 1e3:.1f} ms")
+        for i, notional in enumerate(args.notionals):
+            for j, interval in enumerate(args.intervals):
+                for k, threshold in enumerate(args.thresholds):
+                    print(f"notional {notional:>8g}  interval {interval:>5g}m  threshold {threshold:>5g} bps  "
+                          f"pnl {result['pnl'][i, j, k]:>10.4f}  fees {result['fees'][i, j, k]:>9.4f}  trades {result['trades'][i, j, k]:>6d}")
+        best = np.unravel_index(np.argmax(result["pnl"]), result["pnl"].shape)
+        print(f"best: notional {args.notionals[best[0]]:g}, interval {args.intervals[best[1]]:g}m, "
+              f"threshold {args.thresholds[best[2]]:g} bps -> pnl {result['pnl'][best]:.4f}")
+        return
+
+    if args.config:
+        cfg = yaml.safe_load(open(args.config))
+    else:
+        cfg = {"base_asset": "BTC", "quote_asset": "USDT", "notional": args.notional,
+               "interval_minutes": args.interval_minutes, "min_spread_bps": args.min_spread_bps, "netting": args.netting}
+
+    logger.configure({"file": None, "console": False})
+    result = ReplayEngine(series, cfg, **costs).run()
+    print(f"{result.steps} steps, {result.orders} orders, {result.errors} errors in {result.wall_seconds:.2f}s "
+          f"({result.speedup():,.0f}x real time)")
+    print(f"pnl {result.pnl:.4f} (fees {result.fees:.4f}), max drawdown {np.max(np.maximum.accumulate(result.equity) - result.equity):.4f}")
+    for line in result.ledger.summary():
+        print(f"ledger: {line}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+class VirtualClock:
+    """Replay time in seconds. Callable, so it can stand in for time.monotonic."""
+    def __init__(self, start: float = 0.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
@@ -0,0 +1,57 @@
+import numpy as np
+
+class PriceSeries:
+    """
+    Aligned mid prices for venue A (Hyperliquid) and venue B (Binance).
+    ts is in seconds and sorted ascending; prices are float64 arrays of the same length.
+    """
+    def __init__(self, ts: np.ndarray, price_a: np.ndarray, price_b: np.ndarray):
+        if not len(ts) == len(price_a) == len(price_b):
+            raise Exception("ts, price_a and price_b must have the same length")
+        self.ts = np.asarray(ts, dtype=np.float64)
+        self.price_a = np.asarray(price_a, dtype=np.float64)
+        self.price_b = np.asarray(price_b, dtype=np.float64)
+
+    def __len__(self):
+        return len(self.ts)
+
+    def index_at(self, t):
+        """Index of the last tick at or before t (scalar or array), clamped to the series"""
+        return np.clip(np.searchsorted(self.ts, t, side="right") - 1, 0, len(self.ts) - 1)
+
+    @classmethod
+    def from_csv(cls, path: str) -> "PriceSeries":
+        """CSV with a header row and columns ts, price_a, price_b"""
+        data = np.loadtxt(path, delimiter=",", skiprows=1, dtype=np.float64, ndmin=2)
+        return cls(data[:, 0], data[:, 1], data[:, 2])
+
+    @classmethod
+    def from_ticks(cls, reader, a: tuple[str, str], b: tuple[str, str], step: float = 1.0,
+                   start_ns: int = None, end_ns: int = None) -> "PriceSeries":
+        """
+        Resample two recorded (venue, symbol) tick streams onto a common grid of `step`
+        seconds, carrying the last mid forward. `reader` is a market_data.recorder.TickReader.
+        """
+        ts_a, mid_a = reader.mids(*a, start_ns, end_ns)
+        ts_b, mid_b = reader.mids(*b, start_ns, end_ns)
+        if len(ts_a) == 0 or len(ts_b) == 0:
+            raise Exception(f"No recorded ticks for {a if len(ts_a) == 0 else b}")
+        grid = np.arange(max(ts_a[0], ts_b[0]), min(ts_a[-1], ts_b[-1]) + step, step)
+        ia = np.searchsorted(ts_a, grid, side="right") - 1
+        ib = np.searchsorted(ts_b, grid, side="right") - 1
+        return cls(grid, mid_a[ia], mid_b[ib])
+
+    @classmethod
+    def synthetic(cls, n: int, step: float = 1.0, start_price: float = 89000.0, vol_bps: float = 2.0,
+                  spread_bps: float = 15.0, spread_vol_bps: float = 1.0, seed: int = 0) -> "PriceSeries":
+        """Random-walk mid on A with B at a mean-reverting premium, for demos and benchmarks"""
+        rng = np.random.default_rng(seed)
+        ts = np.arange(n, dtype=np.float64) * step
+        price_a = start_price * np.exp(np.cumsum(rng.normal(0, vol_bps / 1e4, n)))
+        spread = np.empty(n)
+        spread[0] = spread_bps
+        shocks = rng.normal(0, spread_vol_bps, n)
+        for i in range(1, n):
+            spread[i] = spread[i - 1] + 0.05 * (spread_bps - spread[i - 1]) + shocks[i]
+        price_b = price_a * (1 + spread / 1e4)
+        return cls(ts, price_a, price_b)
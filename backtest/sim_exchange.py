@@ -0,0 +1,99 @@
+import numpy as np
+from decimal import Decimal
+from backtest.clock import VirtualClock
+from exchanges.base import Exchange
+from models.asset import ExchangeAsset, ExchangeName, TradingPair
+from models.order import Order, PreparedOrder, Side
+
+class SimulatedExchange(Exchange):
+    """
+    Exchange implementation over a recorded mid-price series.
+    Market orders fill at the mid `latency_ms` after the virtual clock, crossed by
+    `half_spread_bps`, and pay `fee_bps` of the filled notional. Cash flows are
+    tracked so PnL does not depend on what the strategy logs.
+    """
+    def __init__(self, name: ExchangeName, ts: np.ndarray, prices: np.ndarray, clock: VirtualClock,
+                 fee_bps: float = 0.0, latency_ms: float = 0.0, half_spread_bps: float = 0.0, quantity_precision: int = 8):
+        self.name = name
+        self.base_url = "sim://" + name.value.lower()
+        self.key = ""
+        self.secret = ""
+        self.positions: dict[str, Order] = {}
+
+        self.ts = ts
+        self.prices = prices
+        self.clock = clock
+        self.fee_rate = fee_bps / 1e4
+        self.latency = latency_ms / 1000
+        self.half_spread = half_spread_bps / 1e4
+        self.quantity_precision = quantity_precision
+
+        self.cash = 0.0      # Realized cash flow including fees
+        self.fees = 0.0
+        self.orders = 0
+
+    def _mid(self, t: float) -> float:
+        i = np.searchsorted(self.ts, t, side="right") - 1
+        return float(self.prices[max(i, 0)])
+
+    def _fill(self, asset: ExchangeAsset, side: Side, size: Decimal) -> Decimal:
+        mid = self._mid(self.clock() + self.latency)
+        price = mid * (1 + self.half_spread) if side == Side.LONG else mid * (1 - self.half_spread)
+        notional = float(size) * price
+        fee = notional * self.fee_rate
+        self.cash += (-notional if side == Side.LONG else notional) - fee
+        self.fees += fee
+        self.orders += 1
+        return Decimal(str(round(price, 8)))
+
+    async def get_asset_info(self, pair: TradingPair) -> ExchangeAsset:
+        symbol = pair.hyperliquid_symbol() if self.name == ExchangeName.HYPERLIQUID else pair.binance_symbol()
+        return ExchangeAsset(pair=pair, exchange=self.name, exchange_symbol=symbol, base_quantity_precision=self.quantity_precision)
+
+    async def get_price(self, asset: ExchangeAsset) -> Decimal:
+        return Decimal(str(round(self._mid(self.clock()), 8)))
+
+    async def open_position(self, asset: ExchangeAsset, side: Side, price: Decimal, notional: Decimal) -> Order:
+        qty = round(notional / price, asset.base_quantity_precision)
+        order = Order(asset=asset, side=side, price=self._fill(asset, side, qty), size=qty)
+        self.positions[asset.exchange_symbol] = order
+        return order
+
+    async def prepare_order(self, asset: ExchangeAsset, side: Side, price: Decimal, notional: Decimal) -> PreparedOrder:
+        prepared = PreparedOrder(asset, side, price, round(notional / price, asset.base_quantity_precision), expires_at=float("inf"))
+
+        async def send() -> Order:
+            prepared.sent_at = self.clock()
+            return await self.open_position(asset, side, price, notional)
+
+        prepared.send = send
+        return prepared
+
+    async def open_long(self, asset: ExchangeAsset, price: Decimal, notional: Decimal) -> Order:
+        return await self.open_position(asset, Side.LONG, price, notional)
+
+    async def open_short(self, asset: ExchangeAsset, price: Decimal, notional: Decimal) -> Order:
+        return await self.open_position(asset, Side.SHORT, price, notional)
+
+    async def rebalance(self, asset: ExchangeAsset, side: Side, size: Decimal, price: Decimal) -> Order:
+        trade_side, qty = self.net_order(asset, side, size)
+        if not qty:
+            return None
+        order = Order(asset=asset, side=trade_side, price=self._fill(asset, trade_side, qty), size=qty)
+        self.set_position(asset, side, size, order.price)
+        return order
+
+    async def close_position(self, asset: ExchangeAsset, close_price: Decimal) -> Order:
+        position = self.positions.pop(asset.exchange_symbol, None)
+        if not position:
+            raise Exception(f"No {asset.exchange_symbol} position to close")
+        side = Side.SHORT if position.side == Side.LONG else Side.LONG
+        return Order(asset=asset, side=side, price=self._fill(asset, side, position.size), size=position.size)
+
+    def equity(self, t: float) -> float:
+        """Cash plus open positions marked at the mid at t"""
+        value = self.cash
+        for order in self.positions.values():
+            signed = float(order.size) if order.side == Side.LONG else -float(order.size)
+            value += signed * self._mid(t)
+        return value
@@ -0,0 +1,135 @@
+"""
+L2 order books: the cost of applying a depth diff to the sorted-array OrderBook versus
+a dict of levels that has to be sorted again before every VWAP, and versus rebuilding
+the book from a full snapshot on every tick. Also the cost of an expected-VWAP / impact
+query, and the slippage of one large market order versus slices sized to an impact budget.
+
+Diffs look like Binance @depth@100ms messages: a handful of level changes near the touch,
+some of them deletions (size 0). The slicing model assumes the book refills between
+slices, which is what child_interval_ms waits for.
+
+Run from the repository root:
+    python -m benchmarks.bench_book [symbols] [diffs_per_symbol] [levels]
+"""
+import sys, time
+import numpy as np
+from market_data.book import OrderBook
+from models.order import Side
+
+def diffs(count: int, levels: int, seed: int = 5) -> list[tuple[list, list]]:
+    rng = np.random.default_rng(seed)
+    out = []
+    for _ in range(count):
+        sides = []
+        for sign in (-1, 1):
+            n = int(rng.integers(2, 10))
+            prices = np.round(90000 + sign * (0.1 + rng.integers(0, levels, n) * 0.1), 1)
+            sizes = np.where(rng.random(n) < 0.3, 0.0, np.round(rng.exponential(0.05, n), 3))
+            sides.append([[str(p), str(s)] for p, s in zip(prices, sizes)])
+        out.append((sides[0], sides[1]))
+    return out
+
+def snapshot(levels: int, step: float = 0.1, size: str = "0.05") -> tuple[list, list]:
+    bids = [[str(round(90000 - step * (i + 1), 1)), size] for i in range(levels)]
+    asks = [[str(round(90000 + step * (i + 1), 1)), size] for i in range(levels)]
+    return bids, asks
+
+class DictBook:
+    """Baseline: price -> size dicts, sorted when a VWAP is needed"""
+    def __init__(self, bids, asks):
+        self.sides = [{float(p): float(s) for p, s in bids}, {float(p): float(s) for p, s in asks}]
+
+    def apply(self, bids, asks):
+        for side, levels in zip(self.sides, (bids, asks)):
+            for p, s in levels:
+                if float(s):
+                    side[float(p)] = float(s)
+                else:
+                    side.pop(float(p), None)
+
+    def vwap(self, notional: float) -> float:
+        cost = size = 0.0
+        for price in sorted(self.sides[1]):
+            take = min(self.sides[1][price], (notional - cost) / price)
+            cost += take * price
+            size += take
+            if cost >= notional:
+                break
+        return cost / size
+
+def per_tick(symbols: int, count: int, levels: int) -> dict[str, tuple[float, float]]:
+    """(update, update + VWAP) seconds per diff for each book kind"""
+    stream = diffs(count, levels)
+    bids, asks = snapshot(levels)
+    results = {}
+
+    books = [OrderBook(levels) for _ in range(symbols)]
+    for book in books:
+        book.snapshot(bids, asks)
+    for query in (False, True):
+        started = time.perf_counter()
+        for b, a in stream:
+            for book in books:
+                book.apply(b, a)
+                if query:
+                    book.vwap(Side.LONG, 50000)
+        results.setdefault("sorted arrays", []).append((time.perf_counter() - started) / (count * symbols))
+
+    dict_books = [DictBook(bids, asks) for _ in range(symbols)]
+    for query in (False, True):
+        started = time.perf_counter()
+        for b, a in stream:
+            for book in dict_books:
+                book.apply(b, a)
+                if query:
+                    book.vwap(50000)
+        results.setdefault("dict + sort", []).append((time.perf_counter() - started) / (count * symbols))
+
+    rebuild = OrderBook(levels)
+    started = time.perf_counter()
+    for _ in range(count):
+        for _ in range(symbols):
+            rebuild.snapshot(bids, asks)
+    elapsed = (time.perf_counter() - started) / (count * symbols)
+    results["full snapshot"] = [elapsed, elapsed]
+    return results
+
+def slicing(levels: int, budget_bps: float) -> list[tuple[float, float, int, float]]:
+    """(notional, single-order bps, slices, sliced bps) on a thin book of 0.01 BTC per $1 level"""
+    book = OrderBook(levels)
+    book.snapshot(*snapshot(levels, step=1.0, size="0.01"))
+    rows = []
+    for notional in (5000, 20000, 50000, 100000, 150000):
+        single = book.impact_bps(Side.LONG, notional)
+        child = max(book.max_notional(Side.LONG, budget_bps), 1.0)
+        slices = int(np.ceil(notional / child))
+        sliced = book.impact_bps(Side.LONG, notional / slices)
+        rows.append((notional, single, slices, sliced))
+    return rows
+
+def main(symbols: int, count: int, levels: int):
+    print(f"{symbols} symbols, {count} diffs each, {levels} levels per side")
+    for name, (update, with_vwap) in per_tick(symbols, count, levels).items():
+        print(f"{name:>14}: {update * 1e6:7.2f} us per diff | with a VWAP query {with_vwap * 1e6:7.2f} us "
+              f"| {1 / with_vwap:>9,.0f} ticks/s on one core")
+
+    book = OrderBook(levels)
+    book.snapshot(*snapshot(levels))
+    rounds = 20000
+    started = time.perf_counter()
+    for _ in range(rounds):
+        book.impact_bps(Side.LONG, 50000)
+    impact = (time.perf_counter() - started) / rounds
+    started = time.perf_counter()
+    for _ in range(rounds):
+        book.max_notional(Side.LONG, 2)
+    budget = (time.perf_counter() - started) / rounds
+    print(f"\nimpact_bps() {impact * 1e6:.2f} us | max_notional() {budget * 1e6:.2f} us")
+
+    print("\nmarket order vs. slices within a 2 bps budget (book refilled between slices)")
+    for notional, single, slices, sliced in slicing(levels, 2):
+        print(f"${notional:>9,}: one order {single:6.2f} bps | {slices:>3} slices {sliced:5.2f} bps each")
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 50, int(args[1]) if len(args) > 1 else 200, int(args[2]) if len(args) > 2 else 200)
@@ -0,0 +1,146 @@
+"""
+End-to-end trading cycles against the local venue simulator (simulator/server.py): the
+real BinanceFutures and Hyperliquid adapters under DeltaNeutralStrategy.cycle(), nothing
+stubbed. The simulator runs in its own process, so the CPU time measured here is the
+bot's alone (including the Hyperliquid SDK threads).
+
+Every scenario starts a fresh simulator and runs the cycles back to back, reporting cycle
+latency percentiles, the skew between the legs of each paired open/close/rebalance,
+requests per cycle as counted by the simulator, and CPU per cycle. "user stream" takes
+Binance fills from the user data stream instead of the order responses.
+
+Given a baseline path, the results are compared against that file if it exists and
+written to it otherwise, so the same command before and after a change shows the
+difference per metric. The simulator is seeded, so prices, jitter and injected errors
+repeat from run to run.
+
+Run from the repository root:
+    python -m benchmarks.bench_cycle [cycles] [latency_ms] [baseline.json]
+"""
+import asyncio, json, multiprocessing, os, sys, time
+import aiohttp, eth_account
+from exchanges.binance import BinanceFutures
+from exchanges.hyperliquid import Hyperliquid
+from simulator.server import Simulator
+from strategy.delta_neutral import DeltaNeutralStrategy
+from utils import logger, metrics
+
+TEST_KEY = "0x" + "11" * 32
+PAIR = {"base_asset": "BTC", "quote_asset": "USDT", "notional": 200, "interval_minutes": 1}
+
+# Label: (strategy config, simulator config, Binance adapter config)
+SCENARIOS = {
+    "close + reopen": ({}, {}, {}),
+    "netting": ({"netting": True}, {}, {}),
+    "pre-signed": ({"execution": {"presigned": True}}, {}, {}),
+    "user stream": ({}, {}, {"user_stream": {"enabled": True}}),
+    "2% errors": ({}, {"error_rate": 0.02}, {}),
+}
+
+def run_simulator(cfg, conn):
+    async def serve():
+        simulator = Simulator(cfg)
+        conn.send(await simulator.start())
+        # Serve until the benchmark sends anything down the pipe
+        await asyncio.get_running_loop().run_in_executor(None, conn.recv)
+        await simulator.stop()
+    asyncio.run(serve())
+
+async def sim_requests(session: aiohttp.ClientSession, base_url: str) -> int:
+    async with session.get(f"{base_url}/_sim/stats") as r:
+        return sum((await r.json())["requests"].values())
+
+def skew_histogram() -> metrics.Histogram:
+    """Leg skew of the order phases merged into one histogram, price fetches left out"""
+    merged = metrics.Histogram()
+    # Pre-signed opens record the gap between the two submits as leg_submit_skew_seconds
+    for name, phase in (("leg_skew_seconds", "open"), ("leg_skew_seconds", "close"),
+                        ("leg_skew_seconds", "rebalance"), ("leg_submit_skew_seconds", "open")):
+        hist = metrics.histogram(name, phase=phase)
+        merged.counts = [a + b for a, b in zip(merged.counts, hist.counts)]
+        merged.count += hist.count
+        merged.sum += hist.sum
+        merged.max = max(merged.max, hist.max)
+    return merged
+
+async def run_scenario(ctx, strategy_cfg: dict, sim_cfg: dict, binance_cfg: dict, cycles: int) -> dict:
+    parent, child = ctx.Pipe()
+    process = ctx.Process(target=run_simulator, args=(sim_cfg, child))
+    process.start()
+    base_url = parent.recv()
+    metrics.reset()
+
+    account = eth_account.Account.from_key(TEST_KEY)
+    bn = BinanceFutures({"base_url": base_url, "ws_url": base_url.replace("http", "ws", 1) + "/ws",
+                         "api_key": "k", "api_secret": "s", **binance_cfg})
+    hl = Hyperliquid({"base_url": base_url, "api_key": account.address, "api_secret": TEST_KEY})
+    session = aiohttp.ClientSession()
+    failures = 0
+    try:
+        await asyncio.gather(bn.initialize(), hl.initialize())
+        while bn.user_stream and not bn.user_stream.live:
+            await asyncio.sleep(0.01)
+        strategy = DeltaNeutralStrategy([hl, bn], {**PAIR, **strategy_cfg})
+        await strategy.initialize()
+        # One warm-up cycle opens the first position and the connection pools
+        await strategy.cycle()
+
+        requests = await sim_requests(session, base_url)
+        metrics.reset()
+        cpu = time.process_time()
+        for _ in range(cycles):
+            try:
+                await strategy.cycle()
+            except Exception:
+                failures += 1
+        cpu = time.process_time() - cpu
+        requests = await sim_requests(session, base_url) - requests
+    finally:
+        await session.close()
+        await asyncio.gather(bn.close(), hl.close())
+        parent.send(None)
+        process.join()
+
+    cycle = metrics.histogram("cycle_seconds", pair=str(strategy.pair))
+    skew = skew_histogram()
+    return {
+        "cycle_p50_ms": cycle.quantile(0.5) * 1e3,
+        "cycle_p99_ms": cycle.quantile(0.99) * 1e3,
+        "skew_p50_ms": skew.quantile(0.5) * 1e3,
+        "skew_p99_ms": skew.quantile(0.99) * 1e3,
+        "requests_per_cycle": requests / cycles,
+        "cpu_ms_per_cycle": cpu / cycles * 1e3,
+        "failed_cycles": failures,
+    }
+
+def report(label: str, result: dict, baseline: dict = None):
+    line = (f"{label:<15} cycle p50 {result['cycle_p50_ms']:7.1f} ms p99 {result['cycle_p99_ms']:7.1f} ms | "
+            f"leg skew p50 {result['skew_p50_ms']:6.2f} ms p99 {result['skew_p99_ms']:6.2f} ms | "
+            f"{result['requests_per_cycle']:5.1f} req/cycle | CPU {result['cpu_ms_per_cycle']:6.2f} ms/cycle")
+    if result["failed_cycles"]:
+        line += f" | {result['failed_cycles']} failed"
+    print(line)
+    if baseline:
+        changes = [f"{key} {(result[key] - baseline[key]) / baseline[key]:+.0%}"
+                   for key in ("cycle_p50_ms", "cycle_p99_ms", "skew_p99_ms", "requests_per_cycle", "cpu_ms_per_cycle")
+                   if baseline.get(key)]
+        print(f"{'':<15} vs baseline: {', '.join(changes)}")
+
+async def main(cycles: int, latency_ms: float, baseline_path: str):
+    logger.configure({"file": None, "console": False})
+    ctx = multiprocessing.get_context("spawn")
+    baseline = json.load(open(baseline_path)) if baseline_path and os.path.exists(baseline_path) else None
+    print(f"{cycles} cycles per scenario, {latency_ms:g} ms simulated latency (+{latency_ms / 4:g} ms mean jitter) per venue")
+    results = {}
+    for label, (strategy_cfg, sim_cfg, binance_cfg) in SCENARIOS.items():
+        sim_cfg = {"latency_ms": latency_ms, "jitter_ms": latency_ms / 4, **sim_cfg}
+        results[label] = await run_scenario(ctx, strategy_cfg, sim_cfg, binance_cfg, cycles)
+        report(label, results[label], (baseline or {}).get(label))
+    if baseline_path and baseline is None:
+        json.dump(results, open(baseline_path, "w"), indent=2)
+        print(f"Baseline written to {baseline_path}")
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(int(args[0]) if args else 50, float(args[1]) if len(args) > 1 else 20,
+                     args[2] if len(args) > 2 else None))
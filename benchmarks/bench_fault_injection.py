@@ -0,0 +1,106 @@
+"""
+Cycle latency against a faulty venue, with and without deadlines, retries and
+hedged reads.
+
+A local Binance stand-in answers ticker/price and order requests after a few
+milliseconds, but stalls a fraction of them for `stall` seconds and answers a
+fraction of orders with a -1001 internal error (half of those orders were in
+fact placed). A cycle is get_price + open_position + close_position. Besides
+cycle p50/p99 the stand-in counts fills, so any double fill caused by a retry
+shows up as more fills than orders the bot meant to place.
+
+Run from the repository root:
+    python -m benchmarks.bench_fault_injection [cycles] [stall_rate] [stall_seconds]
+"""
+import asyncio, random, statistics, sys, time
+from decimal import Decimal
+from aiohttp import web
+from exchanges.binance import BinanceFutures
+from models.asset import ExchangeAsset, ExchangeName, TradingPair
+from utils import logger
+
+CONFIGS = {
+    "no deadlines": {"request_seconds": 60, "attempts": 1, "hedge": False},
+    "deadlines+hedging": {"request_seconds": 0.25, "attempts": 4, "backoff_ms": 20, "max_backoff_ms": 100,
+                          "hedge_after_ms": 30, "hedge_min_samples": 20},
+}
+
+class FaultyVenue:
+    def __init__(self, stall_rate: float, stall: float, error_rate: float):
+        self.stall_rate = stall_rate
+        self.stall = stall
+        self.error_rate = error_rate
+        self.orders: dict[str, dict] = {}
+        self.fills = 0
+
+    async def delay(self):
+        await asyncio.sleep(self.stall if random.random() < self.stall_rate else random.uniform(0.002, 0.006))
+
+    async def price(self, request):
+        await self.delay()
+        return web.json_response({"symbol": "BTCUSDT", "price": "89000.0"})
+
+    async def place(self, request):
+        params = dict(await request.post()) or dict(request.query)
+        client_id = params["newClientOrderId"]
+        if client_id in self.orders:
+            return web.json_response({"code": -4116, "msg": "ClientOrderId is duplicated."})
+        failed = random.random() < self.error_rate
+        if not failed or random.random() < 0.5:
+            self.orders[client_id] = {"orderId": len(self.orders) + 1, "clientOrderId": client_id, "status": "FILLED"}
+            self.fills += 1
+        await self.delay()
+        if failed:
+            return web.json_response({"code": -1001, "msg": "Internal error; unable to process your request."}, status=503)
+        return web.json_response(self.orders[client_id])
+
+    async def query(self, request):
+        await asyncio.sleep(0.002)
+        order = self.orders.get(request.query["origClientOrderId"])
+        return web.json_response(order or {"code": -2013, "msg": "Order does not exist."})
+
+async def run(label: str, timeouts: dict, cycles: int, venue: FaultyVenue, base_url: str):
+    bn = BinanceFutures({"base_url": base_url, "api_key": "k", "api_secret": "s", "timeouts": timeouts})
+    await bn.initialize()
+    asset = ExchangeAsset(TradingPair("BTC", "USDT"), ExchangeName.BINANCE, "BTCUSDT", 3)
+    venue.fills, venue.orders = 0, {}
+    times, failures = [], 0
+    for _ in range(cycles):
+        start = time.perf_counter()
+        try:
+            price = await bn.get_price(asset)
+            await bn.open_long(asset, price, Decimal("200"))
+            await bn.close_position(asset, price)
+        except Exception:
+            failures += 1
+            bn.positions.clear()
+        times.append(time.perf_counter() - start)
+    await bn.close()
+
+    times.sort()
+    p99 = times[min(len(times) - 1, int(len(times) * 0.99))]
+    print(f"{label:<18} cycle p50 {statistics.median(times) * 1e3:7.1f} ms, p99 {p99 * 1e3:7.1f} ms, "
+          f"max {times[-1] * 1e3:7.1f} ms | failed cycles {failures:3d} | fills {venue.fills} for {len(venue.orders)} orders")
+
+async def main(cycles: int, stall_rate: float, stall: float):
+    logger.configure({"file": None, "console": False})
+    venue = FaultyVenue(stall_rate, stall, error_rate=0.03)
+    app = web.Application()
+    app.router.add_get("/fapi/v2/ticker/price", venue.price)
+    app.router.add_post("/fapi/v1/order", venue.place)
+    app.router.add_get("/fapi/v1/order", venue.query)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    base_url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+    print(f"{cycles} cycles, {stall_rate:.0%} of requests stalled for {stall:g}s, 3% of orders answered with -1001")
+    for label, timeouts in CONFIGS.items():
+        await run(label, timeouts, cycles, venue, base_url)
+    await runner.cleanup()
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(int(args[0]) if args else 200, float(args[1]) if len(args) > 1 else 0.02,
+                     float(args[2]) if len(args) > 2 else 1.0))
@@ -0,0 +1,62 @@
+"""
+Per-request latency of a fresh aiohttp.ClientSession per call (the old
+BinanceFutures behaviour) versus the pooled keep-alive session, measured
+against a local stand-in for the Binance ticker endpoint.
+
+Run from the repository root:
+    python -m benchmarks.bench_http_session [requests]
+"""
+import asyncio, statistics, sys, time
+import aiohttp
+from aiohttp import web
+from exchanges.binance import BinanceFutures
+from models.asset import ExchangeAsset, ExchangeName, TradingPair
+
+async def ticker(request):
+    return web.json_response({"symbol": request.query["symbol"], "price": "89201.10"})
+
+def summarize(label: str, samples: list[float]):
+    samples = sorted(samples)
+    p99 = samples[int(len(samples) * 0.99) - 1]
+    print(f"{label:<22} mean {statistics.mean(samples) * 1e3:7.3f} ms | "
+          f"p50 {statistics.median(samples) * 1e3:7.3f} ms | p99 {p99 * 1e3:7.3f} ms")
+
+async def main(n: int):
+    app = web.Application()
+    app.router.add_get("/fapi/v2/ticker/price", ticker)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    base_url = f"http://127.0.0.1:{port}"
+
+    # Old behaviour: one ClientSession (and TCP connection) per call
+    fresh = []
+    for _ in range(n):
+        start = time.perf_counter()
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"{base_url}/fapi/v2/ticker/price?symbol=BTCUSDT") as r:
+                await r.json()
+        fresh.append(time.perf_counter() - start)
+
+    # New behaviour: BinanceFutures reusing its pooled session
+    ex = BinanceFutures({"base_url": base_url, "api_key": "", "api_secret": ""})
+    await ex.initialize()
+    asset = ExchangeAsset(TradingPair("BTC", "USDT"), ExchangeName.BINANCE, "BTCUSDT", 3)
+    pooled = []
+    for _ in range(n):
+        start = time.perf_counter()
+        await ex.get_price(asset)
+        pooled.append(time.perf_counter() - start)
+    await ex.close()
+    await runner.cleanup()
+
+    print(f"{n} sequential ticker requests against {base_url} (plain HTTP, no TLS)")
+    summarize("session per request", fresh)
+    summarize("pooled session", pooled)
+    saved = statistics.mean(fresh) - statistics.mean(pooled)
+    print(f"saved per request: {saved * 1e3:.3f} ms (a TLS endpoint adds a full handshake on top)")
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 500))
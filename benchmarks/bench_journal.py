@@ -0,0 +1,63 @@
+"""
+Position journal: cost of journaling with one fsync per record versus batched
+group commits, and startup replay time as the history grows with and without
+snapshot compaction.
+
+Run from the repository root:
+    python -m benchmarks.bench_journal [records]
+"""
+import asyncio, shutil, sys, tempfile, time
+from strategy.journal import Journal
+from utils import logger
+
+POSITION = {"exchange": "Binance", "symbol": "BTCUSDT", "side": "LONG", "price": "89000.1", "size": "0.002"}
+
+def write(journal: Journal, i: int):
+    pair = f"P{i % 20}-USDT"
+    if i % 2:
+        journal.append(pair, "intent", action="open", long="Binance", short="Hyperliquid")
+    else:
+        journal.append(pair, "position", long=POSITION, short={**POSITION, "side": "SHORT"}, opened_ts=time.time())
+
+async def append_rate(root: str, records: int, per_record_fsync: bool) -> float:
+    journal = Journal(root, batch_ms=5)
+    started = time.perf_counter()
+    for i in range(records):
+        write(journal, i)
+        if per_record_fsync:
+            await journal.flush()
+        elif i % 50 == 0:
+            await asyncio.sleep(0)   # let the batched flushes run, as a live bot would between orders
+    await journal.close()
+    return (time.perf_counter() - started) / records
+
+async def replay_time(root: str, records: int, snapshot_every: int) -> float:
+    journal = Journal(root, batch_ms=5, snapshot_every=snapshot_every)
+    for i in range(records):
+        write(journal, i)
+        if i % 500 == 0:
+            await journal.flush()
+    await journal.close()
+    started = time.perf_counter()
+    Journal(root)._file.close()
+    return time.perf_counter() - started
+
+async def main(records: int):
+    logger.configure({"file": None, "console": False})
+    root = tempfile.mkdtemp()
+    for label, per_record in (("fsync per record", True), ("batched (5 ms)", False)):
+        shutil.rmtree(root)
+        cost = await append_rate(root, min(records, 2000) if per_record else records, per_record)
+        print(f"{label:<18} {cost * 1e6:9.1f} us per record")
+
+    for history in (records // 10, records, records * 10):
+        line = f"replay after {history:>8} records:"
+        for label, snapshot_every in (("no compaction", 10 ** 12), ("snapshot every 1000", 1000)):
+            shutil.rmtree(root)
+            line += f"  {label} {await replay_time(root, history, snapshot_every) * 1e3:8.2f} ms"
+        print(line)
+    shutil.rmtree(root)
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(int(args[0]) if args else 10000))
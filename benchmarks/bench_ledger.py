@@ -0,0 +1,110 @@
+"""
+Trade ledger: cost of recording a fill, memory per fill, and the time of each
+analytic over a history of millions of cycles, against the same cumulative PnL
+and drawdown computed from a list of Order objects with Decimal arithmetic.
+
+Run from the repository root:
+    python -m benchmarks.bench_ledger [cycles]
+"""
+import sys, time, tracemalloc
+import numpy as np
+from decimal import Decimal
+from models.asset import ExchangeAsset, ExchangeName, TradingPair
+from models.order import Order, Side
+from strategy.ledger import ENTRY, EXIT, SCALE, Ledger
+
+FEES = {"Hyperliquid": 4.5, "Binance": 5.0}
+
+def synthetic(cycles: int, seed: int = 7) -> Ledger:
+    """Two entries and two exits per cycle, long on the cheaper venue, appended in bulk"""
+    rng = np.random.default_rng(seed)
+    mid = 90000 * np.exp(np.cumsum(rng.normal(0, 2e-4, cycles)))
+    spread = rng.normal(0, 8e-4, cycles) * mid
+    exit_move = rng.normal(0, 2e-4, cycles) * mid
+    long_is_a = spread > 0
+
+    ledger = Ledger(capacity=cycles * 4, fee_bps=FEES)
+    cycle = np.repeat(np.arange(cycles), 4)
+    kind = np.tile([ENTRY, ENTRY, EXIT, EXIT], cycles)
+    side = np.tile([1, -1, -1, 1], cycles)
+    a, b = ledger.venue_code(ExchangeName.HYPERLIQUID.value), ledger.venue_code(ExchangeName.BINANCE.value)
+    exchange = np.where(np.repeat(long_is_a, 4), np.tile([a, b, a, b], cycles), np.tile([b, a, b, a], cycles))
+    ref = np.stack([mid - np.abs(spread) / 2, mid + np.abs(spread) / 2,
+                    mid + exit_move, mid + exit_move], axis=1).ravel()
+    price = ref * (1 + side * rng.gamma(1.0, 1e-4, cycles * 4))
+    size = np.full(cycles * 4, 0.002)
+    rate = np.array([FEES[venue] / 10000 for venue in ledger.venues])
+    ledger.extend(
+        ts=np.repeat(1.7e9 + np.arange(cycles) * 300.0, 4) + np.tile([0, 0, 299, 299], cycles),
+        cycle=cycle, pair=np.zeros(cycles * 4), exchange=exchange, side=side, kind=kind,
+        price=np.round(price * SCALE), size=np.round(size * SCALE), ref_price=np.round(ref * SCALE),
+        fee=np.round(price * size * rate[exchange] * SCALE),
+    )
+    return ledger
+
+def timed(fn) -> tuple[float, object]:
+    started = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - started, result
+
+def decimal_baseline(ledger: Ledger, cycles: int) -> tuple[float, float]:
+    """
+    Cumulative PnL and drawdown the way the strategy logs it: Orders and Decimal, one cycle at a time.
+    Returns (seconds, bytes per fill held as an Order).
+    """
+    tracemalloc.start()
+    pair = TradingPair("BTC", "USDT")
+    assets = {code: ExchangeAsset(pair, ExchangeName(venue), "BTC", 3) for code, venue in enumerate(ledger.venues)}
+    rows = [Order(asset=assets[int(ex)], side=Side.LONG if s > 0 else Side.SHORT,
+                  price=Decimal(int(p)) / SCALE, size=Decimal(int(q)) / SCALE)
+            for ex, s, p, q in zip(ledger.col("exchange")[:cycles * 4], ledger.col("side")[:cycles * 4],
+                                   ledger.col("price")[:cycles * 4], ledger.col("size")[:cycles * 4])]
+    held = tracemalloc.get_traced_memory()[0] / len(rows)
+    tracemalloc.stop()
+    started = time.perf_counter()
+    total = peak = drawdown = Decimal(0)
+    for i in range(0, len(rows), 4):
+        long_entry, short_entry, long_exit, short_exit = rows[i:i + 4]
+        total += (long_exit.price - long_entry.price) * long_entry.size + (short_entry.price - short_exit.price) * short_entry.size
+        peak = max(peak, total)
+        drawdown = max(drawdown, peak - total)
+    return time.perf_counter() - started, held
+
+def main(cycles: int):
+    pair = TradingPair("BTC", "USDT")
+    asset = ExchangeAsset(pair, ExchangeName.BINANCE, "BTCUSDT", 3)
+    order = Order(asset=asset, side=Side.LONG, price=Decimal("89000.1"), size=Decimal("0.002"))
+    ledger = Ledger(fee_bps=FEES)
+    record, _ = timed(lambda: [ledger.record("BTC-USDT", i // 4, ENTRY, order, Decimal("89000")) for i in range(100000)])
+    print(f"record(): {record / 100000 * 1e6:.2f} us per fill")
+
+    build, ledger = timed(lambda: synthetic(cycles))
+    bytes_per_row = sum(ledger.col(name).itemsize for name in ledger.columns)
+    print(f"{cycles} cycles, {len(ledger)} fills built in {build:.2f}s, {bytes_per_row} bytes per fill "
+          f"({bytes_per_row * len(ledger) / 2 ** 20:.0f} MiB)")
+
+    analytics = (
+        ("cycle_pnl", lambda: ledger.cycle_pnl(net=True)),
+        ("cumulative + drawdown", lambda: ledger.max_drawdown(net=True)),
+        ("rolling_pnl(288)", lambda: ledger.rolling_pnl(288)),
+        ("sharpe", lambda: ledger.sharpe(net=True)),
+        ("spread captured", lambda: ledger.spread_bps()),
+        ("entry delta", lambda: ledger.entry_delta()),
+        ("fill quality", lambda: ledger.fill_quality()),
+        ("summary", lambda: ledger.summary()),
+    )
+    for label, fn in analytics:
+        elapsed, _ = timed(fn)
+        print(f"{label:<22} {elapsed * 1e3:9.1f} ms")
+
+    sample = min(cycles, 200000)
+    baseline, held = decimal_baseline(ledger, sample)
+    vectorized, _ = timed(lambda: ledger.max_drawdown())
+    print(f"cumulative PnL + drawdown over {sample} cycles: Decimal loop {baseline * 1e3:.1f} ms "
+          f"(~{baseline * cycles / sample:.1f}s for all, {held:.0f} bytes per fill), ledger {vectorized * 1e3:.1f} ms for all {cycles}")
+    for line in ledger.summary():
+        print(f"  {line}")
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 1000000)
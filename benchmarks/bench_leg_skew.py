@@ -0,0 +1,97 @@
+"""
+Submission skew between the two legs of DeltaNeutralStrategy's asyncio.gather
+when the Hyperliquid SDK runs inline on the event loop (old behaviour) versus
+on the adapter's dedicated executor.
+
+The Hyperliquid SDK is replaced by a stub whose calls block for a fixed
+latency, and the Binance leg goes to a local stand-in order endpoint with the
+same latency. Skew is the gap between the moments each venue receives its
+order; wall time is how long the gather takes.
+
+Run from the repository root:
+    python -m benchmarks.bench_leg_skew [rounds] [latency_ms]
+"""
+import asyncio, statistics, sys, time
+from decimal import Decimal
+from aiohttp import web
+from exchanges.binance import BinanceFutures
+from exchanges.hyperliquid import Hyperliquid
+from models.asset import ExchangeAsset, ExchangeName, TradingPair
+from utils import logger
+
+TEST_KEY = "0x" + "11" * 32
+
+class StubHLExchange:
+    """Blocking stand-in for hyperliquid.exchange.Exchange"""
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.received_at = None
+
+    def market_open(self, name, is_buy, sz, px=None, **kwargs):
+        self.received_at = time.perf_counter()
+        time.sleep(self.latency)
+        return {"status": "ok", "response": {"data": {"statuses": [{"filled": {"avgPx": str(px), "totalSz": str(sz)}}]}}}
+
+class InlineHyperliquid(Hyperliquid):
+    """Pre-executor behaviour: SDK calls block the event loop"""
+    async def _run(self, fn, *args, **kwargs):
+        return fn(*args, **kwargs)
+
+async def run_rounds(hl: Hyperliquid, bn: BinanceFutures, stub: StubHLExchange, received: list, rounds: int):
+    pair = TradingPair("BTC", "USDT")
+    asset_hl = ExchangeAsset(pair, ExchangeName.HYPERLIQUID, "BTC", 3)
+    asset_bn = ExchangeAsset(pair, ExchangeName.BINANCE, "BTCUSDT", 3)
+    price, notional = Decimal("89000"), Decimal("200")
+    skews, walls = [], []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        await asyncio.gather(
+            hl.open_long(asset_hl, price, notional),
+            bn.open_short(asset_bn, price, notional),
+        )
+        walls.append(time.perf_counter() - start)
+        skews.append(abs(received[-1] - stub.received_at))
+    return skews, walls
+
+def summarize(label: str, skews: list[float], walls: list[float]):
+    print(f"{label:<16} skew p50 {statistics.median(skews) * 1e3:7.2f} ms, max {max(skews) * 1e3:7.2f} ms | "
+          f"gather wall p50 {statistics.median(walls) * 1e3:7.2f} ms")
+
+async def main(rounds: int, latency: float):
+    logger.configure({"file": None, "console": False})
+    received = []
+
+    async def order(request):
+        received.append(time.perf_counter())
+        await asyncio.sleep(latency)
+        return web.json_response({"orderId": 1, "status": "FILLED"})
+
+    app = web.Application()
+    app.router.add_post("/fapi/v1/order", order)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    bn = BinanceFutures({"base_url": f"http://127.0.0.1:{port}", "api_key": "k", "api_secret": "s"})
+    await bn.initialize()
+
+    results = {}
+    for label, cls in (("inline SDK", InlineHyperliquid), ("executor SDK", Hyperliquid)):
+        hl = cls({"base_url": "http://stub", "api_key": "0x0", "api_secret": TEST_KEY})
+        stub = StubHLExchange(latency)
+        hl.HLExchange = stub
+        results[label] = await run_rounds(hl, bn, stub, received, rounds)
+        await hl.close()
+
+    await bn.close()
+    await runner.cleanup()
+
+    print(f"{rounds} paired opens, {latency * 1e3:.0f} ms simulated latency per venue")
+    for label, (skews, walls) in results.items():
+        summarize(label, skews, walls)
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(int(args[0]) if args else 50, (float(args[1]) if len(args) > 1 else 50) / 1000))
@@ -0,0 +1,49 @@
+"""
+Caller-side cost of one log() call: the old synchronous open/append/close
+logger versus the queued logger, whose file I/O happens on a background
+writer thread. Output goes to a temporary directory, console echo is off.
+
+Run from the repository root:
+    python -m benchmarks.bench_logger [calls]
+"""
+import os, sys, tempfile, time
+from datetime import datetime
+from decimal import Decimal
+from models.asset import ExchangeName
+from models.order import Side
+from utils import logger
+
+def sync_log(path: str, msg: str):
+    """The pre-queue logger, minus the console print"""
+    ts = datetime.now().strftime("[%H:%M:%S]")
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(f"{ts} {msg}\n")
+
+def per_call(label: str, n: int, fn):
+    start = time.perf_counter()
+    for i in range(n):
+        fn(i)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed / n * 1e6:8.2f} us/call")
+
+def main(n: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        sync_path = os.path.join(tmp, "sync.log")
+        logger.configure({"file": os.path.join(tmp, "bot.log"), "console": False})
+
+        per_call("sync open/append/close", n, lambda i: sync_log(sync_path, f"Opening LONG 0.002 BTC on Binance @ ${i}"))
+        per_call("queued text", n, lambda i: logger.log(f"Opening LONG 0.002 BTC on Binance @ ${i}"))
+        logger.flush()
+
+        logger.configure({"jsonl_file": os.path.join(tmp, "bot.jsonl")})
+        price, size = Decimal("89201.10"), Decimal("0.002")
+        per_call("queued text + JSONL fields", n, lambda i: logger.log(
+            f"Opening LONG 0.002 BTC on Binance @ ${i}",
+            exchange=ExchangeName.BINANCE, side=Side.LONG, price=price, size=size, latency_ms=1.5,
+        ))
+        start = time.perf_counter()
+        logger.shutdown()
+        print(f"final flush of queued records: {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
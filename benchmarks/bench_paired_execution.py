@@ -0,0 +1,142 @@
+"""
+Submission skew of a paired open: the plain asyncio.gather of open_long/open_short
+versus PairExecutor firing two pre-signed orders.
+
+Both venues are served by one local stand-in (Binance /fapi/v1/order and
+Hyperliquid /exchange) that answers after a fixed latency. Skew is the gap
+between the moments the two orders arrive. In the gather baseline the
+Hyperliquid SDK is replaced by a stub on the adapter's executor that signs
+like the real SDK. With a non-zero fail rate the stand-in rejects that
+fraction of Binance orders, exercising the retry and unwind path.
+
+Run from the repository root:
+    python -m benchmarks.bench_paired_execution [rounds] [latency_ms] [fail_rate]
+"""
+import asyncio, random, statistics, sys, time
+from decimal import Decimal
+from aiohttp import web
+from exchanges.binance import BinanceFutures
+from exchanges.hyperliquid import Hyperliquid
+from hyperliquid.utils.signing import get_timestamp_ms, order_request_to_order_wire, order_wires_to_order_action, sign_l1_action
+from models.asset import ExchangeAsset, ExchangeName, TradingPair
+from models.order import Side
+from strategy.execution import Leg, PairExecutor
+from utils import logger, metrics
+
+TEST_KEY = "0x" + "11" * 32
+
+class StubInfo:
+    def name_to_asset(self, name):
+        return 0
+
+class StubHLExchange:
+    """Blocking stand-in for hyperliquid.exchange.Exchange that signs like the SDK"""
+    DEFAULT_SLIPPAGE = 0.05
+
+    def __init__(self, wallet, latency: float):
+        self.wallet = wallet
+        self.latency = latency
+        self.info = StubInfo()
+        self.received_at = None
+
+    def _slippage_price(self, name, is_buy, slippage, px):
+        return round(px * (1 + slippage if is_buy else 1 - slippage))
+
+    def market_open(self, name, is_buy, sz, px=None, **kwargs):
+        order = {"coin": name, "is_buy": is_buy, "sz": sz, "limit_px": self._slippage_price(name, is_buy, 0.05, px),
+                 "order_type": {"limit": {"tif": "Ioc"}}, "reduce_only": False}
+        action = order_wires_to_order_action([order_request_to_order_wire(order, 0)])
+        sign_l1_action(self.wallet, action, None, get_timestamp_ms(), None, False)
+        self.received_at = time.perf_counter()
+        time.sleep(self.latency)
+        return {"status": "ok", "response": {"data": {"statuses": [{"filled": {"avgPx": str(px), "totalSz": str(sz)}}]}}}
+
+    def market_close(self, name, **kwargs):
+        time.sleep(self.latency)
+        return {"status": "ok", "response": {"data": {"statuses": [{"filled": {"avgPx": "89000", "totalSz": "0.002"}}]}}}
+
+def summarize(label: str, skews: list[float], walls: list[float]):
+    print(f"{label:<18} skew p50 {statistics.median(skews) * 1e3:7.3f} ms, max {max(skews) * 1e3:7.3f} ms | "
+          f"open wall p50 {statistics.median(walls) * 1e3:7.2f} ms")
+
+async def main(rounds: int, latency: float, fail_rate: float):
+    logger.configure({"file": None, "console": False})
+    received = {}
+
+    async def binance_order(request):
+        received["binance"] = time.perf_counter()
+        await request.read()
+        await asyncio.sleep(latency)
+        if random.random() < fail_rate:
+            return web.json_response({"code": -1001, "msg": "Internal error; unable to process your request."})
+        return web.json_response({"orderId": 1, "status": "FILLED"})
+
+    async def hyperliquid_exchange(request):
+        received["hyperliquid"] = time.perf_counter()
+        payload = await request.json()
+        await asyncio.sleep(latency)
+        wire = payload["action"]["orders"][0]
+        return web.json_response({"status": "ok", "response": {"type": "order", "data": {"statuses": [
+            {"filled": {"avgPx": "89000", "totalSz": wire["s"], "oid": 1}}]}}})
+
+    app = web.Application()
+    app.router.add_post("/fapi/v1/order", binance_order)
+    app.router.add_post("/exchange", hyperliquid_exchange)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    base_url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+
+    bn = BinanceFutures({"base_url": base_url, "api_key": "k", "api_secret": "s"})
+    hl = Hyperliquid({"base_url": base_url, "api_key": "0x0", "api_secret": TEST_KEY})
+    hl.Info = StubInfo()
+    hl.HLExchange = stub = StubHLExchange(hl.account, latency)
+    await bn.initialize()
+    await hl.initialize()
+
+    pair = TradingPair("BTC", "USDT")
+    asset_hl = ExchangeAsset(pair, ExchangeName.HYPERLIQUID, "BTC", 3)
+    asset_bn = ExchangeAsset(pair, ExchangeName.BINANCE, "BTCUSDT", 3)
+    price, notional = Decimal("89000"), Decimal("200")
+    executor = PairExecutor({"leg_deadline_ms": 10 * latency * 1000 + 50, "retry_interval_ms": 1})
+
+    results = {"gather": ([], []), "pre-signed": ([], [])}
+    failures = 0
+    for _ in range(rounds):
+        if fail_rate == 0:
+            start = time.perf_counter()
+            await asyncio.gather(hl.open_long(asset_hl, price, notional), bn.open_short(asset_bn, price, notional))
+            results["gather"][1].append(time.perf_counter() - start)
+            results["gather"][0].append(abs(received["binance"] - stub.received_at))
+
+        legs = [Leg(hl, asset_hl, Side.LONG, price, notional), Leg(bn, asset_bn, Side.SHORT, price, notional)]
+        prepared = await executor.prepare(*legs)
+        start = time.perf_counter()
+        try:
+            await executor.fire(legs, prepared)
+        except Exception:
+            failures += 1
+        results["pre-signed"][1].append(time.perf_counter() - start)
+        results["pre-signed"][0].append(abs(received["binance"] - received["hyperliquid"]))
+        hl.positions.clear()
+        bn.positions.clear()
+
+    await hl.close()
+    await bn.close()
+    await runner.cleanup()
+
+    print(f"{rounds} paired opens, {latency * 1e3:.0f} ms simulated latency per venue, {fail_rate:.0%} Binance rejects")
+    for label, (skews, walls) in results.items():
+        if skews:
+            summarize(label, skews, walls)
+    for line in metrics.summary():
+        if line.startswith(("leg_submit_skew", "leg_recovery", "strategy_phase_seconds{phase=\"prepare\"")):
+            print(line)
+    if fail_rate:
+        print(f"{failures} opens unwound after exhausting retries")
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(int(args[0]) if args else 50, (float(args[1]) if len(args) > 1 else 20) / 1000,
+                     float(args[2]) if len(args) > 2 else 0.0))
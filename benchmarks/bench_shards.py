@@ -0,0 +1,133 @@
+"""
+Multi-process sharding: the cost of reading a quote from the shared-memory PriceBoard
+versus asking a market-data process for it over a pipe, whether readers ever see a torn
+quote while a writer process updates the board flat out, and how the throughput of a
+CPU-bound trading cycle scales with the number of worker processes.
+
+The cycle stands in for what saturates one event loop: two board reads, parsing a JSON
+order response and HMAC-signing an order. Scaling is bounded by the cores of the machine
+(printed first).
+
+Run from the repository root:
+    python -m benchmarks.bench_shards [seconds] [max_workers]
+"""
+import hashlib, hmac, json, multiprocessing, os, sys, time
+from market_data.board import BoardFeed, PriceBoard
+
+RESPONSE = json.dumps({"orderId": 8389765, "symbol": "BTCUSDT", "status": "FILLED", "clientOrderId": "x" * 32,
+                       "price": "0", "avgPrice": "89066.00000", "origQty": "0.011", "executedQty": "0.011",
+                       "cumQuote": "979.72600", "timeInForce": "GTC", "type": "MARKET", "side": "BUY",
+                       "updateTime": 1760000000000})
+SECRET = b"s" * 64
+
+def write_loop(board_name: str, seconds: float, writes):
+    """Rewrite two slots as fast as possible, always with ask == bid + 1 and mid == bid + 0.5"""
+    board = PriceBoard(board_name)
+    slots = [board.slot("Binance:BTCUSDT"), board.slot("Hyperliquid:BTC")]
+    end = time.monotonic() + seconds
+    count = 0
+    while time.monotonic() < end:
+        bid = 90000.0 + count % 1000
+        for slot in slots:
+            board.write(slot, bid, bid + 1, bid + 0.5, time.monotonic())
+        count += 1
+    writes.value = count
+    board.close()
+
+def read_loop(board_name: str, seconds: float, reads, torn):
+    board = PriceBoard(board_name)
+    slot = board.slot("Binance:BTCUSDT")
+    end = time.monotonic() + seconds
+    count = bad = 0
+    while time.monotonic() < end:
+        values = board.read(slot)
+        if values is not None:
+            bid, ask, mid, _ = values
+            bad += ask != bid + 1 or mid != bid + 0.5
+            count += 1
+    reads.value, torn.value = count, bad
+    board.close()
+
+def cycle_loop(board_name: str, seconds: float, cycles):
+    board = PriceBoard(board_name)
+    feeds = [BoardFeed(board, "Binance", max_age_ms=10 ** 9), BoardFeed(board, "Hyperliquid", max_age_ms=10 ** 9)]
+    end = time.monotonic() + seconds
+    count = 0
+    while time.monotonic() < end:
+        prices = [feeds[0].quote("BTCUSDT").mid, feeds[1].quote("BTC").mid]
+        fill = json.loads(RESPONSE)
+        query = f"symbol=BTCUSDT&side=BUY&type=MARKET&quantity={fill['executedQty']}&price={min(prices)}&timestamp={count}"
+        hmac.new(SECRET, query.encode(), hashlib.sha256).hexdigest()
+        count += 1
+    cycles.value = count
+    board.close()
+
+def serve_prices(conn):
+    quote = (90000.0, 90001.0, 90000.5, 0.0)
+    while conn.recv() is not None:
+        conn.send(quote)
+
+def read_cost(ctx, board: PriceBoard, rounds: int = 50000) -> tuple[float, float, float]:
+    """Seconds per board read, per BoardFeed.quote(), and per pipe round trip"""
+    slot = board.slot("Binance:BTCUSDT")
+    started = time.perf_counter()
+    for _ in range(rounds):
+        board.read(slot)
+    raw = (time.perf_counter() - started) / rounds
+    feed = BoardFeed(board, "Binance", max_age_ms=10 ** 9)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        feed.quote("BTCUSDT")
+    quote = (time.perf_counter() - started) / rounds
+
+    parent, child = ctx.Pipe()
+    server = ctx.Process(target=serve_prices, args=(child,))
+    server.start()
+    started = time.perf_counter()
+    for _ in range(rounds // 10):
+        parent.send("Binance:BTCUSDT")
+        parent.recv()
+    pipe = (time.perf_counter() - started) / (rounds // 10)
+    parent.send(None)
+    server.join()
+    return raw, quote, pipe
+
+def main(seconds: float, max_workers: int):
+    ctx = multiprocessing.get_context("spawn")
+    print(f"{os.cpu_count()} CPU cores")
+    board = PriceBoard(slots=64, create=True)
+    try:
+        for key in ("Binance:BTCUSDT", "Hyperliquid:BTC"):
+            board.write(board.slot(key, allocate=True), 90000.0, 90001.0, 90000.5, time.monotonic())
+
+        raw, quote, pipe = read_cost(ctx, board)
+        print(f"board read {raw * 1e6:.2f} us | BoardFeed.quote() {quote * 1e6:.2f} us | pipe round trip {pipe * 1e6:.2f} us")
+
+        writes, reads, torn = ctx.Value("q", 0), ctx.Value("q", 0), ctx.Value("q", 0)
+        processes = [ctx.Process(target=write_loop, args=(board.name, seconds, writes)),
+                     ctx.Process(target=read_loop, args=(board.name, seconds, reads, torn))]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        print(f"seqlock under contention: {writes.value:,} writes, {reads.value:,} reads, {torn.value} torn")
+
+        baseline = None
+        workers = 1
+        while workers <= max_workers:
+            counters = [ctx.Value("q", 0) for _ in range(workers)]
+            processes = [ctx.Process(target=cycle_loop, args=(board.name, seconds, counter)) for counter in counters]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+            rate = sum(counter.value for counter in counters) / seconds
+            baseline = baseline or rate
+            print(f"{workers:>2} workers: {rate:>10,.0f} cycles/s ({rate / baseline:.2f}x)")
+            workers *= 2
+    finally:
+        board.close(unlink=True)
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(float(args[0]) if args else 2.0, int(args[1]) if len(args) > 1 else max(os.cpu_count(), 4))
@@ -0,0 +1,92 @@
+"""
+Startup time of both adapters (initialize + get_asset_info for every pair)
+with no metadata cache, a fresh cache and a stale cache that is refreshed in
+the background.
+
+A local stand-in serves a Binance exchangeInfo with `symbols` entries and a
+Hyperliquid meta/spotMeta universe of the same size, each after a fixed latency.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup [pairs] [latency_ms] [symbols]
+"""
+import asyncio, shutil, sys, tempfile, time
+from aiohttp import web
+from exchanges.binance import BinanceFutures
+from exchanges.hyperliquid import Hyperliquid
+from exchanges.metadata import MetadataCache
+from models.asset import TradingPair
+from utils import logger
+
+TEST_KEY = "0x" + "11" * 32
+
+def venue_app(symbols: int, latency: float, requests: list) -> web.Application:
+    coins = [f"C{i}" for i in range(symbols)]
+    exchange_info = {"symbols": [
+        {"symbol": f"{coin}USDT", "quantityPrecision": 3, "filters": [
+            {"filterType": "PRICE_FILTER", "tickSize": "0.10"}, {"filterType": "LOT_SIZE", "stepSize": "0.001"},
+            {"filterType": "MIN_NOTIONAL", "notional": "5"}]}
+        for coin in coins]}
+    meta = {"universe": [{"name": coin, "szDecimals": 3, "maxLeverage": 20} for coin in coins]}
+    spot_meta = {"tokens": [{"name": "USDC", "index": 0, "szDecimals": 8}], "universe": []}
+
+    async def binance(request):
+        requests.append("exchangeInfo")
+        await asyncio.sleep(latency)
+        return web.json_response(exchange_info)
+
+    async def info(request):
+        kind = (await request.json())["type"]
+        requests.append(kind)
+        await asyncio.sleep(latency)
+        return web.json_response(meta if kind == "meta" else spot_meta)
+
+    app = web.Application()
+    app.router.add_get("/fapi/v1/exchangeInfo", binance)
+    app.router.add_post("/info", info)
+    return app
+
+async def start(base_url: str, cache: MetadataCache, pairs: list[TradingPair]) -> float:
+    hl = Hyperliquid({"base_url": base_url, "api_key": "0x0", "api_secret": TEST_KEY})
+    bn = BinanceFutures({"base_url": base_url, "api_key": "k", "api_secret": "s"})
+    hl.metadata = bn.metadata = cache
+    started = time.perf_counter()
+    await asyncio.gather(hl.initialize(), bn.initialize())
+    await asyncio.gather(*(ex.get_asset_info(pair) for pair in pairs for ex in (hl, bn)))
+    elapsed = time.perf_counter() - started
+    # Let a background refresh finish before tearing down
+    for ex in (hl, bn):
+        if ex._refresh:
+            await ex._refresh
+    await asyncio.gather(hl.close(), bn.close())
+    return elapsed
+
+async def main(n_pairs: int, latency: float, symbols: int):
+    logger.configure({"file": None, "console": False})
+    requests = []
+    runner = web.AppRunner(venue_app(symbols, latency, requests))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    base_url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+    pairs = [TradingPair(f"C{i}", "USDT") for i in range(n_pairs)]
+    root = tempfile.mkdtemp()
+
+    print(f"{n_pairs} pairs, {symbols} symbols per venue, {latency * 1e3:.0f} ms per metadata request")
+    scenarios = (
+        ("no cache", None),
+        ("cold cache", MetadataCache(root)),
+        ("fresh cache", MetadataCache(root)),
+        ("stale cache", MetadataCache(root, ttl=0)),
+    )
+    for label, cache in scenarios:
+        requests.clear()
+        elapsed = await start(base_url, cache, pairs)
+        print(f"{label:<12} startup {elapsed * 1e3:8.2f} ms | metadata requests {len(requests)}")
+
+    shutil.rmtree(root)
+    await runner.cleanup()
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(int(args[0]) if args else 20, (float(args[1]) if len(args) > 1 else 100) / 1000,
+                     int(args[2]) if len(args) > 2 else 500))
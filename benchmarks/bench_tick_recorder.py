@@ -0,0 +1,69 @@
+"""
+Tick recorder throughput, disk footprint and range-read latency.
+
+Writes a day of synthetic 10 Hz top-of-book ticks for several symbols on both
+venues, then reads one hour and the full day back through TickReader.
+
+Run from the repository root:
+    python -m benchmarks.bench_tick_recorder [symbols] [hours]
+"""
+import os, sys, tempfile, time
+import numpy as np
+from decimal import Decimal
+from market_data.quotes import Quote
+from market_data.recorder import TickReader, TickRecorder
+
+def disk_usage(root: str) -> int:
+    """Allocated bytes (segments are sparse, so this is less than their apparent size)"""
+    total = 0
+    for directory, _, files in os.walk(root):
+        for name in files:
+            total += os.stat(os.path.join(directory, name)).st_blocks * 512
+    return total
+
+def main(symbols: int, hours: float):
+    ticks = int(hours * 3600 * 10)
+    start_ns = 1_700_000_000 * 10**9
+    step_ns = 100_000_000
+    rng = np.random.default_rng(0)
+
+    with tempfile.TemporaryDirectory() as root:
+        recorder = TickRecorder(root, segment_ticks=1 << 18)
+
+        # Scaled-integer path used by bulk imports
+        started = time.perf_counter()
+        for venue in ("Hyperliquid", "Binance"):
+            for s in range(symbols):
+                mids = (89000 + np.cumsum(rng.normal(0, 5, ticks))) * 10**8
+                for i in range(ticks):
+                    mid = int(mids[i])
+                    recorder.append(venue, f"SYM{s}", start_ns + i * step_ns, mid - 5 * 10**7, mid + 5 * 10**7)
+        elapsed = time.perf_counter() - started
+        total = ticks * symbols * 2
+        recorder.flush()
+        print(f"wrote {total:,} ticks ({symbols} symbols x 2 venues, {hours:g}h at 10 Hz) "
+              f"in {elapsed:.2f}s, {elapsed / total * 1e6:.2f} us/tick")
+        print(f"disk used: {disk_usage(root) / 2**20:.1f} MiB ({disk_usage(root) / total:.1f} bytes/tick)")
+
+        # Live path: Decimal quotes from the stream cache
+        quote = Quote(Decimal("89000.1"), Decimal("89000.2"), Decimal("89000.15"), 0.0)
+        n = 100_000
+        started = time.perf_counter()
+        for i in range(n):
+            quote.bid += 1
+            recorder.record("Binance", "LIVE", quote, start_ns + i * step_ns)
+        print(f"record() from Decimal quotes: {(time.perf_counter() - started) / n * 1e6:.2f} us/tick")
+        recorder.close()
+
+        reader = TickReader(root)
+        hour_start = start_ns + ticks // 2 * step_ns
+        for label, lo, hi in (("1 hour", hour_start, hour_start + 3600 * 10**9), ("full range", None, None)):
+            started = time.perf_counter()
+            data = reader.read("Binance", "SYM0", lo, hi)
+            elapsed = time.perf_counter() - started
+            print(f"read {label:<10} {len(data['ts']):>9,} ticks in {elapsed * 1e3:7.2f} ms "
+                  f"({'memory-mapped view' if isinstance(data['ts'], np.memmap) else 'copied across segments'})")
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(int(args[0]) if args else 4, float(args[1]) if len(args) > 1 else 24)
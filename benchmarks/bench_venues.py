@@ -0,0 +1,109 @@
+"""
+N-venue routing: captured entry spread and PnL as a third and fourth venue are
+added, the wall-clock cost of fetching every venue's price concurrently versus
+one venue after the other, and the cost of picking the long/short venues.
+
+Each simulated venue trades the same random-walk mid plus its own mean-reverting
+basis, so a wider venue set finds a wider cross-venue spread on every cycle.
+
+Run from the repository root:
+    python -m benchmarks.bench_venues [cycles] [latency_ms]
+"""
+import asyncio, sys, time
+import numpy as np
+from decimal import Decimal
+from backtest.clock import VirtualClock
+from backtest.sim_exchange import SimulatedExchange
+from models.asset import ExchangeName
+from strategy.delta_neutral import DeltaNeutralStrategy
+from strategy.ledger import Ledger
+from strategy.routing import PriceMatrix, route
+from utils import logger
+
+VENUES = [ExchangeName.HYPERLIQUID, ExchangeName.BINANCE, ExchangeName.add("VenueC"), ExchangeName.add("VenueD")]
+CFG = {"base_asset": "BTC", "quote_asset": "USDT", "notional": 1000, "interval_minutes": 1}
+
+class LaggedExchange(SimulatedExchange):
+    """SimulatedExchange whose price requests take a real round trip"""
+    rtt = 0.0
+
+    async def get_price(self, asset):
+        await asyncio.sleep(self.rtt)
+        return await super().get_price(asset)
+
+def series(steps: int, venues: int, seed: int = 3) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    ts = 1.7e9 + np.arange(steps) * 60.0
+    mid = 90000 * np.exp(np.cumsum(rng.normal(0, 3e-4, steps)))
+    basis = np.zeros((venues, steps))
+    for t in range(1, steps):
+        basis[:, t] = 0.7 * basis[:, t - 1] + rng.normal(0, 4e-4, venues)
+    return ts, mid * (1 + basis)
+
+async def replay(n: int, ts: np.ndarray, prices: np.ndarray) -> Ledger:
+    clock = VirtualClock(ts[0])
+    venues = [SimulatedExchange(name, ts, prices[j], clock, quantity_precision=4) for j, name in enumerate(VENUES[:n])]
+    strategy = DeltaNeutralStrategy(venues, CFG, clock=clock)
+    strategy.ledger = Ledger(clock=clock)
+    await strategy.initialize()
+    for t in ts[:-1]:
+        clock.now = float(t)
+        await strategy.cycle()
+    clock.now = float(ts[-1])
+    await strategy.close_at(await strategy.fetch_prices())
+    return strategy.ledger
+
+async def fetch_time(n: int, ts: np.ndarray, prices: np.ndarray, rtt: float, rounds: int = 20) -> tuple[float, float]:
+    clock = VirtualClock(ts[0])
+    venues = [LaggedExchange(name, ts, prices[j], clock) for j, name in enumerate(VENUES[:n])]
+    for venue in venues:
+        venue.rtt = rtt
+    strategy = DeltaNeutralStrategy(venues, CFG, clock=clock)
+    await strategy.initialize()
+    started = time.perf_counter()
+    for _ in range(rounds):
+        await strategy.fetch_prices()
+    concurrent = (time.perf_counter() - started) / rounds
+    started = time.perf_counter()
+    for _ in range(rounds):
+        [await venue.get_price(asset) for venue, asset in zip(venues, strategy.assets)]
+    sequential = (time.perf_counter() - started) / rounds
+    return concurrent, sequential
+
+def routing_cost(n: int, rounds: int = 20000) -> tuple[float, float]:
+    prices = [Decimal(str(90000 + i * 0.1)) for i in range(n)][::-1]
+    started = time.perf_counter()
+    for _ in range(rounds):
+        route(prices)
+    decimal_route = (time.perf_counter() - started) / rounds
+    matrix = PriceMatrix(["BTC-USDT"], [ExchangeName.add(f"V{i}") for i in range(n)])
+    matrix.update_row(0, list(range(n)), prices)
+    started = time.perf_counter()
+    for _ in range(rounds):
+        matrix.best(0)
+    return decimal_route, (time.perf_counter() - started) / rounds
+
+async def main(cycles: int, latency: float):
+    logger.configure({"file": None, "console": False})
+    ts, prices = series(cycles + 1, len(VENUES))
+    print(f"{cycles} one-minute cycles, $1000 per leg, no fees")
+    for n in range(2, len(VENUES) + 1):
+        ledger = await replay(n, ts, prices)
+        decided, filled = ledger.spread_bps()
+        _, pnl = ledger.cycle_pnl()
+        print(f"{n} venues: entry spread mean {decided.mean():6.2f} bps, p95 {np.percentile(decided, 95):6.2f} bps | "
+              f"gross PnL ${pnl.sum():10.2f}")
+
+    print(f"\nprice fetch with {latency * 1e3:.0f} ms per request")
+    for n in range(2, len(VENUES) + 1):
+        concurrent, sequential = await fetch_time(n, ts, prices, latency)
+        print(f"{n} venues: concurrent {concurrent * 1e3:6.1f} ms | one after the other {sequential * 1e3:6.1f} ms")
+
+    print("\nlong/short selection")
+    for n in (2, 4, 8, 32):
+        decimal_route, matrix_best = routing_cost(n)
+        print(f"{n:>2} venues: route() over Decimals {decimal_route * 1e6:5.2f} us | PriceMatrix.best() {matrix_best * 1e6:5.2f} us")
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(int(args[0]) if args else 5000, (float(args[1]) if len(args) > 1 else 20) / 1000))
@@ -1,8 +1,13 @@
 from abc import ABC, abstractmethod
 from decimal import Decimal
 
+from exchanges.metadata import MetadataCache
+from exchanges.slicing import Slicer
+from market_data.book import OrderBook
+from market_data.feed import StreamFeed
 from models.asset import ExchangeAsset, ExchangeName, TradingPair
-from models.order import Order
+from models.order import Order, PreparedOrder, Side
+from utils.rate_limit import RateLimiter
 
 class Exchange(ABC):
     # Attributes and methods that all exchange classes must implement
@@ -10,7 +15,113 @@ class Exchange(ABC):
     base_url: str
     key: str
     secret: str
-    last_order: Order
+    positions: dict[str, Order]   # Open entry order per exchange_symbol
+    feed: StreamFeed = None   # Optional streaming price source, see market_data/
+    metadata: MetadataCache = None   # Optional on-disk symbol metadata, see exchanges/metadata.py
+    slicer: Slicer = None   # Optional depth-aware order slicing, see exchanges/slicing.py
+    limiter: RateLimiter = None   # Request budget of venues that enforce one, see utils/rate_limit.py
+
+    async def initialize(self):
+        """Open long-lived resources (connections, executors). Called once before trading."""
+        pass
+
+    async def close(self):
+        """Release resources opened in initialize(). Safe to call more than once."""
+        pass
+
+    def headroom(self) -> dict[str, float]:
+        """Fraction of each rate limit currently available, keyed by limit name"""
+        return {}
+
+    def create_feed(self, max_age_ms: int, depth_levels: int = 0) -> StreamFeed:
+        """
+        Build the venue's market-data stream, keeping L2 books of depth_levels per side
+        when that is not 0. Venues without one return None.
+        """
+        return None
+
+    async def watch(self, asset: ExchangeAsset):
+        """Stream prices for asset if a feed is attached"""
+        if self.feed:
+            await self.feed.subscribe(asset.exchange_symbol)
+
+    def on_price(self, asset: ExchangeAsset, callback) -> bool:
+        """Register callback(symbol, quote) for streamed updates. Returns False without a feed."""
+        if not self.feed:
+            return False
+        self.feed.cache.add_listener(asset.exchange_symbol, callback)
+        return True
+
+    def cached_price(self, asset: ExchangeAsset) -> Decimal:
+        """Fresh streamed mid for asset, or None so the caller falls back to REST"""
+        if not self.feed:
+            return None
+        quote = self.feed.quote(asset.exchange_symbol)
+        return quote.mid if quote else None
+
+    def book(self, asset: ExchangeAsset) -> OrderBook:
+        """Fresh streamed L2 book for asset, or None without a depth feed"""
+        if not self.feed or self.feed.books is None:
+            return None
+        return self.feed.books.get(asset.exchange_symbol, self.feed.max_age)
+
+    def estimate(self, asset: ExchangeAsset, side: Side, notional: Decimal) -> tuple[float, float]:
+        """(expected VWAP, expected slippage in bps against the mid) of a market order for notional, or None without a book"""
+        book = self.book(asset)
+        if book is None:
+            return None
+        vwap, _ = book.vwap(side, float(notional))
+        return vwap, book.impact_bps(side, float(notional))
+
+    async def execute(self, asset: ExchangeAsset, side: Side, price: Decimal, notional: Decimal) -> Order:
+        """Open a position, sliced by the slicer when one market order would cost more than its impact budget"""
+        if self.slicer is None:
+            return await self.open_position(asset, side, price, notional)
+        return await self.slicer.execute(self, asset, side, price, notional)
+
+    async def open_position(self, asset: ExchangeAsset, side: Side, price: Decimal, notional: Decimal) -> Order:
+        """Open (or add to) a position with one market order for notional at price"""
+        raise Exception(f"{self.name.value} does not support market orders")
+
+    async def open_ioc(self, asset: ExchangeAsset, side: Side, limit_price: Decimal, size: Decimal) -> Order:
+        """
+        Send an immediate-or-cancel limit order for size at limit_price or better. Returns the
+        filled part (None if nothing filled) without touching positions.
+        """
+        raise Exception(f"{self.name.value} does not support IOC orders")
+
+    def net_order(self, asset: ExchangeAsset, side: Side, size: Decimal) -> tuple[Side, Decimal]:
+        """Side and size of the one order that moves the asset's position to side/size (size 0 = flat)"""
+        current = self.positions.get(asset.exchange_symbol)
+        held = Decimal(0) if not current else current.size if current.side == Side.LONG else -current.size
+        delta = (size if side == Side.LONG else -size) - held
+        return (Side.LONG if delta > 0 else Side.SHORT), abs(delta)
+
+    def set_position(self, asset: ExchangeAsset, side: Side, size: Decimal, price: Decimal):
+        """Record the position left after a rebalance, entered at price"""
+        if size:
+            self.positions[asset.exchange_symbol] = Order(asset=asset, side=side, price=price, size=size)
+        else:
+            self.positions.pop(asset.exchange_symbol, None)
+
+    async def rebalance(self, asset: ExchangeAsset, side: Side, size: Decimal, price: Decimal) -> Order:
+        """
+        Move the position to side/size with a single market order for the difference.
+        Returns the executed order, or None when the position is already there.
+        """
+        raise Exception(f"{self.name.value} does not support netting")
+
+    async def live_positions(self) -> dict[str, tuple[Side, Decimal, Decimal]]:
+        """exchange_symbol -> (side, size, entry price) of every open position on the account"""
+        raise Exception(f"{self.name.value} cannot list live positions")
+
+    async def prepare_order(self, asset: ExchangeAsset, side: Side, price: Decimal, notional: Decimal) -> PreparedOrder:
+        """
+        Size, rate-limit and sign an opening market order without sending it, so that the
+        two legs of a pair can be fired back to back. The filled order is recorded in
+        positions like open_position().
+        """
+        raise Exception(f"{self.name.value} does not support pre-signed orders")
 
     @abstractmethod
     async def get_asset_info(self, pair: TradingPair) -> ExchangeAsset: ...
@@ -25,4 +136,4 @@ class Exchange(ABC):
     async def open_short(self, asset: ExchangeAsset, price: Decimal, notional: Decimal) -> Order: ...
 
     @abstractmethod
-    async def close_position(self, close_price: Decimal) -> Order: ...
+    async def close_position(self, asset: ExchangeAsset, close_price: Decimal) -> Order: ...
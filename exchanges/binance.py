@@ -1,49 +1,280 @@
-import aiohttp, time, hmac, hashlib
+import aiohttp, asyncio, time, hmac, hashlib
 from decimal import Decimal
 from exchanges.base import Exchange
+from exchanges.registry import register
+from market_data.binance import BinanceBookTickerFeed
+from market_data.binance_user import BinanceUserStream
+from utils import metrics
 from utils.logger import log
+from utils.rate_limit import Priority, RateLimiter, TokenBucket
+from utils.retry import RetryPolicy, TransientError, client_order_id
 from models.asset import ExchangeAsset, ExchangeName, TradingPair
-from models.order import Order, Side
+from models.order import Order, PreparedOrder, Side
 
+# Failures after which the request may be retried (an order only after looking it up)
+RETRYABLE = (asyncio.TimeoutError, aiohttp.ClientError, TransientError)
+# -1001 internal error, -1007 backend timeout (order status unknown)
+TRANSIENT_CODES = (-1001, -1007)
+
+@register("binance")
 class BinanceFutures(Exchange):
     def __init__(self, cfg):
         self.name = ExchangeName.BINANCE
         self.base_url = cfg["base_url"]
         self.key = cfg["api_key"]
         self.secret = cfg["api_secret"]
-        self.last_order = None
+        self.positions: dict[str, Order] = {}
+        self.ws_url = cfg.get("ws_url", "wss://stream.binancefuture.com/ws")
+
+        # Connection pool settings, overridable from the exchange config
+        self.pool_limit = cfg.get("pool_limit", 20)
+        self.dns_cache_ttl = cfg.get("dns_cache_ttl", 300)
+        self.keepalive_timeout = cfg.get("keepalive_timeout", 60)
+        self.session: aiohttp.ClientSession = None
+
+        # Binance Futures limits per IP (request weight) and per account (orders).
+        # The buckets are re-synced from the X-MBX-* headers on every response.
+        limits = cfg.get("rate_limits", {})
+        self.limiter = RateLimiter({
+            "weight": TokenBucket(limits.get("weight_per_minute", 2400), 60),
+            "orders_10s": TokenBucket(limits.get("orders_per_10s", 300), 10),
+            "orders_1m": TokenBucket(limits.get("orders_per_minute", 1200), 60),
+        })
+        self.max_throttle_wait = limits.get("max_throttle_wait_seconds", 10)
+        # How long a pre-signed order stays valid (Binance rejects older timestamps)
+        self.recv_window = cfg.get("recv_window_ms", 5000)
+        # Per-request timeout, per-operation deadlines, retries and read hedging
+        self.retry = RetryPolicy(cfg.get("timeouts", {}))
+
+        # Optional user data stream: fills, fees and positions pushed over a WebSocket, see _filled()
+        user_stream = cfg.get("user_stream", {})
+        self.user_stream = BinanceUserStream(self.ws_url, self._listen_key, self._rest_positions,
+                                             user_stream.get("keepalive_minutes", 30)) if user_stream.get("enabled", False) else None
+        self.fill_wait = user_stream.get("fill_wait_ms", 500) / 1000  # For an order's fill event
+
+        # Symbol index (see _symbol_entry) shared by every pair, from the metadata cache
+        # when there is one, otherwise downloaded once from exchangeInfo
+        self._symbol_info: dict[str, dict] = None
+        self._symbol_info_lock = asyncio.Lock()
+        self._refresh: asyncio.Task = None
+
+    async def initialize(self):
+        """Open one pooled keep-alive session reused by every request"""
+        if self.session and not self.session.closed:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.pool_limit,
+            ttl_dns_cache=self.dns_cache_ttl,
+            keepalive_timeout=self.keepalive_timeout,
+        )
+        self.session = aiohttp.ClientSession(connector=connector)
+        if self.user_stream:
+            await self.user_stream.start()
+
+    async def close(self):
+        if self._refresh:
+            self._refresh.cancel()
+        if self.user_stream:
+            await self.user_stream.stop()
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    def create_feed(self, max_age_ms: int, depth_levels: int = 0) -> BinanceBookTickerFeed:
+        return BinanceBookTickerFeed(self.ws_url, snapshot=self.depth_snapshot, max_age_ms=max_age_ms, depth_levels=depth_levels)
+
+    async def depth_snapshot(self, symbol: str, levels: int) -> dict:
+        """REST order book the depth stream is synced to: lastUpdateId, bids and asks"""
+        limit = next((limit for limit in (5, 10, 20, 50, 100, 500, 1000) if limit >= levels), 1000)
+        # Weight 2 up to 50 levels, then 5, 10 and 20
+        weight = 2 if limit <= 50 else 5 if limit <= 100 else 10 if limit <= 500 else 20
+        data = await self._read("/fapi/v1/depth", {"symbol": symbol, "limit": limit}, weight=weight)
+        if "lastUpdateId" not in data:
+            raise Exception(f"Error getting depth: {data}")
+        return data
+
+    def _http(self) -> aiohttp.ClientSession:
+        if not self.session or self.session.closed:
+            raise Exception("Binance session is not open, call initialize() first")
+        return self.session
+
+    def headroom(self) -> dict[str, float]:
+        return self.limiter.headroom()
 
     def _sign(self, params):
-        query = "&".join([f"{k}={v}" for k, v in params.items()])
-        sig = hmac.new(
-            self.secret.encode(), query.encode(), hashlib.sha256
-        ).hexdigest()
-        return query + "&signature=" + sig
+        with metrics.span("sign_seconds", exchange=self.name.value):
+            query = "&".join([f"{k}={v}" for k, v in params.items()])
+            sig = hmac.new(
+                self.secret.encode(), query.encode(), hashlib.sha256
+            ).hexdigest()
+            return query + "&signature=" + sig
+
+    def _sync_limits(self, headers):
+        for header, value in headers.items():
+            header = header.lower()
+            if header == "x-mbx-used-weight-1m":
+                self.limiter.sync_used("weight", int(value))
+            elif header == "x-mbx-order-count-10s":
+                self.limiter.sync_used("orders_10s", int(value))
+            elif header == "x-mbx-order-count-1m":
+                self.limiter.sync_used("orders_1m", int(value))
+
+    async def _request(self, method: str, path: str, params: dict = None, signed: bool = False,
+                       weight: int = 1, orders: int = 0, priority: Priority = Priority.INFO, keyed: bool = False) -> dict:
+        """
+        Send one REST request through the rate limiter. Signed requests, and keyed ones
+        (user data stream), carry the API key header.
+        Throttled requests (429/418) are re-queued after Retry-After rather than failed,
+        as long as the total wait stays under max_throttle_wait.
+        """
+        waited = 0.0
+        while True:
+            with metrics.span("rate_limit_wait_seconds", exchange=self.name.value):
+                await self.limiter.acquire(priority, weight=weight, orders_10s=orders, orders_1m=orders)
+
+            # Sign after queueing so the timestamp is fresh when the request goes out
+            query = ""
+            headers = {"X-MBX-APIKEY": self.key} if signed or keyed else None
+            if signed:
+                query = self._sign({**(params or {}), "timestamp": int(time.time() * 1000)})
+            elif params:
+                query = "&".join([f"{k}={v}" for k, v in params.items()])
+            url = f"{self.base_url}{path}?{query}" if query else f"{self.base_url}{path}"
+
+            timeout = aiohttp.ClientTimeout(total=self.retry.request_timeout)
+            with metrics.span("exchange_request_seconds", exchange=self.name.value, endpoint=f"{method} {path}"):
+                async with self._http().request(method, url, headers=headers, timeout=timeout) as r:
+                    self._sync_limits(r.headers)
+                    if r.status not in (418, 429):
+                        return await r.json()
+                    retry_after = float(r.headers.get("Retry-After", 1))
+
+            self.limiter.pause(retry_after)
+            waited += retry_after
+            log(f"[WARN] Binance throttled {path} (HTTP {r.status}), retrying in {retry_after:g}s", exchange=self.name)
+            if waited > self.max_throttle_wait:
+                raise Exception(f"Binance rate limit: {path} throttled for {waited:g}s")
+
+    async def _read(self, path: str, params: dict = None, weight: int = 1, signed: bool = False) -> dict:
+        """Idempotent GET: hedged after its p95 latency and retried with backoff until read_deadline"""
+        endpoint = f"GET {path}"
+        budget = self.retry.hedge_budget("exchange_request_seconds", exchange=self.name.value, endpoint=endpoint)
+
+        async def attempt():
+            data = await self.retry.hedged(lambda: self._request("GET", path, params, signed=signed, weight=weight), endpoint, budget)
+            if isinstance(data, dict) and data.get("code") in TRANSIENT_CODES:
+                raise TransientError(data.get("msg"))
+            return data
+
+        return await self.retry.retry(attempt, f"Binance {endpoint}", retry_on=RETRYABLE)
+
+    async def _listen_key(self, method: str) -> dict:
+        """Create (POST) or keep alive (PUT) the user data stream's listenKey"""
+        return await self._request(method, "/fapi/v1/listenKey", weight=1, keyed=True)
+
+    async def _find_order(self, symbol: str, client_id: str) -> dict:
+        """The order with this client order ID, or None if Binance never received it"""
+        data = await self._request("GET", "/fapi/v1/order", {"symbol": symbol, "origClientOrderId": client_id},
+                                   signed=True, weight=1, priority=Priority.ORDER)
+        if "orderId" in data:
+            return data
+        if data.get("code") == -2013:  # Order does not exist
+            return None
+        raise TransientError(f"Order lookup failed: {data}")
+
+    async def _place_order(self, params: dict) -> dict:
+        """
+        POST an order tagged with a fresh newClientOrderId. Before an attempt that
+        timed out or failed in transit is resent, and once more before giving up, the order
+        is looked up by that ID, so a retry can never fill twice and an order placed by a
+        cut-off attempt is never lost.
+        """
+        params = {**params, "newClientOrderId": client_order_id()}
+        submitted = False
+
+        async def lookup():
+            if not submitted:
+                return None
+            found = await self._find_order(params["symbol"], params["newClientOrderId"])
+            if found:
+                log(f"[WARN] Binance order {params['newClientOrderId']} was placed despite the failed attempt", exchange=self.name)
+            return found
+
+        async def attempt():
+            nonlocal submitted
+            found = await lookup()
+            if found:
+                return found
+            submitted = True
+            data = await self._request("POST", "/fapi/v1/order", params, signed=True, weight=0, orders=1, priority=Priority.ORDER)
+            if data.get("code") in TRANSIENT_CODES:
+                raise TransientError(data.get("msg"))
+            return data
+
+        return await self.retry.retry(attempt, f"Binance order {params['newClientOrderId']}", retry_on=RETRYABLE,
+                                      deadline=self.retry.order_deadline, recover=lookup)
+
+    @staticmethod
+    def _symbol_entry(sym: dict) -> dict:
+        filters = {f["filterType"]: f for f in sym.get("filters", [])}
+        return {
+            "quantity_precision": sym["quantityPrecision"],
+            "tick_size": filters.get("PRICE_FILTER", {}).get("tickSize"),
+            "min_notional": filters.get("MIN_NOTIONAL", {}).get("notional"),
+        }
+
+    async def _fetch_symbol_info(self) -> dict[str, dict]:
+        data = await self._read("/fapi/v1/exchangeInfo", weight=1)
+        if "symbols" not in data or len(data["symbols"]) == 0:
+            raise Exception(f"Error getting asset info: {data}")
+        symbols = {sym["symbol"]: self._symbol_entry(sym) for sym in data["symbols"]}
+        if self.metadata:
+            self.metadata.store(self.name.value, symbols)
+        return symbols
+
+    async def _refresh_symbol_info(self):
+        try:
+            self._symbol_info = await self._fetch_symbol_info()
+            log(f"Refreshed Binance metadata for {len(self._symbol_info)} symbols", exchange=self.name)
+        except Exception as e:
+            log(f"[WARN] Binance metadata refresh failed, keeping the cached copy: {e}", exchange=self.name)
+
+    async def _load_symbol_info(self) -> dict[str, dict]:
+        async with self._symbol_info_lock:
+            if self._symbol_info is None:
+                cached = self.metadata.load(self.name.value) if self.metadata else None
+                if cached:
+                    self._symbol_info = cached["symbols"]
+                    if not self.metadata.is_fresh(self.name.value):
+                        self._refresh = asyncio.ensure_future(self._refresh_symbol_info())
+                else:
+                    self._symbol_info = await self._fetch_symbol_info()
+            return self._symbol_info
 
     async def get_asset_info(self, pair: TradingPair) -> ExchangeAsset:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.base_url}/fapi/v1/exchangeInfo") as r:
-                data = await r.json()
-                if "symbols" not in data or len(data["symbols"]) == 0:
-                    raise Exception(f"Error getting asset info: {data}")
-                for sym in data["symbols"]:
-                    if sym["symbol"] == pair.binance_symbol():
-                        return ExchangeAsset(
-                            pair=pair,
-                            exchange=self.name,
-                            exchange_symbol=sym["symbol"],
-                            base_quantity_precision=sym["quantityPrecision"]
-                        )
-                log(f"Binance asset info not found for {pair}")
-                raise Exception(f"Asset info not found for {pair}")
+        symbols = await self._load_symbol_info()
+        symbol = pair.binance_symbol()
+        sym = symbols.get(symbol)
+        if sym is None:
+            log(f"Binance asset info not found for {pair}")
+            raise Exception(f"Asset info not found for {pair}")
+        return ExchangeAsset(
+            pair=pair,
+            exchange=self.name,
+            exchange_symbol=symbol,
+            base_quantity_precision=sym["quantity_precision"],
+            tick_size=Decimal(sym["tick_size"]) if sym["tick_size"] else None,
+            min_notional=Decimal(sym["min_notional"]) if sym["min_notional"] else None
+        )
     
     async def get_price(self, asset: ExchangeAsset) -> Decimal:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.base_url}/fapi/v2/ticker/price?symbol={asset.exchange_symbol}") as r:
-                data = await r.json()
-                if "price" not in data:
-                    raise Exception(f"Error getting price: {data}")
-                return Decimal(data["price"])
+        cached = self.cached_price(asset)
+        if cached is not None:
+            return cached
+        data = await self._read("/fapi/v2/ticker/price", {"symbol": asset.exchange_symbol}, weight=1)
+        if "price" not in data:
+            raise Exception(f"Error getting price: {data}")
+        return Decimal(data["price"])
 
     async def open_position(self, asset: ExchangeAsset, side: Side, price: Decimal, notional: Decimal) -> Order:
         qty = round(notional / price, asset.base_quantity_precision)
@@ -53,63 +284,201 @@ class BinanceFutures(Exchange):
             "side": "BUY" if side == Side.LONG else "SELL",
             "type": "MARKET",
             "quantity": float(qty),
-            "timestamp": int(time.time() * 1000),
+            "newOrderRespType": "RESULT",
         }
 
-        url = f"{self.base_url}/fapi/v1/order?{self._sign(params)}"
-
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers={"X-MBX-APIKEY": self.key}) as r:
-                data = await r.json()
-                if "code" in data and data["code"] != 200:
-                    log(f"[ERROR] Binance order error: {data}")
-                    raise Exception(f"Order failed: {data['msg'] if 'msg' in data else 'Unknown error'}")
+        start = time.perf_counter()
+        # New orders cost no IP weight, only order count
+        data = await self._place_order(params)
+        latency_ms = (time.perf_counter() - start) * 1000
+        if "code" in data and data["code"] != 200:
+            log(f"[ERROR] Binance order error: {data}", exchange=self.name, side=side, latency_ms=latency_ms)
+            raise Exception(f"Order failed: {data['msg'] if 'msg' in data else 'Unknown error'}")
 
-        order = Order(
-            asset=asset,
-            side=side,
-            price=price,
-            size=qty
-        )
-        self.last_order = order
-        log(f"Opening {side.value} {qty} {asset.pair.base_asset} on Binance @ ${price}")
+        order = await self._filled(asset, side, data, price, qty)
+        self.positions[asset.exchange_symbol] = order
+        log(f"Opening {side.value} {order.size} {asset.pair.base_asset} on Binance @ ${order.price}",
+            exchange=self.name, symbol=asset.exchange_symbol, side=side, price=order.price, size=order.size, latency_ms=latency_ms)
         return order
 
+    async def _filled(self, asset: ExchangeAsset, side: Side, data: dict, price: Decimal, qty: Decimal) -> Order:
+        """
+        The Order a placed market order filled as. With the user data stream connected that is
+        the average price, filled size and fee of its ORDER_TRADE_UPDATE events, which usually
+        arrive before the response; otherwise the price and size of the RESULT response. Only
+        when neither has a fill do the polled price and ordered size stand in.
+        """
+        if self.user_stream and self.user_stream.live:
+            fill = await self.user_stream.fill(data.get("clientOrderId"), self.fill_wait)
+            if fill is not None and fill.filled:
+                fee = fill.fee if fill.fee_asset == asset.pair.quote_asset else None
+                return Order(asset=asset, side=side, price=fill.avg_price, size=fill.filled, fee=fee)
+        filled = Decimal(data.get("executedQty") or 0)
+        avg_price = Decimal(data.get("avgPrice") or 0)
+        if filled and avg_price:
+            return Order(asset=asset, side=side, price=avg_price, size=filled)
+        return Order(asset=asset, side=side, price=price, size=qty)
+
+    async def open_ioc(self, asset: ExchangeAsset, side: Side, limit_price: Decimal, size: Decimal) -> Order:
+        # Round the limit towards the touch so it never allows a worse fill than asked
+        tick = asset.tick_size or Decimal("0.01")
+        limit_price = (limit_price / tick).to_integral_value("ROUND_FLOOR" if side == Side.LONG else "ROUND_CEILING") * tick
+        params = {
+            "symbol": asset.exchange_symbol,
+            "side": "BUY" if side == Side.LONG else "SELL",
+            "type": "LIMIT",
+            "timeInForce": "IOC",
+            "price": format(limit_price, "f"),
+            "quantity": float(size),
+            # The fill (executedQty, avgPrice) comes back in the response
+            "newOrderRespType": "RESULT",
+        }
+
+        start = time.perf_counter()
+        data = await self._place_order(params)
+        latency_ms = (time.perf_counter() - start) * 1000
+        if "code" in data and data["code"] != 200:
+            log(f"[ERROR] Binance IOC order error: {data}", exchange=self.name, side=side, latency_ms=latency_ms)
+            raise Exception(f"IOC order failed: {data['msg'] if 'msg' in data else 'Unknown error'}")
+
+        filled = Decimal(data.get("executedQty", "0"))
+        log(f"IOC {side.value} {size} {asset.pair.base_asset} on Binance limit ${limit_price}: filled {filled}",
+            exchange=self.name, symbol=asset.exchange_symbol, side=side, price=limit_price, size=filled, latency_ms=latency_ms)
+        if not filled:
+            return None
+        return await self._filled(asset, side, data, limit_price, filled)
+
+    async def live_positions(self) -> dict[str, tuple[Side, Decimal, Decimal]]:
+        # The user data stream keeps them current once connected
+        if self.user_stream and self.user_stream.live:
+            return dict(self.user_stream.positions)
+        return await self._rest_positions()
+
+    async def _rest_positions(self) -> dict[str, tuple[Side, Decimal, Decimal]]:
+        data = await self._read("/fapi/v2/positionRisk", weight=5, signed=True)
+        if not isinstance(data, list):
+            raise Exception(f"Error getting positions: {data}")
+        positions = {}
+        for item in data:
+            amount = Decimal(item["positionAmt"])
+            if amount:
+                positions[item["symbol"]] = (Side.LONG if amount > 0 else Side.SHORT, abs(amount), Decimal(item["entryPrice"]))
+        return positions
+
+    async def prepare_order(self, asset: ExchangeAsset, side: Side, price: Decimal, notional: Decimal) -> PreparedOrder:
+        qty = round(notional / price, asset.base_quantity_precision)
+        with metrics.span("rate_limit_wait_seconds", exchange=self.name.value):
+            await self.limiter.acquire(Priority.ORDER, weight=0, orders_10s=1, orders_1m=1)
+
+        # Everything but the POST itself happens here: the signed form body, URL and headers
+        signed_at = time.time()
+        client_id = client_order_id()
+        body = self._sign({
+            "symbol": asset.exchange_symbol,
+            "side": "BUY" if side == Side.LONG else "SELL",
+            "type": "MARKET",
+            "quantity": float(qty),
+            "newOrderRespType": "RESULT",
+            "newClientOrderId": client_id,
+            "recvWindow": self.recv_window,
+            "timestamp": int(signed_at * 1000),
+        })
+        url = f"{self.base_url}/fapi/v1/order"
+        headers = {"X-MBX-APIKEY": self.key, "Content-Type": "application/x-www-form-urlencoded"}
+        prepared = PreparedOrder(asset, side, price, qty, expires_at=signed_at + self.recv_window / 1000)
+
+        async def send() -> Order:
+            session = self._http()
+            prepared.sent_at = start = time.perf_counter()
+            try:
+                with metrics.span("exchange_request_seconds", exchange=self.name.value, endpoint="POST /fapi/v1/order"):
+                    async with session.post(url, data=body, headers=headers, timeout=aiohttp.ClientTimeout(total=self.retry.request_timeout)) as r:
+                        self._sync_limits(r.headers)
+                        if r.status in (418, 429):
+                            self.limiter.pause(float(r.headers.get("Retry-After", 1)))
+                            raise Exception(f"Order throttled (HTTP {r.status})")
+                        data = await r.json()
+                if data.get("code") in TRANSIENT_CODES:
+                    raise TransientError(data.get("msg"))
+            except RETRYABLE as e:
+                # Settle whether it was placed before anyone sends a replacement
+                data = await self.retry.retry(lambda: self._find_order(asset.exchange_symbol, client_id),
+                                              f"Binance order lookup {client_id}", retry_on=RETRYABLE)
+                if not data:
+                    raise Exception(f"Order {client_id} was not placed: {e!r}")
+            latency_ms = (time.perf_counter() - start) * 1000
+            if "code" in data and data["code"] != 200:
+                log(f"[ERROR] Binance order error: {data}", exchange=self.name, side=side, latency_ms=latency_ms)
+                raise Exception(f"Order failed: {data['msg'] if 'msg' in data else 'Unknown error'}")
+
+            order = await self._filled(asset, side, data, price, qty)
+            self.positions[asset.exchange_symbol] = order
+            log(f"Opening {side.value} {order.size} {asset.pair.base_asset} on Binance @ ${order.price}",
+                exchange=self.name, symbol=asset.exchange_symbol, side=side, price=order.price, size=order.size, latency_ms=latency_ms)
+            return order
+
+        prepared.send = send
+        return prepared
+
     async def open_long(self, asset: ExchangeAsset, price: Decimal, notional: Decimal) -> Order:
-        return await self.open_position(asset, Side.LONG, price, notional)
+        return await self.execute(asset, Side.LONG, price, notional)
 
     async def open_short(self, asset: ExchangeAsset, price: Decimal, notional: Decimal) -> Order:
-        return await self.open_position(asset, Side.SHORT, price, notional)
+        return await self.execute(asset, Side.SHORT, price, notional)
+
+    async def rebalance(self, asset: ExchangeAsset, side: Side, size: Decimal, price: Decimal) -> Order:
+        trade_side, qty = self.net_order(asset, side, size)
+        if not qty:
+            return None
+
+        params = {
+            "symbol": asset.exchange_symbol,
+            "side": "BUY" if trade_side == Side.LONG else "SELL",
+            "type": "MARKET",
+            "quantity": float(qty),
+            "newOrderRespType": "RESULT",
+        }
 
-    async def close_position(self, close_price: Decimal) -> Order:
+        start = time.perf_counter()
+        data = await self._place_order(params)
+        latency_ms = (time.perf_counter() - start) * 1000
+        if "code" in data and data["code"] != 200:
+            log(f"[ERROR] Binance rebalance error: {data}", exchange=self.name, side=trade_side, latency_ms=latency_ms)
+            raise Exception(f"Rebalance failed: {data['msg'] if 'msg' in data else 'Unknown error'}")
+
+        trade = await self._filled(asset, trade_side, data, price, qty)
+        self.set_position(asset, side, size, trade.price)
+        log(f"Rebalanced {asset.pair.base_asset} on Binance to {side.value} {size}: {trade_side.value} {trade.size} @ ${trade.price}",
+            exchange=self.name, symbol=asset.exchange_symbol, side=trade_side, price=trade.price, size=trade.size, latency_ms=latency_ms)
+        return trade
+
+    async def close_position(self, asset: ExchangeAsset, close_price: Decimal) -> Order:
         """Close a position by placing opposite side order"""
-        if not self.last_order:
-            raise Exception("No position to close")
+        position = self.positions.get(asset.exchange_symbol)
+        if not position:
+            raise Exception(f"No {asset.exchange_symbol} position to close")
             
-        close_side = "BUY" if self.last_order.side == Side.SHORT else "SELL"
+        close_side = "BUY" if position.side == Side.SHORT else "SELL"
 
         params = {
-            "symbol": self.last_order.asset.exchange_symbol,
+            "symbol": position.asset.exchange_symbol,
             "side": close_side,
             "type": "MARKET",
-            "quantity": float(self.last_order.size),
-            "timestamp": int(time.time() * 1000),
+            "quantity": float(position.size),
+            "newOrderRespType": "RESULT",
         }
 
-        url = f"{self.base_url}/fapi/v1/order?{self._sign(params)}"
+        start = time.perf_counter()
+        data = await self._place_order(params)
+        latency_ms = (time.perf_counter() - start) * 1000
+        if "code" in data and data["code"] != 200:
+            log(f"[Error] Binance close error: {data}", exchange=self.name, latency_ms=latency_ms)
+            raise Exception(f"Close failed: {data['msg'] if 'msg' in data else 'Unknown error'}")
 
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, headers={"X-MBX-APIKEY": self.key}) as r:
-                data = await r.json()
-                if "code" in data and data["code"] != 200:
-                    log(f"[Error] Binance close error: {data}")
-                    raise Exception(f"Close failed: {data['msg'] if 'msg' in data else 'Unknown error'}")
-
-        close_order = Order(
-            asset=self.last_order.asset,
-            side=Side.SHORT if self.last_order.side == Side.LONG else Side.LONG,
-            price=close_price,
-            size=self.last_order.size
-        )
-        log(f"Closed {self.last_order.side.value} {self.last_order.asset.pair.base_asset} on Binance @ ${close_price}")
+        close_order = await self._filled(position.asset, Side.SHORT if position.side == Side.LONG else Side.LONG,
+                                         data, close_price, position.size)
+        del self.positions[asset.exchange_symbol]
+        log(f"Closed {position.side.value} {position.asset.pair.base_asset} on Binance @ ${close_order.price}",
+            exchange=self.name, symbol=close_order.asset.exchange_symbol, side=close_order.side, price=close_order.price,
+            size=close_order.size, latency_ms=latency_ms)
         return close_order
@@ -1,52 +1,238 @@
-import eth_account
+import aiohttp, asyncio, eth_account, requests, threading, time, uuid
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 from exchanges.base import Exchange
+from exchanges.registry import register
+from market_data.hyperliquid import HyperliquidFeed
+from utils import metrics
 from utils.logger import log
+from utils.rate_limit import Priority, RateLimiter, TokenBucket
+from utils.retry import RetryPolicy, TransientError
+from hyperliquid.api import API
 from hyperliquid.info import Info
 from hyperliquid.exchange import Exchange as HLExchange
+from hyperliquid.utils.constants import MAINNET_API_URL
+from hyperliquid.utils.error import ServerError
+from hyperliquid.utils.types import Cloid
+from hyperliquid.utils.signing import get_timestamp_ms, order_request_to_order_wire, order_wires_to_order_action, sign_l1_action
 from models.asset import ExchangeAsset, ExchangeName, TradingPair
-from models.order import Order, Side
+from models.order import Order, PreparedOrder, Side
 
+# Failures after which the call may be retried (an order only after looking it up)
+RETRYABLE = (asyncio.TimeoutError, aiohttp.ClientError, requests.exceptions.Timeout,
+             requests.exceptions.ConnectionError, ServerError, TransientError)
+
+@register("hyperliquid")
 class Hyperliquid(Exchange):
     def __init__(self, cfg):
         self.name = ExchangeName.HYPERLIQUID
         self.base_url = cfg["base_url"]
         self.key = cfg["api_key"]
         self.secret = cfg["api_secret"]
-        self.last_order: Order = None
+        self.positions: dict[str, Order] = {}
+        self._mids_request: asyncio.Future = None
+        self.ws_url = cfg.get("ws_url", self.base_url.replace("https://", "wss://").replace("http://", "ws://") + "/ws")
+
+        self.account = eth_account.Account.from_key(self.secret)
+
+        # The SDK is synchronous (requests-based). Every SDK call runs on this
+        # dedicated executor so it never blocks the event loop and the other leg
+        # of an asyncio.gather can make progress at the same time.
+        self.executor = ThreadPoolExecutor(max_workers=cfg.get("sdk_workers", 4), thread_name_prefix="hyperliquid")
+        self.Info: Info = None
+        self.HLExchange: HLExchange = None
+        self._symbols: dict[str, dict] = {}   # Perp symbol index, see _symbol_index()
+        self._refresh: asyncio.Task = None
+
+        # Pre-signed orders (prepare_order) are posted directly on a pooled session
+        self.pool_limit = cfg.get("pool_limit", 20)
+        self.keepalive_timeout = cfg.get("keepalive_timeout", 60)
+        self.session: aiohttp.ClientSession = None
+        self.order_expiry = cfg.get("order_expiry_ms", 5000)  # Venue rejects a pre-signed order after this
+        self._nonce = 0
+        self._nonce_lock = threading.Lock()
+
+        # Per-request timeout (also passed to the SDK), per-operation deadlines, retries and read hedging
+        self.retry = RetryPolicy(cfg.get("timeouts", {}))
+
+        # Hyperliquid allows 1200 weight per minute per IP. Weights per call are
+        # documented at the call sites below.
+        limits = cfg.get("rate_limits", {})
+        self.limiter = RateLimiter({"weight": TokenBucket(limits.get("weight_per_minute", 1200), 60)})
+
+    async def initialize(self):
+        """
+        Build the SDK clients. Both normally download meta and spotMeta on construction;
+        here they get them from the metadata cache (no network at all) or from a single
+        download shared by the two.
+        """
+        if not self.session or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_limit, keepalive_timeout=self.keepalive_timeout)
+            self.session = aiohttp.ClientSession(connector=connector)
+        if self.Info and self.HLExchange:
+            return
+        cached = self.metadata.load(self.name.value) if self.metadata else None
+        if cached and "raw" in cached:
+            self._build_clients(cached["raw"]["meta"], cached["raw"]["spot_meta"])
+            if not self.metadata.is_fresh(self.name.value):
+                self._refresh = asyncio.ensure_future(self._refresh_meta())
+        else:
+            self._build_clients(*await self._fetch_meta())
+
+    def _build_clients(self, meta: dict, spot_meta: dict):
+        """Construct Info and Exchange from meta/spotMeta without any request"""
+        timeout = self.retry.request_timeout
+        self.Info = Info(base_url=self.base_url, skip_ws=True, meta=meta, spot_meta=spot_meta, timeout=timeout)
+        self.HLExchange = HLExchange(wallet=self.account, base_url=self.base_url, meta=meta, spot_meta=spot_meta,
+                                     account_address=self.key, timeout=timeout)
+        self._symbols = self._symbol_index(meta)
+
+    @staticmethod
+    def _symbol_index(meta: dict) -> dict[str, dict]:
+        # Prices may have at most 6 - szDecimals decimals, and orders must be worth at least $10
+        return {
+            info["name"]: {
+                "quantity_precision": info["szDecimals"],
+                "asset_id": asset_id,
+                "tick_size": format(Decimal(1).scaleb(info["szDecimals"] - 6), "f"),
+                "min_notional": "10",
+            }
+            for asset_id, info in enumerate(meta["universe"])
+        }
+
+    async def _fetch_meta(self) -> tuple[dict, dict]:
+        api = API(self.base_url, self.retry.request_timeout)
+        # meta and spotMeta cost 20 weight each
+        meta, spot_meta = await asyncio.gather(
+            self.retry.retry(lambda: self._sdk(20, Priority.INFO, api.post, "/info", {"type": "meta"}),
+                             "Hyperliquid meta", retry_on=RETRYABLE),
+            self.retry.retry(lambda: self._sdk(20, Priority.INFO, api.post, "/info", {"type": "spotMeta"}),
+                             "Hyperliquid spotMeta", retry_on=RETRYABLE),
+        )
+        if self.metadata:
+            self.metadata.store(self.name.value, self._symbol_index(meta), raw={"meta": meta, "spot_meta": spot_meta})
+        return meta, spot_meta
+
+    async def _refresh_meta(self):
+        try:
+            self._build_clients(*await self._fetch_meta())
+            log(f"Refreshed Hyperliquid metadata for {len(self._symbols)} perps", exchange=self.name)
+        except Exception as e:
+            log(f"[WARN] Hyperliquid metadata refresh failed, keeping the cached copy: {e}", exchange=self.name)
+
+    async def close(self):
+        if self._refresh:
+            self._refresh.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
 
-        account = eth_account.Account.from_key(self.secret)
+    def create_feed(self, max_age_ms: int, depth_levels: int = 0) -> HyperliquidFeed:
+        return HyperliquidFeed(self.ws_url, max_age_ms=max_age_ms, depth_levels=depth_levels)
 
-        self.Info = Info(base_url=self.base_url, skip_ws=True)
-        self.HLExchange = HLExchange(wallet=account, base_url=self.base_url, account_address=self.key)
+    def headroom(self) -> dict[str, float]:
+        return self.limiter.headroom()
+
+    async def _run(self, fn, *args, **kwargs):
+        """Run a blocking SDK call on the Hyperliquid executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, lambda: fn(*args, **kwargs))
+
+    async def _sdk(self, weight: int, priority: Priority, fn, *args, **kwargs):
+        """Wait for rate-limit headroom, then run the SDK call on the executor"""
+        with metrics.span("rate_limit_wait_seconds", exchange=self.name.value):
+            await self.limiter.acquire(priority, weight=weight)
+        # Covers executor queueing, SDK signing and the HTTP round trip
+        with metrics.span("exchange_request_seconds", exchange=self.name.value, endpoint=fn.__name__):
+            return await self._run(fn, *args, **kwargs)
 
     async def get_asset_info(self, pair: TradingPair) -> ExchangeAsset:
         """Get asset info from Hyperliquid"""
         # For Hyperliquid, the pair is typically the asset name directly
         # e.g., "BTC-USDT" -> "BTC"
         asset_name = pair.hyperliquid_symbol()
-        
-        try:
-            hl_asset = self.Info.name_to_asset(asset_name)
-            decimalSz = self.Info.asset_to_sz_decimals[hl_asset]
-            
-            return ExchangeAsset(
-                pair=pair,
-                exchange=self.name,
-                exchange_symbol=asset_name,
-                base_quantity_precision=decimalSz
-            )
-        except Exception as e:
-            raise Exception(f"Asset info not found for {asset_name}: {e}")
+        sym = self._symbols.get(asset_name)
+        if sym is None:
+            raise Exception(f"Asset info not found for {asset_name}")
+        return ExchangeAsset(
+            pair=pair,
+            exchange=self.name,
+            exchange_symbol=asset_name,
+            base_quantity_precision=sym["quantity_precision"],
+            tick_size=Decimal(sym["tick_size"]),
+            min_notional=Decimal(sym["min_notional"])
+        )
 
     async def get_price(self, asset: ExchangeAsset) -> Decimal:
+        cached = self.cached_price(asset)
+        if cached is not None:
+            return cached
         try:
-            all_mids = self.Info.all_mids()
+            all_mids = await self._all_mids()
             mid_price = all_mids[asset.exchange_symbol]
             return Decimal(str(mid_price))
         except Exception as e:
             raise Exception(f"Error getting price: {e}")
 
+    async def _all_mids(self) -> dict:
+        """
+        all_mids() returns every coin, so concurrent get_price calls from
+        different pairs share one in-flight request instead of each sending their own.
+        """
+        if self._mids_request is None:
+            budget = self.retry.hedge_budget("exchange_request_seconds", exchange=self.name.value, endpoint="all_mids")
+            self._mids_request = asyncio.ensure_future(self.retry.retry(
+                lambda: self.retry.hedged(lambda: self._sdk(2, Priority.INFO, self.Info.all_mids), "all_mids", budget),
+                "Hyperliquid all_mids", retry_on=RETRYABLE
+            ))
+            self._mids_request.add_done_callback(lambda _: setattr(self, "_mids_request", None))
+        return await asyncio.shield(self._mids_request)
+
+    async def _find_order(self, cloid: Cloid, fallback_px: Decimal) -> dict:
+        """The SDK-style order result for cloid, or None if Hyperliquid never received it"""
+        data = await self._sdk(2, Priority.ORDER, self.Info.query_order_by_cloid, self.key, cloid)
+        if data.get("status") == "unknownOid":
+            return None
+        if data.get("status") != "order":
+            raise TransientError(f"Order lookup failed: {data}")
+        order = data["order"]
+        if order["status"] != "filled":
+            status = {"error": f"Order {cloid} {order['status']}"}
+        else:
+            # orderStatus carries no average fill price, the polled price stands in for it
+            status = {"filled": {"avgPx": str(fallback_px), "totalSz": order["order"]["origSz"]}}
+        return {"status": "ok", "response": {"data": {"statuses": [status]}}}
+
+    async def _place_order(self, weight: int, fallback_px: Decimal, fn, coin: str, *args, **kwargs) -> dict:
+        """
+        Run an SDK order call tagged with a fresh cloid. Before an attempt that failed in
+        transit is repeated, and once more before giving up, the order is looked up by that
+        cloid, so a retry can never fill twice and an order placed by a cut-off attempt is
+        never lost.
+        """
+        cloid = Cloid.from_str("0x" + uuid.uuid4().hex)
+        submitted = False
+
+        async def lookup():
+            if not submitted:
+                return None
+            found = await self._find_order(cloid, fallback_px)
+            if found:
+                log(f"[WARN] Hyperliquid order {cloid} was placed despite the failed attempt", exchange=self.name)
+            return found
+
+        async def attempt():
+            nonlocal submitted
+            found = await lookup()
+            if found:
+                return found
+            submitted = True
+            return await self._sdk(weight, Priority.ORDER, fn, coin, *args, cloid=cloid, **kwargs)
+
+        return await self.retry.retry(attempt, f"Hyperliquid order {cloid}", retry_on=RETRYABLE,
+                                      deadline=self.retry.order_deadline, recover=lookup)
+
     async def open_position(self, asset: ExchangeAsset, side: Side, price: Decimal, notional: Decimal) -> Order:
         # Convert from notional to size in asset units
         qty = round(notional / price, asset.base_quantity_precision)
@@ -54,14 +240,19 @@ class Hyperliquid(Exchange):
         is_buy = side == Side.LONG
 
         try:
-            order_result = self.HLExchange.market_open(asset.exchange_symbol, is_buy, float(qty))
+            # Pass the polled price so the SDK does not fetch all_mids again for its slippage price
+            start = time.perf_counter()
+            order_result = await self._place_order(1, price, self.HLExchange.market_open, asset.exchange_symbol, is_buy, float(qty), px=float(price))
+            latency_ms = (time.perf_counter() - start) * 1000
         
             if order_result["status"] == "ok":
                 for status in order_result["response"]["data"]["statuses"]:
                     try:
                         filled = status["filled"]
                         filled_price = Decimal(filled['avgPx'])
-                        log(f"Opening {side.value} {qty} {asset.pair.base_asset} on Hyperliquid @ ${filled_price}")
+                        log(f"Opening {side.value} {qty} {asset.pair.base_asset} on Hyperliquid @ ${filled_price}",
+                            exchange=self.name, symbol=asset.exchange_symbol, side=side, price=filled_price, size=qty,
+                            latency_ms=latency_ms)
                         
                         order = Order(
                             asset=asset,
@@ -69,25 +260,162 @@ class Hyperliquid(Exchange):
                             price=filled_price,
                             size=qty
                         )
-                        self.last_order = order
+                        self.positions[asset.exchange_symbol] = order
                         return order
                     except KeyError:
                         raise Exception(f'Error on opening {asset.pair.base_asset} position: {status["error"]}')
         except Exception as e:
             raise Exception(f"Open Market Order on Hyperliquid failed: {e}")
 
+    async def open_ioc(self, asset: ExchangeAsset, side: Side, limit_price: Decimal, size: Decimal) -> Order:
+        coin = asset.exchange_symbol
+        is_buy = side == Side.LONG
+        # Same rounding the SDK applies to market orders (5 significant figures, 6 - szDecimals decimals)
+        limit_px = self.HLExchange._slippage_price(coin, is_buy, 0, float(limit_price))
+
+        start = time.perf_counter()
+        order_result = await self._place_order(1, limit_price, self.HLExchange.order, coin, is_buy, float(size), limit_px,
+                                               {"limit": {"tif": "Ioc"}})
+        latency_ms = (time.perf_counter() - start) * 1000
+        if order_result.get("status") != "ok":
+            raise Exception(f"IOC order on Hyperliquid failed: {order_result}")
+
+        for status in order_result["response"]["data"]["statuses"]:
+            filled = status.get("filled")
+            if not filled:
+                # An IOC that found nothing to trade against is cancelled with an error status
+                log(f"IOC {side.value} {size} {asset.pair.base_asset} on Hyperliquid limit ${limit_px}: {status.get('error')}",
+                    exchange=self.name, symbol=coin, side=side, price=limit_px, size=0, latency_ms=latency_ms)
+                return None
+            log(f"IOC {side.value} {size} {asset.pair.base_asset} on Hyperliquid limit ${limit_px}: filled {filled['totalSz']}",
+                exchange=self.name, symbol=coin, side=side, price=limit_px, size=filled["totalSz"], latency_ms=latency_ms)
+            return Order(asset=asset, side=side, price=Decimal(filled["avgPx"]), size=Decimal(str(filled["totalSz"])))
+        return None
+
+    async def live_positions(self) -> dict[str, tuple[Side, Decimal, Decimal]]:
+        # clearinghouseState costs weight 2
+        state = await self.retry.retry(lambda: self._sdk(2, Priority.INFO, self.Info.user_state, self.key),
+                                       "Hyperliquid user_state", retry_on=RETRYABLE)
+        positions = {}
+        for item in state["assetPositions"]:
+            position = item["position"]
+            szi = Decimal(position["szi"])
+            if szi:
+                positions[position["coin"]] = (Side.LONG if szi > 0 else Side.SHORT, abs(szi), Decimal(position["entryPx"]))
+        return positions
+
+    def _next_nonce(self) -> int:
+        """Millisecond nonce, strictly increasing even for orders signed in the same millisecond"""
+        with self._nonce_lock:
+            self._nonce = max(get_timestamp_ms(), self._nonce + 1)
+            return self._nonce
+
+    def _signed_order(self, coin: str, is_buy: bool, sz: float, px: float, cloid: Cloid) -> dict:
+        """The /exchange payload market_open would post, built without posting it"""
+        # Market order = aggressive IOC limit order at the SDK's slippage price
+        limit_px = self.HLExchange._slippage_price(coin, is_buy, HLExchange.DEFAULT_SLIPPAGE, px)
+        order = {"coin": coin, "is_buy": is_buy, "sz": sz, "limit_px": limit_px,
+                 "order_type": {"limit": {"tif": "Ioc"}}, "reduce_only": False, "cloid": cloid}
+        action = order_wires_to_order_action([order_request_to_order_wire(order, self.HLExchange.info.name_to_asset(coin))])
+        nonce = self._next_nonce()
+        expires_after = nonce + self.order_expiry
+        signature = sign_l1_action(self.account, action, None, nonce, expires_after, self.base_url == MAINNET_API_URL)
+        return {"action": action, "nonce": nonce, "signature": signature, "vaultAddress": None, "expiresAfter": expires_after}
+
+    async def prepare_order(self, asset: ExchangeAsset, side: Side, price: Decimal, notional: Decimal) -> PreparedOrder:
+        qty = round(notional / price, asset.base_quantity_precision)
+        with metrics.span("rate_limit_wait_seconds", exchange=self.name.value):
+            await self.limiter.acquire(Priority.ORDER, weight=1)
+
+        # EIP-712 signing takes milliseconds of CPU, so it runs on the executor
+        signed_at = time.time()
+        cloid = Cloid.from_str("0x" + uuid.uuid4().hex)
+        with metrics.span("sign_seconds", exchange=self.name.value):
+            payload = await self._run(self._signed_order, asset.exchange_symbol, side == Side.LONG, float(qty), float(price), cloid)
+        url = f"{self.base_url}/exchange"
+        prepared = PreparedOrder(asset, side, price, qty, expires_at=signed_at + self.order_expiry / 1000)
+
+        async def send() -> Order:
+            if not self.session or self.session.closed:
+                raise Exception("Hyperliquid session is not open, call initialize() first")
+            prepared.sent_at = start = time.perf_counter()
+            try:
+                with metrics.span("exchange_request_seconds", exchange=self.name.value, endpoint="exchange"):
+                    async with self.session.post(url, json=payload, timeout=aiohttp.ClientTimeout(total=self.retry.request_timeout)) as r:
+                        if r.status >= 500:
+                            raise TransientError(f"HTTP {r.status}")
+                        if r.status != 200:
+                            raise Exception(f"Order failed (HTTP {r.status}): {await r.text()}")
+                        order_result = await r.json()
+            except RETRYABLE as e:
+                # Settle whether it was placed before anyone sends a replacement
+                order_result = await self.retry.retry(lambda: self._find_order(cloid, price),
+                                                      f"Hyperliquid order lookup {cloid}", retry_on=RETRYABLE)
+                if not order_result:
+                    raise Exception(f"Order {cloid} was not placed: {e!r}")
+            latency_ms = (time.perf_counter() - start) * 1000
+
+            if order_result.get("status") != "ok":
+                raise Exception(f"Open Market Order on Hyperliquid failed: {order_result}")
+            for status in order_result["response"]["data"]["statuses"]:
+                try:
+                    filled_price = Decimal(status["filled"]["avgPx"])
+                except KeyError:
+                    raise Exception(f'Error on opening {asset.pair.base_asset} position: {status["error"]}')
+                log(f"Opening {side.value} {qty} {asset.pair.base_asset} on Hyperliquid @ ${filled_price}",
+                    exchange=self.name, symbol=asset.exchange_symbol, side=side, price=filled_price, size=qty,
+                    latency_ms=latency_ms)
+                order = Order(asset=asset, side=side, price=filled_price, size=qty)
+                self.positions[asset.exchange_symbol] = order
+                return order
+            raise Exception("Open Market Order on Hyperliquid returned no status")
+
+        prepared.send = send
+        return prepared
+
     async def open_long(self, asset: ExchangeAsset, price: Decimal, notional: Decimal) -> Order:
         """Open a long position"""
-        return await self.open_position(asset, Side.LONG, price, notional)
+        return await self.execute(asset, Side.LONG, price, notional)
 
     async def open_short(self, asset: ExchangeAsset, price: Decimal,  notional: Decimal) -> Order:
         """Open a short position"""
-        return await self.open_position(asset, Side.SHORT, price, notional)
-    async def close_position(self, close_price: Decimal) -> Order:
-        if not self.last_order:
-            raise Exception("No position to close")
+        return await self.execute(asset, Side.SHORT, price, notional)
+
+    async def rebalance(self, asset: ExchangeAsset, side: Side, size: Decimal, price: Decimal) -> Order:
+        trade_side, qty = self.net_order(asset, side, size)
+        if not qty:
+            return None
+
+        start = time.perf_counter()
+        # Hyperliquid nets orders into the position, so a flip is one order of both sizes
+        order_result = await self._place_order(1, price, self.HLExchange.market_open, asset.exchange_symbol,
+                                               trade_side == Side.LONG, float(qty), px=float(price))
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        if order_result["status"] == "ok":
+            for status in order_result["response"]["data"]["statuses"]:
+                try:
+                    filled = status["filled"]
+                    filled_price = Decimal(filled['avgPx'])
+                except KeyError:
+                    raise Exception(f'Error on rebalancing {asset.pair.base_asset} position: {status["error"]}')
+                self.set_position(asset, side, size, filled_price)
+                log(f"Rebalanced {asset.pair.base_asset} on Hyperliquid to {side.value} {size}: {trade_side.value} {qty} @ ${filled_price}",
+                    exchange=self.name, symbol=asset.exchange_symbol, side=trade_side, price=filled_price, size=qty,
+                    latency_ms=latency_ms)
+                return Order(asset=asset, side=trade_side, price=filled_price, size=qty)
+
+        raise Exception(f"Rebalance failed with status: {order_result.get('status', 'unknown')}")
+
+    async def close_position(self, asset: ExchangeAsset, close_price: Decimal) -> Order:
+        position = self.positions.get(asset.exchange_symbol)
+        if not position:
+            raise Exception(f"No {asset.exchange_symbol} position to close")
             
-        order_result = self.HLExchange.market_close(self.last_order.asset.exchange_symbol)
+        start = time.perf_counter()
+        # market_close reads clearinghouseState and allMids (2 each) before the order (1)
+        order_result = await self._place_order(5, close_price, self.HLExchange.market_close, position.asset.exchange_symbol)
+        latency_ms = (time.perf_counter() - start) * 1000
         
         if order_result["status"] == "ok":
             for status in order_result["response"]["data"]["statuses"]:
@@ -95,17 +423,19 @@ class Hyperliquid(Exchange):
                     filled = status["filled"]
                     filled_price = Decimal(filled['avgPx'])
                     filled_size = Decimal(str(filled['totalSz']))
-                    log(f"Closed {self.last_order.side.value} {self.last_order.asset.pair.base_asset} on Hyperliquid @ ${filled_price}")
-                    
                     # Closing a long = short order, closing a short = long order
-                    close_side = Side.SHORT if self.last_order.side == Side.LONG else Side.LONG
+                    close_side = Side.SHORT if position.side == Side.LONG else Side.LONG
+                    log(f"Closed {position.side.value} {position.asset.pair.base_asset} on Hyperliquid @ ${filled_price}",
+                        exchange=self.name, symbol=position.asset.exchange_symbol, side=close_side, price=filled_price,
+                        size=filled_size, latency_ms=latency_ms)
                     
                     close_order = Order(
-                        asset=self.last_order.asset,
+                        asset=position.asset,
                         side=close_side,
                         price=filled_price,
                         size=filled_size
                     )
+                    del self.positions[asset.exchange_symbol]
                     return close_order
                 except KeyError:
                     raise Exception(f'Error on closing position: {status["error"]}')
@@ -0,0 +1,60 @@
+import json, os, time
+from utils.logger import log
+
+class MetadataCache:
+    """
+    On-disk cache of symbol metadata, one JSON file per venue under root:
+
+        {"fetched_at": <epoch seconds>,
+         "symbols": {"BTCUSDT": {"quantity_precision": 3, "tick_size": "0.10", "min_notional": "100"}, ...},
+         "raw": <venue payload an adapter needs to rebuild its clients, optional>}
+
+    load() is a plain synchronous read so startup never waits on the network. Entries
+    older than ttl are still served; is_fresh() tells the adapter to refresh them in
+    the background. Writes go to a temporary file that is renamed into place, so a
+    crash never leaves a half-written cache.
+    """
+    def __init__(self, root: str = "metadata", ttl: float = 24 * 3600):
+        self.root = root
+        self.ttl = ttl
+        self._venues: dict[str, dict] = {}
+
+    def _path(self, venue: str) -> str:
+        return os.path.join(self.root, f"{venue.lower()}.json")
+
+    def load(self, venue: str) -> dict:
+        """The cached entry for venue, or None if there is none (or it is unreadable)"""
+        if venue not in self._venues:
+            try:
+                with open(self._path(venue)) as f:
+                    entry = json.load(f)
+                if not isinstance(entry.get("symbols"), dict):
+                    raise ValueError("no symbol index")
+            except FileNotFoundError:
+                return None
+            except (OSError, ValueError) as e:
+                log(f"[WARN] Ignoring unreadable {venue} metadata cache: {e}")
+                return None
+            self._venues[venue] = entry
+        return self._venues[venue]
+
+    def is_fresh(self, venue: str) -> bool:
+        entry = self.load(venue)
+        return entry is not None and time.time() - entry["fetched_at"] < self.ttl
+
+    def symbol(self, venue: str, symbol: str) -> dict:
+        entry = self.load(venue)
+        return entry["symbols"].get(symbol) if entry else None
+
+    def store(self, venue: str, symbols: dict[str, dict], raw=None):
+        entry = {"fetched_at": time.time(), "symbols": symbols}
+        if raw is not None:
+            entry["raw"] = raw
+        os.makedirs(self.root, exist_ok=True)
+        path = self._path(venue)
+        # Per-process temp file, so shard workers refreshing together never interleave writes
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(entry, f, separators=(",", ":"))
+        os.replace(tmp, path)
+        self._venues[venue] = entry
@@ -0,0 +1,41 @@
+import importlib
+from exchanges.base import Exchange
+
+# Exchange classes by config key, filled by @register as their modules are imported
+EXCHANGES: dict[str, type[Exchange]] = {}
+
+# Built-in adapters, imported on first use so a plugin-only setup does not need their SDKs
+BUILTIN = {"hyperliquid": "exchanges.hyperliquid", "binance": "exchanges.binance"}
+
+def register(key: str):
+    """
+    Class decorator that makes an Exchange available under `exchanges.<key>` in config.yaml.
+    A plugin venue is a module that defines and registers its class (and its ExchangeName,
+    see ExchangeName.add) and is listed under `plugins:`.
+    """
+    def decorator(cls: type[Exchange]) -> type[Exchange]:
+        if key in EXCHANGES and EXCHANGES[key] is not cls:
+            raise Exception(f"Exchange '{key}' is already registered by {EXCHANGES[key].__name__}")
+        EXCHANGES[key] = cls
+        return cls
+    return decorator
+
+def load_plugins(modules: list[str]):
+    """Import plugin modules so their @register decorators run"""
+    for module in modules:
+        importlib.import_module(module)
+
+def create(key: str, cfg) -> Exchange:
+    if key not in EXCHANGES and key in BUILTIN:
+        importlib.import_module(BUILTIN[key])
+    if key not in EXCHANGES:
+        raise Exception(f"Unknown exchange '{key}', registered: {', '.join(sorted(EXCHANGES)) or 'none'}")
+    return EXCHANGES[key](cfg)
+
+def create_all(cfg) -> list[Exchange]:
+    """One Exchange per entry under `exchanges:` in config order, skipping entries with enabled: false"""
+    load_plugins(cfg.get("plugins", []))
+    exchanges = [create(key, venue_cfg) for key, venue_cfg in cfg["exchanges"].items() if venue_cfg.get("enabled", True)]
+    if len(exchanges) < 2:
+        raise Exception(f"At least two exchanges are needed, {len(exchanges)} configured")
+    return exchanges
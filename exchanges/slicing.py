@@ -0,0 +1,91 @@
+import asyncio
+from decimal import Decimal
+from models.asset import ExchangeAsset
+from models.order import Order, Side
+from utils.logger import log
+
+class Slicer:
+    """
+    Depth-aware execution of opening orders. Before an order goes out, its expected VWAP and
+    slippage against the mid are read off the venue's streamed L2 book. If a single market
+    order would cost more than impact_budget_bps, it is split:
+
+      child: market orders, each the largest notional the current book absorbs within the
+             budget (at least 1/max_children of the total), child_interval_ms apart
+      ioc:   limit IOC orders priced at mid +/- the budget, so no fill is worse than it;
+             each one is re-priced on the refreshed book
+
+    After max_children slices, whatever is left goes out as one market order, so the leg
+    always reaches its full size and the pair stays hedged. Without a fresh book the order
+    is sent whole, as before.
+    """
+    def __init__(self, cfg: dict):
+        self.budget_bps = cfg.get("impact_budget_bps", 5)
+        self.mode = cfg.get("mode", "child")
+        self.max_children = cfg.get("max_children", 5)
+        self.interval = cfg.get("child_interval_ms", 200) / 1000
+        if self.mode not in ("child", "ioc"):
+            raise Exception(f"Unknown slicing mode: {self.mode}")
+
+    async def execute(self, exchange, asset: ExchangeAsset, side: Side, price: Decimal, notional: Decimal) -> Order:
+        estimate = exchange.estimate(asset, side, notional)
+        if estimate is None or estimate[1] <= self.budget_bps:
+            order = await exchange.open_position(asset, side, price, notional)
+            if estimate is not None:
+                log(f"Expected {estimate[1]:.2f} bps slippage on {asset.exchange_symbol}, within the {self.budget_bps:g} bps budget",
+                    exchange=exchange.name, symbol=asset.exchange_symbol, expected_vwap=round(estimate[0], 8),
+                    expected_bps=round(estimate[1], 2))
+            return order
+
+        qty = round(notional / price, asset.base_quantity_precision)
+        log(f"Slicing {side.value} {qty} {asset.pair.base_asset} on {exchange.name.value}: one order would cost "
+            f"{estimate[1]:.2f} bps, budget {self.budget_bps:g} bps", exchange=exchange.name, symbol=asset.exchange_symbol,
+            side=side, size=qty, expected_vwap=round(estimate[0], 8), expected_bps=round(estimate[1], 2), mode=self.mode)
+
+        fills: list[Order] = []
+        remaining = qty
+        try:
+            for child in range(self.max_children):
+                if not remaining:
+                    break
+                if child:
+                    await asyncio.sleep(self.interval)
+                book = exchange.book(asset)
+                if book is None:
+                    break
+                if self.mode == "ioc":
+                    offset = 1 + self.budget_bps / 10000 if side == Side.LONG else 1 - self.budget_bps / 10000
+                    fill = await exchange.open_ioc(asset, side, Decimal(str(book.mid() * offset)), remaining)
+                else:
+                    fill = await exchange.open_position(asset, side, price, self._child_size(asset, book, side, price, qty, remaining) * price)
+                if fill:
+                    fills.append(fill)
+                    remaining -= fill.size
+            if remaining > 0:
+                fills.append(await exchange.open_position(asset, side, price, remaining * price))
+        finally:
+            # Whatever filled is the position, even if a later slice failed
+            order = self._merge(asset, side, fills)
+            exchange.set_position(asset, side, order.size, order.price)
+
+        log(f"Sliced {side.value} {order.size} {asset.pair.base_asset} on {exchange.name.value} in {len(fills)} orders @ ${order.price}",
+            exchange=exchange.name, symbol=asset.exchange_symbol, side=side, price=order.price, size=order.size,
+            children=len(fills), expected_bps=round(estimate[1], 2))
+        return order
+
+    def _child_size(self, asset: ExchangeAsset, book, side: Side, price: Decimal, qty: Decimal, remaining: Decimal) -> Decimal:
+        """Quantity of the next market slice: what the book takes within budget, bounded so max_children suffice"""
+        floor = max(book.max_notional(side, self.budget_bps), float(qty * price) / self.max_children,
+                    float(asset.min_notional or 0))
+        size = min(round(Decimal(str(floor)) / price, asset.base_quantity_precision), remaining)
+        # Never leave a tail too small to be accepted as its own order
+        if asset.min_notional and (remaining - size) * price < asset.min_notional:
+            size = remaining
+        return size
+
+    @staticmethod
+    def _merge(asset: ExchangeAsset, side: Side, fills: list[Order]) -> Order:
+        size = sum((fill.size for fill in fills), Decimal(0))
+        price = round(sum(fill.price * fill.size for fill in fills) / size, 8) if size else Decimal(0)
+        fees = [fill.fee for fill in fills]
+        return Order(asset=asset, side=side, price=price, size=size, fee=None if None in fees else sum(fees, Decimal(0)))
@@ -1,45 +1,99 @@
-import asyncio, yaml
-from exchanges.hyperliquid import Hyperliquid
-from exchanges.binance import BinanceFutures
-from strategy.delta_neutral import DeltaNeutralStrategy
+import asyncio, os, yaml
+from exchanges import registry
+from exchanges.metadata import MetadataCache
+from exchanges.slicing import Slicer
+from market_data.recorder import TickRecorder
+from strategy.journal import Journal
+from strategy.ledger import Ledger
+from strategy.portfolio import Portfolio
+from utils import logger, metrics, profiler
 from utils.logger import log
 
 async def main():
+    exchanges = []
+    feeds = []
+    recorder = None
+    metrics_server = None
+    journal = None
+    ledger = None
     try:
         cfg = yaml.safe_load(open("config.yaml"))
+        logger.configure(cfg.get("logging", {}))
         max_runtime = cfg.get("max_runtime_minutes", 30)  # Default to 30 minutes if not specified
 
-        exA = Hyperliquid(cfg["exchanges"]["hyperliquid"])
-        exB = BinanceFutures(cfg["exchanges"]["binance"])
+        # Every venue under `exchanges:`, built-in or registered by a module listed under `plugins:`
+        exchanges = registry.create_all(cfg)
 
-        strategy = DeltaNeutralStrategy(exA, exB, cfg)
+        # Symbol metadata is read from disk at startup and refreshed in the background once stale
+        metadata = cfg.get("metadata", {})
+        if metadata.get("enabled", True):
+            cache = MetadataCache(metadata.get("dir", "metadata"), metadata.get("ttl_hours", 24) * 3600)
+            for ex in exchanges:
+                ex.metadata = cache
+
+        # Optional streaming prices: get_price answers from memory while quotes are fresh
+        market_data = cfg.get("market_data", {})
+        if market_data.get("enabled", False):
+            for ex in exchanges:
+                # L2 books for the execution-cost model when depth_levels is set
+                ex.feed = ex.create_feed(market_data.get("max_price_age_ms", 2000), market_data.get("depth_levels", 0))
+                if ex.feed:
+                    feeds.append(ex.feed)
+
+            # Optionally keep every streamed tick on disk for replay and analysis
+            record = market_data.get("record")
+            if record:
+                recorder = TickRecorder(record.get("dir", "ticks"), record.get("segment_ticks", 1 << 20))
+                for ex in exchanges:
+                    if ex.feed:
+                        ex.feed.cache.add_listener(None, recorder.listener(ex.name.value))
+
+        # Optional depth-aware slicing of opening orders, needs market_data.depth_levels
+        slicing = cfg.get("slicing", {})
+        if slicing.get("enabled", False):
+            slicer = Slicer(slicing)
+            for ex in exchanges:
+                ex.slicer = slicer
+
+        # Optional Prometheus endpoint; spans are recorded either way and summarized at shutdown
+        metrics_cfg = cfg.get("metrics", {})
+        if metrics_cfg.get("enabled", False):
+            metrics_server = metrics.MetricsServer(metrics_cfg.get("host", "127.0.0.1"), metrics_cfg.get("port", 9108))
+            await metrics_server.start()
+
+        # Optional loop-block watchdog and stack profiles of slow cycles, see utils/profiler.py
+        profiler.start(cfg.get("profiling", {}))
+
+        # Journal of order intents and positions; on startup live positions are resumed, not flattened
+        journal_cfg = cfg.get("journal", {})
+        if journal_cfg.get("enabled", True):
+            journal = Journal(journal_cfg.get("dir", "journal"), journal_cfg.get("batch_ms", 50), journal_cfg.get("snapshot_every", 1000))
+
+        # Trade ledger of every fill, appended to across runs and summarized at shutdown
+        ledger_cfg = cfg.get("ledger", {})
+        if ledger_cfg.get("enabled", True):
+            ledger_path = ledger_cfg.get("path", "ledger.npz")
+            fee_bps = ledger_cfg.get("fee_bps", {"Hyperliquid": 4.5, "Binance": 5.0})
+            ledger = Ledger.load(ledger_path, fee_bps) if os.path.exists(ledger_path) else Ledger(fee_bps=fee_bps)
+
+        # One strategy per configured pair, all sharing the exchange connections
+        portfolio = Portfolio(exchanges, cfg, journal, ledger)
         
         try:
-            await strategy.initialize()
+            await asyncio.gather(*(ex.initialize() for ex in exchanges))
+            await portfolio.initialize()
+            await asyncio.gather(*(feed.start() for feed in feeds))
         except Exception as e:
             log(f"[ERROR] Strategy initialization failed: {e}")
             return
 
-        interval = cfg["interval_minutes"] * 60
-
-        log(f"Starting bot - {cfg['base_asset']}-PERP, ${cfg['notional']} size, {cfg['interval_minutes']}min interval")
+        for strategy in portfolio.strategies:
+            log(f"Starting bot - {strategy.pair.base_asset}-PERP, ${strategy.notional} size, {strategy.interval / 60:g}min interval")
 
-        end_time = asyncio.get_event_loop().time() + (max_runtime * 60)
-        while asyncio.get_event_loop().time() < end_time:
-            try:
-                await strategy.cycle()
-                log(f"Waiting {cfg['interval_minutes']} minutes...\n")
-                await asyncio.sleep(interval)
-            except Exception as e:
-                log(f"[ERROR] Cycle failed: {e}")
-                await asyncio.sleep(interval)
+        await portfolio.run(max_runtime * 60)
         
         log(f"{max_runtime} minute limit reached. Stopping bot.")
-        try:
-            await strategy.close_positions()
-        except Exception as e:
-            log(f"[ERROR] Failed to close positions on shutdown: {e}")
-            return
+        await portfolio.close_positions()
     
     except FileNotFoundError:
         log("[ERROR] config.yaml not found. Please create the config file.")
@@ -49,6 +103,24 @@ async def main():
         log(f"[ERROR] Missing required configuration key: {e}")
     except Exception as e:
         log(f"[ERROR] Unexpected error in main: {e}")
+    finally:
+        # Release streams and pooled connections so aiohttp does not warn about unclosed sessions
+        await asyncio.gather(*(feed.stop() for feed in feeds), return_exceptions=True)
+        await asyncio.gather(*(ex.close() for ex in exchanges), return_exceptions=True)
+        if recorder:
+            recorder.close()
+        if journal:
+            await journal.close()
+        if ledger is not None:
+            ledger.save(ledger_path)
+            for line in ledger.summary():
+                log(f"[LEDGER] {line}")
+        profiler.stop()
+        if metrics_server:
+            await metrics_server.stop()
+        for line in metrics.summary():
+            log(f"[METRICS] {line}")
+        logger.shutdown()
 
 if __name__ == "__main__":
     asyncio.run(main())
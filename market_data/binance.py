@@ -0,0 +1,97 @@
+import asyncio
+from decimal import Decimal
+from itertools import count
+from market_data.feed import StreamFeed
+from utils.logger import log
+
+class BinanceBookTickerFeed(StreamFeed):
+    """
+    Best bid/ask for each watched symbol from the Binance Futures <symbol>@bookTicker stream.
+
+    With depth books enabled it also follows <symbol>@depth@100ms diffs, synced to a REST
+    snapshot the way Binance documents it: diffs are buffered while snapshot(symbol, levels)
+    is in flight, the ones older than its lastUpdateId are dropped, and from then on every
+    diff must continue the previous one (pu == last u). A gap marks the book stale and
+    triggers a new snapshot.
+    """
+    name = "Binance"
+
+    def __init__(self, ws_url: str, snapshot=None, resync_delay: float = 1.0, **kwargs):
+        super().__init__(ws_url, **kwargs)
+        self._ids = count(1)
+        self.snapshot = snapshot
+        self.resync_delay = resync_delay
+        self._last_update: dict[str, int] = {}    # Final update ID applied to each synced book
+        self._pending: dict[str, list[dict]] = {}  # Diffs buffered while a snapshot is in flight
+        self._resyncs: set[asyncio.Task] = set()
+
+    def _depth(self) -> bool:
+        return self.books is not None and self.snapshot is not None
+
+    async def _subscribe(self, ws, symbols, initial):
+        if not symbols:
+            return
+        if initial and self._depth():
+            # Diffs missed while disconnected cannot be recovered, every book needs a new snapshot
+            self._last_update.clear()
+            for book in self.books.books.values():
+                book.ts = None
+        params = [f"{symbol.lower()}@bookTicker" for symbol in symbols]
+        if self._depth():
+            params += [f"{symbol.lower()}@depth@100ms" for symbol in symbols]
+        await ws.send_json({"method": "SUBSCRIBE", "params": params, "id": next(self._ids)})
+
+    async def stop(self):
+        for task in list(self._resyncs):
+            task.cancel()
+        await super().stop()
+
+    def _on_message(self, msg):
+        # Subscription acks look like {"result": null, "id": 1}
+        event = msg.get("e")
+        if event == "bookTicker":
+            self.cache.update(msg["s"], bid=Decimal(msg["b"]), ask=Decimal(msg["a"]))
+        elif event == "depthUpdate" and self._depth():
+            self._on_depth(msg)
+
+    def _on_depth(self, msg: dict):
+        symbol = msg["s"]
+        last = self._last_update.get(symbol)
+        if last is not None:
+            if msg["u"] < last:
+                return
+            # pu links consecutive diffs; the first one after a snapshot must straddle its lastUpdateId
+            if msg["pu"] == last or msg["U"] <= last <= msg["u"]:
+                self.books.book(symbol).apply(msg["b"], msg["a"])
+                self._last_update[symbol] = msg["u"]
+                return
+            log(f"[WARN] Binance {symbol} depth stream skipped updates {last}..{msg['pu']}, resyncing")
+            del self._last_update[symbol]
+            self.books.book(symbol).ts = None
+
+        pending = self._pending.get(symbol)
+        if pending is not None:
+            pending.append(msg)
+            return
+        self._pending[symbol] = [msg]
+        task = asyncio.ensure_future(self._resync(symbol))
+        self._resyncs.add(task)
+        task.add_done_callback(self._resyncs.discard)
+
+    async def _resync(self, symbol: str):
+        try:
+            # Buffer some diffs first, and never loop on snapshots that are behind the stream
+            await asyncio.sleep(self.resync_delay)
+            data = await self.snapshot(symbol, self.books.max_levels)
+        except Exception as e:
+            # The next diff starts another attempt
+            self._pending.pop(symbol, None)
+            log(f"[WARN] Binance {symbol} depth snapshot failed: {e}")
+            return
+        last = data["lastUpdateId"]
+        book = self.books.book(symbol)
+        book.snapshot(data["bids"], data["asks"])
+        self._last_update[symbol] = last
+        # Replayed through the same checks; a gap among them starts the next snapshot
+        for msg in self._pending.pop(symbol, []):
+            self._on_depth(msg)
@@ -0,0 +1,169 @@
+import aiohttp, asyncio, json
+from collections import OrderedDict
+from decimal import Decimal
+from models.order import Side
+from utils.logger import log
+
+# Order statuses after which an order can no longer fill
+DONE = ("FILLED", "CANCELED", "EXPIRED", "EXPIRED_IN_MATCH", "REJECTED")
+
+class Fill:
+    """Execution state of one order, accumulated from its ORDER_TRADE_UPDATE events"""
+    __slots__ = ("symbol", "client_id", "status", "filled", "avg_price", "fee", "fee_asset", "realized_pnl")
+
+    def __init__(self, symbol: str, client_id: str):
+        self.symbol = symbol
+        self.client_id = client_id
+        self.status = "NEW"
+        self.filled = Decimal(0)      # Cumulative filled quantity
+        self.avg_price = Decimal(0)
+        self.fee = Decimal(0)         # Sum of the trades' commissions, in fee_asset
+        self.fee_asset: str = None
+        self.realized_pnl = Decimal(0)
+
+    @property
+    def done(self) -> bool:
+        return self.status in DONE
+
+class BinanceUserStream:
+    """
+    The account's order and position updates from the Binance Futures user data stream.
+
+    A listenKey is created over REST before every connect and kept alive with a PUT every
+    keepalive_minutes (Binance expires it after 60 minutes without one). A listenKeyExpired
+    event or a failed keep-alive reconnects with a fresh key. ORDER_TRADE_UPDATE events
+    build a Fill per client order ID, the last max_fills of which are kept; ACCOUNT_UPDATE
+    events keep positions current. positions are seeded from snapshot() on every connect,
+    before any buffered event is applied, and live is True from then until the socket
+    drops, so readers know when the cache can stand in for REST.
+
+    stop() leaves the key to expire rather than deleting it: Binance hands every stream of
+    an account the same key, so deleting it would cut off the others (other shard workers).
+    """
+    def __init__(self, ws_url: str, listen_key, snapshot=None, keepalive_minutes: float = 30, max_fills: int = 1000,
+                 reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0):
+        self.ws_url = ws_url.rstrip("/")
+        self.listen_key = listen_key   # async (method) -> /fapi/v1/listenKey response
+        self.snapshot = snapshot       # async () -> {symbol: (side, size, entry price)} from REST
+        self.keepalive = keepalive_minutes * 60
+        self.max_fills = max_fills
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.fills: OrderedDict[str, Fill] = OrderedDict()
+        self.positions: dict[str, tuple[Side, Decimal, Decimal]] = {}
+        self.live = False
+
+        self._waiters: dict[str, asyncio.Future] = {}
+        self._session: aiohttp.ClientSession = None
+        self._task: asyncio.Task = None
+
+    async def start(self):
+        if self._task:
+            return
+        self._session = aiohttp.ClientSession()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    async def fill(self, client_id: str, timeout: float) -> Fill:
+        """The finished Fill of client_id, waiting up to timeout seconds for its last event; None if it did not come"""
+        fill = self.fills.get(client_id)
+        if fill is not None and fill.done:
+            return fill
+        waiter = self._waiters[client_id] = asyncio.get_running_loop().create_future()
+        try:
+            return await asyncio.wait_for(waiter, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._waiters.pop(client_id, None)
+
+    async def _run(self):
+        delay = self.reconnect_delay
+        while True:
+            keepalive = None
+            try:
+                key = (await self.listen_key("POST"))["listenKey"]
+                async with self._session.ws_connect(f"{self.ws_url}/{key}", heartbeat=30) as ws:
+                    keepalive = asyncio.create_task(self._keep_alive(ws))
+                    if self.snapshot:
+                        self.positions = await self.snapshot()
+                    self.live = True
+                    log("Binance user data stream connected")
+                    delay = self.reconnect_delay
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.TEXT:
+                            event = json.loads(msg.data)
+                            if event.get("e") == "listenKeyExpired":
+                                log("[WARN] Binance listenKey expired")
+                                break
+                            self._on_event(event)
+                        elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                            break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log(f"[ERROR] Binance user data stream error: {e}")
+            finally:
+                self.live = False
+                if keepalive:
+                    keepalive.cancel()
+
+            log(f"Binance user data stream disconnected, reconnecting in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _keep_alive(self, ws: aiohttp.ClientWebSocketResponse):
+        while True:
+            await asyncio.sleep(self.keepalive)
+            try:
+                data = await self.listen_key("PUT")
+            except Exception as e:
+                log(f"[WARN] Binance listenKey keep-alive failed: {e}")
+                continue
+            if isinstance(data, dict) and data.get("code") == -1125:  # This listenKey does not exist
+                log("[WARN] Binance listenKey is gone, reconnecting with a new one")
+                await ws.close()
+                return
+
+    def _on_event(self, event: dict):
+        kind = event.get("e")
+        if kind == "ORDER_TRADE_UPDATE":
+            self._on_order(event["o"])
+        elif kind == "ACCOUNT_UPDATE":
+            for position in event["a"].get("P", []):
+                amount = Decimal(position["pa"])
+                if amount:
+                    self.positions[position["s"]] = (Side.LONG if amount > 0 else Side.SHORT, abs(amount), Decimal(position["ep"]))
+                else:
+                    self.positions.pop(position["s"], None)
+
+    def _on_order(self, o: dict):
+        client_id = o["c"]
+        fill = self.fills.get(client_id)
+        if fill is None:
+            fill = self.fills[client_id] = Fill(o["s"], client_id)
+            if len(self.fills) > self.max_fills:
+                self.fills.popitem(last=False)
+        fill.status = o["X"]
+        fill.filled = Decimal(o["z"])
+        fill.avg_price = Decimal(o["ap"])
+        if o.get("x") == "TRADE":
+            # Commission and realized PnL are per trade
+            fill.fee += Decimal(o.get("n", "0"))
+            fill.fee_asset = o.get("N", fill.fee_asset)
+            fill.realized_pnl += Decimal(o.get("rp", "0"))
+        if fill.done:
+            waiter = self._waiters.get(client_id)
+            if waiter is not None and not waiter.done():
+                waiter.set_result(fill)
@@ -0,0 +1,157 @@
+import asyncio, platform, time
+import numpy as np
+from decimal import Decimal
+from multiprocessing import shared_memory
+from market_data.feed import StreamFeed
+from market_data.quotes import Quote
+
+KEY_BYTES = 32   # "<venue>:<symbol>", utf-8, zero padded
+SLOT_WORDS = 8   # seq, bid, ask, mid, ts + padding: one 64-byte cache line per slot
+# Architectures whose stores (and loads) become visible in program order, see PriceBoard
+ORDERED_STORES = ("x86_64", "amd64", "i386", "i686", "x86")
+
+class PriceBoard:
+    """
+    Latest quote per venue/symbol in a shared memory block that one process writes and any
+    number of processes read, without locks or IPC round trips.
+
+    Layout: a 64-byte header holding the number of slots used and allocated, a table of
+    slot keys, then one 64-byte line per slot: [seq, bid, ask, mid, ts, -, -, -]. Each slot
+    is a seqlock. The writer makes seq odd, writes the fields and makes it even again. A
+    reader copies the fields between two reads of seq and retries if seq was odd or moved,
+    so it never returns a half-written quote.
+
+    The stores are plain numpy writes with no memory barrier, so this is only correct where
+    stores become visible to other cores in program order and loads are not reordered with
+    each other: x86 (total store order). On weakly ordered CPUs such as ARM (Apple silicon,
+    Graviton) a reader could see the new seq before the new fields and return a torn
+    quote, so the board refuses to open there. Python offers no portable fence to fix that.
+
+    Slots are allocated by the writer on first use: the key is written before the count is
+    raised, so readers find a key only once it is complete. Keys never move, so readers
+    cache the slot index. bid/ask are NaN when the venue only publishes a mid, and ts is
+    time.monotonic(), which is system-wide on Linux.
+    """
+    def __init__(self, name: str = None, slots: int = 1024, create: bool = False):
+        if platform.machine().lower() not in ORDERED_STORES:
+            raise Exception(f"The shared-memory price board needs an x86 CPU, this is {platform.machine()}; "
+                            f"run the pairs in one process with main.py instead")
+        size = 64 + slots * KEY_BYTES + slots * SLOT_WORDS * 8
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size if create else 0)
+        self.name = self.shm.name
+        buf = self.shm.buf
+        header = np.ndarray((2,), np.uint64, buf, 0)
+        if create:
+            header[1] = slots
+        # Readers take the size from the header, whatever they were constructed with
+        self.slots = slots = int(header[1])
+        self._count = header[:1]
+        self._keys = buf[64:64 + slots * KEY_BYTES]
+        offset = 64 + slots * KEY_BYTES
+        self._seq = np.ndarray((slots, SLOT_WORDS), np.uint64, buf, offset)[:, 0]
+        self._data = np.ndarray((slots, SLOT_WORDS), np.float64, buf, offset)
+        self._index: dict[str, int] = {}
+
+    def close(self, unlink: bool = False):
+        # Views into the buffer have to go before the mapping can be closed
+        del self._count, self._keys, self._seq, self._data
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+    def slot(self, key: str, allocate: bool = False) -> int:
+        """Slot index of key, allocating it (writer only) when asked, else None if not published yet"""
+        index = self._index.get(key)
+        if index is not None:
+            return index
+        count = int(self._count[0])
+        encoded = key.encode()[:KEY_BYTES].ljust(KEY_BYTES, b"\0")
+        for i in range(count):
+            if self._keys[i * KEY_BYTES:(i + 1) * KEY_BYTES] == encoded:
+                self._index[key] = i
+                return i
+        if not allocate:
+            return None
+        if count >= self.slots:
+            raise Exception(f"Price board is full ({self.slots} slots)")
+        self._keys[count * KEY_BYTES:(count + 1) * KEY_BYTES] = encoded
+        self._count[0] = count + 1
+        self._index[key] = count
+        return count
+
+    def write(self, slot: int, bid: float, ask: float, mid: float, ts: float):
+        # A writer that died mid-write leaves seq odd; start from the even value below it
+        seq = int(self._seq[slot]) & ~1
+        self._seq[slot] = seq + 1
+        self._data[slot, 1:5] = (bid, ask, mid, ts)
+        self._seq[slot] = seq + 2
+
+    def version(self, slot: int) -> int:
+        """Write count of slot; changes on every write"""
+        return int(self._seq[slot])
+
+    def read(self, slot: int, retries: int = 100) -> tuple[float, float, float, float]:
+        """(bid, ask, mid, ts) of slot, or None if it was never written or kept changing under the reader"""
+        for _ in range(retries):
+            before = int(self._seq[slot])
+            if before & 1:
+                continue
+            if not before:
+                return None
+            values = self._data[slot, 1:5].tolist()
+            if int(self._seq[slot]) == before:
+                return values
+        return None
+
+class BoardFeed(StreamFeed):
+    """
+    Quotes for one venue read from a PriceBoard that a market-data process publishes into,
+    in place of the venue's own WebSocket. quote() reads the board directly; a poller
+    checks the watched slots every poll_ms and pushes changed quotes into the QuoteCache,
+    so listeners (event-driven mode) fire as they would on a stream.
+    """
+    def __init__(self, board: PriceBoard, venue: str, max_age_ms: int = 2000, poll_ms: float = 5):
+        super().__init__("", max_age_ms=max_age_ms)
+        self.name = venue
+        self.board = board
+        self.poll = poll_ms / 1000
+        self._seen: dict[str, int] = {}
+
+    def quote(self, symbol: str) -> Quote:
+        slot = self.board.slot(f"{self.name}:{symbol}")
+        values = self.board.read(slot) if slot is not None else None
+        if values is None or time.monotonic() - values[3] > self.max_age:
+            return None
+        return self._quote(values)
+
+    @staticmethod
+    def _quote(values) -> Quote:
+        bid, ask, mid, ts = values
+        return Quote(None if bid != bid else Decimal(repr(bid)), None if ask != ask else Decimal(repr(ask)),
+                     Decimal(repr(mid)), ts)
+
+    async def subscribe(self, symbol: str):
+        self.symbols.add(symbol)
+
+    async def start(self):
+        if not self._task:
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while True:
+            for symbol in self.symbols:
+                slot = self.board.slot(f"{self.name}:{symbol}")
+                if slot is None or self.board.version(slot) == self._seen.get(symbol):
+                    continue
+                self._seen[symbol] = self.board.version(slot)
+                values = self.board.read(slot)
+                if values is not None and symbol in self.cache.listeners:
+                    quote = self._quote(values)
+                    self.cache.update(symbol, bid=quote.bid, ask=quote.ask, mid=quote.mid)
+            await asyncio.sleep(self.poll)
+
+    async def _subscribe(self, ws, symbols, initial):
+        pass
+
+    def _on_message(self, msg):
+        pass
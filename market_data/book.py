@@ -0,0 +1,129 @@
+import time
+from bisect import bisect_left
+from models.order import Side
+
+class OrderBook:
+    """
+    L2 book for one symbol. Each side is a pair of parallel sorted arrays (price key, size)
+    ordered so that index 0 is the best level: asks by price, bids by negated price, so
+    both sides share one code path. A diff is applied level by level with a binary search
+    and an in-place insert or delete, so its cost depends on the few levels it touches,
+    not on the depth of the book.
+
+    The arrays are plain lists: diffs carry a handful of levels and queries stop at the
+    levels an order reaches, where NumPy's per-call overhead costs more than it saves.
+
+    Size 0 in a diff removes the level. At most max_levels are kept per side, dropping the
+    ones furthest from the touch, which no order we would send reaches.
+    """
+    __slots__ = ("max_levels", "keys", "sizes", "ts")
+
+    def __init__(self, max_levels: int = 200):
+        self.max_levels = max_levels
+        self.keys: list[list[float]] = [[], []]    # [bids, asks]
+        self.sizes: list[list[float]] = [[], []]
+        self.ts: float = None                     # time.monotonic() of the last update
+
+    def snapshot(self, bids, asks):
+        """Replace both sides with full [[price, size], ...] level lists (strings or numbers)"""
+        for i, (levels, sign) in enumerate(((bids, -1.0), (asks, 1.0))):
+            parsed = sorted((float(price) * sign, float(size)) for price, size in levels)
+            parsed = [level for level in parsed if level[1] > 0][:self.max_levels]
+            self.keys[i] = [key for key, _ in parsed]
+            self.sizes[i] = [size for _, size in parsed]
+        self.ts = time.monotonic()
+
+    def apply(self, bids, asks):
+        """Apply [[price, size], ...] level changes; size 0 deletes a level"""
+        for i, (levels, sign) in enumerate(((bids, -1.0), (asks, 1.0))):
+            keys, sizes = self.keys[i], self.sizes[i]
+            for price, size in levels:
+                key, size = float(price) * sign, float(size)
+                j = bisect_left(keys, key)
+                if j < len(keys) and keys[j] == key:
+                    if size > 0:
+                        sizes[j] = size
+                    else:
+                        del keys[j], sizes[j]
+                elif size > 0 and j < self.max_levels:
+                    keys.insert(j, key)
+                    sizes.insert(j, size)
+                    if len(keys) > self.max_levels:
+                        keys.pop()
+                        sizes.pop()
+        self.ts = time.monotonic()
+
+    def best(self, side: Side) -> float:
+        """Best price a taker on side trades against (the ask for LONG), or None if that side is empty"""
+        keys = self.keys[1 if side == Side.LONG else 0]
+        return abs(keys[0]) if keys else None
+
+    def mid(self) -> float:
+        bid, ask = self.best(Side.SHORT), self.best(Side.LONG)
+        return (bid + ask) / 2 if bid and ask else None
+
+    def vwap(self, side: Side, notional: float) -> tuple[float, float]:
+        """(average price, notional filled) of a market order for notional; filled < notional when the book is too thin"""
+        i = 1 if side == Side.LONG else 0
+        cost = size = 0.0
+        for key, level in zip(self.keys[i], self.sizes[i]):
+            price = abs(key)
+            if cost + price * level >= notional:
+                size += (notional - cost) / price
+                return notional / size, notional
+            cost += price * level
+            size += level
+        return (cost / size if size else None), cost
+
+    def impact_bps(self, side: Side, notional: float) -> float:
+        """Expected slippage of a market order for notional against the mid, in bps (inf if the book is too thin)"""
+        mid = self.mid()
+        vwap, filled = self.vwap(side, notional)
+        if mid is None or filled < notional:
+            return float("inf")
+        return (vwap - mid) / mid * 10000 if side == Side.LONG else (mid - vwap) / mid * 10000
+
+    def max_notional(self, side: Side, budget_bps: float) -> float:
+        """Largest market order notional whose expected slippage against the mid stays within budget_bps"""
+        mid = self.mid()
+        if mid is None:
+            return 0.0
+        i = 1 if side == Side.LONG else 0
+        sign = 1 if side == Side.LONG else -1
+        target = mid * (1 + sign * budget_bps / 10000)
+        cost = size = 0.0
+        for key, level in zip(self.keys[i], self.sizes[i]):
+            price = abs(key)
+            if sign * (price - target) > 0:
+                # Past the target price the VWAP reaches it inside this level, where
+                # n / (size + (n - cost) / price) = target
+                if not size:
+                    return 0.0
+                n = target * (size - cost / price) / (1 - target / price)
+                if n <= cost + price * level:
+                    return n
+            cost += price * level
+            size += level
+        return cost
+
+class BookCache:
+    """Order book per symbol, written by stream feeds and read by the execution-cost model"""
+    def __init__(self, max_levels: int = 200):
+        self.max_levels = max_levels
+        self.books: dict[str, OrderBook] = {}
+
+    def book(self, symbol: str) -> OrderBook:
+        """The book for symbol, created empty on first use"""
+        book = self.books.get(symbol)
+        if book is None:
+            book = self.books[symbol] = OrderBook(self.max_levels)
+        return book
+
+    def get(self, symbol: str, max_age: float) -> OrderBook:
+        """Book for symbol, or None if missing, empty or not updated within max_age seconds"""
+        book = self.books.get(symbol)
+        if book is None or book.ts is None or time.monotonic() - book.ts > max_age:
+            return None
+        if not book.keys[0] or not book.keys[1]:
+            return None
+        return book
@@ -0,0 +1,87 @@
+import aiohttp, asyncio, json
+from abc import ABC, abstractmethod
+from market_data.book import BookCache
+from market_data.quotes import Quote, QuoteCache
+from utils.logger import log
+
+class StreamFeed(ABC):
+    """
+    Long-lived WebSocket market-data subscription that keeps a QuoteCache up to date.
+    Reconnects with exponential backoff and re-subscribes every watched symbol.
+    With depth_levels set it also keeps an L2 OrderBook per symbol in books.
+    """
+    name: str
+
+    def __init__(self, ws_url: str, max_age_ms: int = 2000, reconnect_delay: float = 1.0, max_reconnect_delay: float = 30.0,
+                 depth_levels: int = 0):
+        self.ws_url = ws_url
+        self.max_age = max_age_ms / 1000
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.cache = QuoteCache()
+        self.books = BookCache(depth_levels) if depth_levels else None
+        self.symbols: set[str] = set()
+
+        self._session: aiohttp.ClientSession = None
+        self._ws: aiohttp.ClientWebSocketResponse = None
+        self._task: asyncio.Task = None
+
+    def quote(self, symbol: str) -> Quote:
+        """Fresh quote from memory, or None if the stream has nothing recent for symbol"""
+        return self.cache.get(symbol, self.max_age)
+
+    async def subscribe(self, symbol: str):
+        if symbol in self.symbols:
+            return
+        self.symbols.add(symbol)
+        if self._ws is not None and not self._ws.closed:
+            await self._subscribe(self._ws, [symbol], initial=False)
+
+    async def start(self):
+        if self._task:
+            return
+        self._session = aiohttp.ClientSession()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    async def _run(self):
+        delay = self.reconnect_delay
+        while True:
+            try:
+                async with self._session.ws_connect(self.ws_url, heartbeat=30) as ws:
+                    self._ws = ws
+                    log(f"{self.name} market data stream connected")
+                    await self._subscribe(ws, sorted(self.symbols), initial=True)
+                    delay = self.reconnect_delay
+                    async for msg in ws:
+                        if msg.type == aiohttp.WSMsgType.TEXT:
+                            self._on_message(json.loads(msg.data))
+                        elif msg.type in (aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                            break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log(f"[ERROR] {self.name} market data stream error: {e}")
+            finally:
+                self._ws = None
+
+            log(f"{self.name} market data stream disconnected, reconnecting in {delay:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    @abstractmethod
+    async def _subscribe(self, ws: aiohttp.ClientWebSocketResponse, symbols: list[str], initial: bool): ...
+
+    @abstractmethod
+    def _on_message(self, msg: dict): ...
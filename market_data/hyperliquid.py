@@ -0,0 +1,38 @@
+from decimal import Decimal
+from market_data.feed import StreamFeed
+
+class HyperliquidFeed(StreamFeed):
+    """
+    Mid prices from the Hyperliquid allMids channel plus top of book from l2Book
+    for each watched coin. An allMids update replaces only the mid and keeps the l2Book
+    bid/ask, unless the new mid falls outside them. Every l2Book message is a full
+    snapshot of the top levels, so the depth book is simply replaced.
+    """
+    name = "Hyperliquid"
+
+    async def _subscribe(self, ws, symbols, initial):
+        if initial:
+            await ws.send_json({"method": "subscribe", "subscription": {"type": "allMids"}})
+        for coin in symbols:
+            await ws.send_json({"method": "subscribe", "subscription": {"type": "l2Book", "coin": coin}})
+
+    def _on_message(self, msg):
+        channel = msg.get("channel")
+        if channel == "allMids":
+            mids = msg["data"]["mids"]
+            for coin in self.symbols:
+                if coin in mids:
+                    mid = Decimal(mids[coin])
+                    quote = self.cache.quotes.get(coin)
+                    if quote and quote.bid is not None and quote.bid <= mid <= quote.ask:
+                        self.cache.update(coin, bid=quote.bid, ask=quote.ask, mid=mid)
+                    else:
+                        self.cache.update(coin, mid=mid)
+        elif channel == "l2Book":
+            data = msg["data"]
+            bids, asks = data["levels"]
+            if bids and asks:
+                self.cache.update(data["coin"], bid=Decimal(bids[0]["px"]), ask=Decimal(asks[0]["px"]))
+            if self.books is not None:
+                self.books.book(data["coin"]).snapshot([(level["px"], level["sz"]) for level in bids],
+                                                       [(level["px"], level["sz"]) for level in asks])
@@ -0,0 +1,50 @@
+import time
+from decimal import Decimal
+
+class Quote:
+    """Top of book for one symbol. bid/ask are None when the venue only streams a mid."""
+    bid: Decimal
+    ask: Decimal
+    mid: Decimal
+    ts: float   # time.monotonic() when the update was received
+
+    __slots__ = ("bid", "ask", "mid", "ts")
+
+    def __init__(self, bid: Decimal, ask: Decimal, mid: Decimal, ts: float):
+        self.bid = bid
+        self.ask = ask
+        self.mid = mid
+        self.ts = ts
+
+    def age(self) -> float:
+        return time.monotonic() - self.ts
+
+class QuoteCache:
+    """In-memory latest quote per symbol, written by stream feeds and read by get_price"""
+    def __init__(self):
+        self.quotes: dict[str, Quote] = {}
+        self.listeners: dict[str, list] = {}
+
+    def add_listener(self, symbol: str, callback):
+        """
+        Call callback(symbol, quote) after every update for symbol, or for every
+        symbol if symbol is None. Callbacks must not block.
+        """
+        self.listeners.setdefault(symbol, []).append(callback)
+
+    def update(self, symbol: str, bid: Decimal = None, ask: Decimal = None, mid: Decimal = None):
+        if mid is None:
+            mid = (bid + ask) / 2
+        quote = Quote(bid, ask, mid, time.monotonic())
+        self.quotes[symbol] = quote
+        for callback in self.listeners.get(symbol, ()):
+            callback(symbol, quote)
+        for callback in self.listeners.get(None, ()):
+            callback(symbol, quote)
+
+    def get(self, symbol: str, max_age: float) -> Quote:
+        """Latest quote for symbol, or None if missing or older than max_age seconds"""
+        quote = self.quotes.get(symbol)
+        if quote is None or time.monotonic() - quote.ts > max_age:
+            return None
+        return quote
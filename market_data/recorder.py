@@ -0,0 +1,172 @@
+import os, time
+import numpy as np
+from decimal import Decimal
+from market_data.quotes import Quote
+
+'''
+On-disk tick store: one directory per venue/symbol, split into fixed-capacity
+memory-mapped segment files named after their first timestamp.
+
+Segment layout (little endian):
+    header   64 bytes: magic, capacity, count, price scale (int64 each), padding
+    ts       int64[capacity]   epoch nanoseconds
+    bid      int64[capacity]   price * scale
+    ask      int64[capacity]   price * scale
+
+Columns are contiguous, so a time range of one column is a zero-copy slice.
+Unused capacity is never written and stays sparse on most filesystems.
+'''
+
+MAGIC = int.from_bytes(b"DNTICK01", "little")
+HEADER_BYTES = 64
+DEFAULT_SCALE = 10 ** 8
+COLUMNS = ("ts", "bid", "ask")
+
+class Segment:
+    """One memory-mapped segment file"""
+    def __init__(self, path: str, capacity: int = None, scale: int = DEFAULT_SCALE, writable: bool = False):
+        self.path = path
+        if capacity is not None:
+            size = HEADER_BYTES + 8 * len(COLUMNS) * capacity
+            with open(path, "wb") as f:
+                f.truncate(size)
+            self.mm = np.memmap(path, dtype="<i8", mode="r+")
+            self.mm[:4] = (MAGIC, capacity, 0, scale)
+        else:
+            self.mm = np.memmap(path, dtype="<i8", mode="r+" if writable else "r")
+            if self.mm[0] != MAGIC:
+                raise Exception(f"Not a tick segment: {path}")
+        self.header = self.mm[:HEADER_BYTES // 8]
+        self.capacity = int(self.header[1])
+        self.scale = int(self.header[3])
+        body = self.mm[HEADER_BYTES // 8:]
+        self.columns = {name: body[i * self.capacity:(i + 1) * self.capacity] for i, name in enumerate(COLUMNS)}
+
+    @property
+    def count(self) -> int:
+        return int(self.header[2])
+
+    def append(self, ts: int, bid: int, ask: int):
+        n = self.count
+        self.columns["ts"][n] = ts
+        self.columns["bid"][n] = bid
+        self.columns["ask"][n] = ask
+        self.header[2] = n + 1  # Publish the row only after it is fully written
+
+    def flush(self):
+        self.mm.flush()
+
+class TickRecorder:
+    """
+    Appends quotes for every watched symbol to per-venue/symbol segment files.
+    Attach it to a feed with `feed.cache.add_listener(None, recorder.listener(venue))`.
+    Ticks whose bid and ask did not change are skipped.
+    """
+    def __init__(self, root: str, segment_ticks: int = 1 << 20, scale: int = DEFAULT_SCALE):
+        self.root = root
+        self.segment_ticks = segment_ticks
+        self.scale = scale
+        self.segments: dict[tuple[str, str], Segment] = {}
+        self.last: dict[tuple[str, str], tuple[int, int]] = {}
+
+    def listener(self, venue: str):
+        def on_quote(symbol: str, quote: Quote):
+            self.record(venue, symbol, quote)
+        return on_quote
+
+    def record(self, venue: str, symbol: str, quote: Quote, ts_ns: int = None):
+        bid = quote.bid if quote.bid is not None else quote.mid
+        ask = quote.ask if quote.ask is not None else quote.mid
+        row = (self._scaled(bid), self._scaled(ask))
+        key = (venue, symbol)
+        if self.last.get(key) == row:
+            return
+        self.last[key] = row
+        self.append(venue, symbol, ts_ns if ts_ns is not None else time.time_ns(), *row)
+
+    def append(self, venue: str, symbol: str, ts_ns: int, bid: int, ask: int):
+        """Append one already-scaled tick, rolling over to a new segment when full"""
+        key = (venue, symbol)
+        segment = self.segments.get(key)
+        if segment is None or segment.count >= segment.capacity:
+            if segment is not None:
+                segment.flush()
+            segment = self._open_segment(venue, symbol, ts_ns)
+            self.segments[key] = segment
+        segment.append(ts_ns, bid, ask)
+
+    def flush(self):
+        for segment in self.segments.values():
+            segment.flush()
+
+    def close(self):
+        self.flush()
+        self.segments.clear()
+
+    def _scaled(self, price: Decimal) -> int:
+        return int(price * self.scale)
+
+    def _open_segment(self, venue: str, symbol: str, ts_ns: int) -> Segment:
+        directory = os.path.join(self.root, venue, symbol)
+        os.makedirs(directory, exist_ok=True)
+        # Resume the newest segment after a restart if it still has room
+        existing = sorted(name for name in os.listdir(directory) if name.endswith(".ticks"))
+        if existing and (venue, symbol) not in self.segments:
+            segment = Segment(os.path.join(directory, existing[-1]), writable=True)
+            if segment.count < segment.capacity and segment.scale == self.scale:
+                return segment
+        return Segment(os.path.join(directory, f"{ts_ns:020d}.ticks"), capacity=self.segment_ticks, scale=self.scale)
+
+class TickReader:
+    """Read-only access to a TickRecorder directory"""
+    def __init__(self, root: str):
+        self.root = root
+
+    def symbols(self) -> list[tuple[str, str]]:
+        """(venue, symbol) pairs that have recorded data"""
+        result = []
+        for venue in sorted(os.listdir(self.root)):
+            for symbol in sorted(os.listdir(os.path.join(self.root, venue))):
+                result.append((venue, symbol))
+        return result
+
+    def read(self, venue: str, symbol: str, start_ns: int = None, end_ns: int = None) -> dict[str, np.ndarray]:
+        """
+        Columns ts/bid/ask for ticks with start_ns <= ts < end_ns, plus the price "scale".
+        Ranges inside one segment are zero-copy views of the memory map; ranges that
+        span segments are concatenated.
+        """
+        directory = os.path.join(self.root, venue, symbol)
+        names = sorted(name for name in os.listdir(directory) if name.endswith(".ticks"))
+        starts = [int(name.split(".")[0]) for name in names]
+
+        parts = []
+        scale = DEFAULT_SCALE
+        for i, name in enumerate(names):
+            # Segment i holds ticks from starts[i] up to the next segment's first tick
+            if end_ns is not None and starts[i] >= end_ns:
+                break
+            if start_ns is not None and i + 1 < len(starts) and starts[i + 1] <= start_ns:
+                continue
+            segment = Segment(os.path.join(directory, name))
+            scale = segment.scale
+            n = segment.count
+            ts = segment.columns["ts"][:n]
+            lo = 0 if start_ns is None else int(np.searchsorted(ts, start_ns, side="left"))
+            hi = n if end_ns is None else int(np.searchsorted(ts, end_ns, side="left"))
+            if hi > lo:
+                parts.append({name: column[lo:hi] for name, column in segment.columns.items()})
+
+        if len(parts) == 1:
+            result = parts[0]
+        elif parts:
+            result = {name: np.concatenate([part[name] for part in parts]) for name in COLUMNS}
+        else:
+            result = {name: np.empty(0, dtype="<i8") for name in COLUMNS}
+        result["scale"] = scale
+        return result
+
+    def mids(self, venue: str, symbol: str, start_ns: int = None, end_ns: int = None) -> tuple[np.ndarray, np.ndarray]:
+        """(ts in seconds, mid price as float64) for a range"""
+        data = self.read(venue, symbol, start_ns, end_ns)
+        return data["ts"] / 1e9, (data["bid"] + data["ask"]) / (2 * data["scale"])
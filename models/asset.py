@@ -1,9 +1,26 @@
+from decimal import Decimal
 from enum import Enum
 
 class ExchangeName(Enum):
     HYPERLIQUID = "Hyperliquid"
     BINANCE = "Binance"
 
+    @classmethod
+    def add(cls, value: str) -> "ExchangeName":
+        """
+        Name for a plugin venue, created on first use. ExchangeName(value) finds it afterwards;
+        list(ExchangeName) still only holds the built-in venues.
+        """
+        try:
+            return cls(value)
+        except ValueError:
+            pass
+        member = object.__new__(cls)
+        member._value_ = value
+        member._name_ = value.upper()
+        cls._value2member_map_[value] = member
+        return member
+
 class TradingPair:
     base_asset: str
     quote_asset: str
@@ -23,9 +40,14 @@ class ExchangeAsset:
     exchange: ExchangeName
     exchange_symbol: str
     base_quantity_precision: int
+    tick_size: Decimal      # Price increment, None if unknown
+    min_notional: Decimal   # Smallest order value in quote currency, None if unknown
 
-    def __init__(self, pair: TradingPair, exchange: ExchangeName, exchange_symbol: str, base_quantity_precision: int):
+    def __init__(self, pair: TradingPair, exchange: ExchangeName, exchange_symbol: str, base_quantity_precision: int,
+                 tick_size: Decimal = None, min_notional: Decimal = None):
         self.pair = pair
         self.exchange = exchange
         self.exchange_symbol = exchange_symbol
-        self.base_quantity_precision = base_quantity_precision
\ No newline at end of file
+        self.base_quantity_precision = base_quantity_precision
+        self.tick_size = tick_size
+        self.min_notional = min_notional
@@ -1,3 +1,4 @@
+import time
 from enum import Enum
 from decimal import Decimal
 
@@ -12,9 +13,38 @@ class Order:
     side: Side
     price: Decimal
     size: Decimal
+    fee: Decimal   # Fee in the quote asset as reported by the venue, None if it was not
 
-    def __init__(self, asset: ExchangeAsset, side: Side, price: Decimal, size: Decimal):
+    def __init__(self, asset: ExchangeAsset, side: Side, price: Decimal, size: Decimal, fee: Decimal = None):
         self.asset = asset
         self.side = side
         self.price = price
-        self.size = size
\ No newline at end of file
+        self.size = size
+        self.fee = fee
+
+    def to_dict(self) -> dict:
+        return {"exchange": self.asset.exchange.value, "symbol": self.asset.exchange_symbol,
+                "side": self.side.value, "price": str(self.price), "size": str(self.size)}
+
+class PreparedOrder:
+    """
+    A market order that is already sized, rate-limited and signed. send() submits it
+    and returns the filled Order; sent_at is the perf_counter() time it went out.
+    """
+    asset: ExchangeAsset
+    side: Side
+    price: Decimal
+    size: Decimal
+    expires_at: float   # time.time() after which the venue would reject the signature
+    sent_at: float = None
+
+    def __init__(self, asset: ExchangeAsset, side: Side, price: Decimal, size: Decimal, expires_at: float, send=None):
+        self.asset = asset
+        self.side = side
+        self.price = price
+        self.size = size
+        self.expires_at = expires_at
+        self.send = send
+
+    def expired(self, margin: float = 0.0) -> bool:
+        return time.time() + margin >= self.expires_at
@@ -0,0 +1,457 @@
+import asyncio, itertools, math, random, sys, time, yaml
+from collections import Counter
+from decimal import Decimal
+from aiohttp import web
+from utils import logger
+from utils.logger import log
+
+'''
+Local stand-in for the venues: one aiohttp server that speaks the Binance USD-M futures
+REST endpoints and the Hyperliquid /info and /exchange API the adapters use, so the real
+BinanceFutures and Hyperliquid classes can be pointed at it with base_url.
+
+    python -m simulator.server [port]
+
+reads the `simulator:` section of config.yaml (see config.yaml.example). Every venue has
+a latency (split evenly before and after the order is matched), an exponentially
+distributed jitter on top and an error rate. A failed order request is matched anyway in
+placed_on_error of the cases, which is what the adapters' lookup-before-retry handles.
+
+Prices follow a geometric random walk per coin shared by the venues, plus a mean-reverting
+basis per venue, so the cross-venue spread the strategy trades on moves like a real one.
+Orders fill in full at the mid plus or minus half_spread_bps. Binance fills are also pushed
+as ORDER_TRADE_UPDATE and ACCOUNT_UPDATE events, with a taker_fee_bps commission, to the
+user data stream at /ws/<listenKey>. Signatures are not checked and each venue holds a
+single account.
+'''
+
+BINANCE_ERROR = {"code": -1001, "msg": "Internal error; unable to process your request. Please try again."}
+
+class PriceModel:
+    """
+    Mid price per venue and coin, advanced lazily by the wall time since the last query:
+    a geometric random walk per coin (volatility_bps per square root of a second) times
+    1 + an Ornstein-Uhlenbeck basis per venue (stationary stddev basis_bps, decaying
+    with basis_half_life_s).
+    """
+    def __init__(self, cfg, rng: random.Random):
+        self.rng = rng
+        self.mids = {coin: float(price) for coin, price in cfg.get("prices", {"BTC": 90000, "ETH": 3000}).items()}
+        self.volatility = cfg.get("volatility_bps", 2) / 1e4
+        self.basis_sd = cfg.get("basis_bps", 3) / 1e4
+        self.decay = math.log(2) / cfg.get("basis_half_life_s", 30)
+        self.basis: dict[tuple[str, str], float] = {}
+        self.updated = time.monotonic()
+
+    def _advance(self):
+        now = time.monotonic()
+        elapsed = now - self.updated
+        if elapsed <= 0:
+            return
+        self.updated = now
+        step = self.volatility * math.sqrt(elapsed)
+        for coin in self.mids:
+            self.mids[coin] *= math.exp(step * self.rng.gauss(0, 1))
+        keep = math.exp(-self.decay * elapsed)
+        noise = self.basis_sd * math.sqrt(1 - keep * keep)
+        for key, basis in self.basis.items():
+            self.basis[key] = basis * keep + noise * self.rng.gauss(0, 1)
+
+    def mid(self, venue: str, coin: str) -> float:
+        self._advance()
+        key = (venue, coin)
+        if key not in self.basis:
+            self.basis[key] = self.basis_sd * self.rng.gauss(0, 1)
+        return self.mids[coin] * (1 + self.basis[key])
+
+class Venue:
+    """Latency, error profile and account (positions and orders by client ID) of one simulated venue"""
+    def __init__(self, name: str, cfg, rng: random.Random):
+        self.name = name
+        self.rng = rng
+        self.latency = cfg.get("latency_ms", 20) / 1000
+        self.jitter = cfg.get("jitter_ms", 5) / 1000
+        self.error_rate = cfg.get("error_rate", 0.0)
+        self.placed_on_error = cfg.get("placed_on_error", 0.5)
+        self.positions: dict[str, tuple[Decimal, Decimal]] = {}  # symbol -> (signed size, entry price)
+        self.orders: dict[str, dict] = {}                          # client order ID -> order as the venue reports it
+
+    async def delay(self):
+        """Sleep one half of a round trip"""
+        extra = self.rng.expovariate(1 / self.jitter) if self.jitter else 0.0
+        await asyncio.sleep((self.latency + extra) / 2)
+
+    def fails(self) -> bool:
+        return self.rng.random() < self.error_rate
+
+    def fill(self, symbol: str, size: Decimal, price: Decimal):
+        """Apply a signed fill to the position, averaging the entry price while it grows"""
+        held, entry = self.positions.get(symbol, (Decimal(0), Decimal(0)))
+        total = held + size
+        if not total:
+            self.positions.pop(symbol, None)
+            return
+        if held and (held > 0) != (total > 0):
+            entry = price                    # Flipped through zero
+        elif not held or (held > 0) == (size > 0):
+            entry = (held * entry + size * price) / total
+        self.positions[symbol] = (total, entry)
+
+class Simulator:
+    """
+    The simulated venues behind one aiohttp app. requests counts every request by venue and
+    endpoint (Hyperliquid /info by request type), see GET /_sim/stats.
+    """
+    def __init__(self, cfg):
+        self.cfg = cfg
+        self.rng = random.Random(cfg.get("seed", 1))
+        self.prices = PriceModel(cfg, self.rng)
+        self.half_spread = cfg.get("half_spread_bps", 0.5) / 1e4
+        self.taker_fee = Decimal(str(cfg.get("taker_fee_bps", 4.5))) / 10000  # Reported in Binance fill events
+        self.depth_usd = cfg.get("depth_per_level_usd", 50000)
+        overrides = cfg.get("venues", {})
+        self.venues = {name: Venue(name, {**cfg, **overrides.get(name, {})}, self.rng) for name in ("binance", "hyperliquid")}
+        self.coins = list(self.prices.mids)
+        # Listings sized roughly like the real ones: coarser quantities and finer ticks for cheaper coins
+        self.magnitude = {coin: int(math.log10(price)) for coin, price in self.prices.mids.items()}
+        self.requests = Counter()
+        self.errors = Counter()
+        self._ids = itertools.count(1)
+        self.listen_key = f"sim{self.rng.getrandbits(64):016x}"
+        self.user_streams: set[web.WebSocketResponse] = set()
+        self._pushes: set[asyncio.Task] = set()
+        self.runner: web.AppRunner = None
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self._latency])
+        app.router.add_get("/fapi/v1/exchangeInfo", self.binance_exchange_info)
+        app.router.add_get("/fapi/v2/ticker/price", self.binance_ticker)
+        app.router.add_get("/fapi/v1/depth", self.binance_depth)
+        app.router.add_post("/fapi/v1/order", self.binance_new_order)
+        app.router.add_get("/fapi/v1/order", self.binance_query_order)
+        app.router.add_get("/fapi/v2/positionRisk", self.binance_positions)
+        app.router.add_route("*", "/fapi/v1/listenKey", self.binance_listen_key)
+        app.router.add_get("/ws/{listen_key}", self.binance_user_stream)
+        app.router.add_post("/info", self.hyperliquid_info)
+        app.router.add_post("/exchange", self.hyperliquid_exchange)
+        app.router.add_get("/_sim/stats", self.stats)
+        return app
+
+    @web.middleware
+    async def _latency(self, request, handler):
+        """Half the round trip before the handler runs (and matches orders), half after"""
+        venue = self.venues["binance"] if request.path.startswith("/fapi") else \
+            self.venues["hyperliquid"] if request.path in ("/info", "/exchange") else None
+        if venue is None:
+            return await handler(request)
+        await venue.delay()
+        response = await handler(request)
+        await venue.delay()
+        return response
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Serve until stop(); returns the base URL for both adapters"""
+        self.runner = web.AppRunner(self.app(), access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, host, port)
+        await site.start()
+        return f"http://{host}:{site._server.sockets[0].getsockname()[1]}"
+
+    async def stop(self):
+        for ws in list(self.user_streams):
+            await ws.close()
+        if self.runner:
+            await self.runner.cleanup()
+            self.runner = None
+
+    async def stats(self, request):
+        return web.json_response({
+            "requests": dict(self.requests),
+            "errors": dict(self.errors),
+            "positions": {name: {symbol: [str(size), str(entry)] for symbol, (size, entry) in venue.positions.items()}
+                          for name, venue in self.venues.items()},
+        })
+
+    def _hyperliquid_decimals(self, coin: str) -> int:
+        return max(0, min(5, self.magnitude[coin]))
+
+    def _binance_decimals(self, coin: str) -> int:
+        return max(0, self._hyperliquid_decimals(coin) - 1)
+
+    def _binance_tick(self, coin: str) -> Decimal:
+        return Decimal(1).scaleb(min(0, self.magnitude[coin] - 5))
+
+    def _fill_price(self, venue: str, coin: str, is_buy: bool) -> float:
+        mid = self.prices.mid(venue, coin)
+        return mid * (1 + self.half_spread) if is_buy else mid * (1 - self.half_spread)
+
+    # Binance
+
+    async def _binance(self, request, endpoint: str) -> tuple[dict, bool]:
+        """
+        Count the request; returns the query and form parameters merged and whether the
+        request failed
+        """
+        venue = self.venues["binance"]
+        self.requests[f"binance {endpoint}"] += 1
+        params = dict(request.query)
+        if request.method == "POST" and request.can_read_body:
+            params.update(await request.post())
+        failed = venue.fails()
+        if failed:
+            self.errors[f"binance {endpoint}"] += 1
+        return params, failed
+
+    def _binance_coin(self, symbol: str) -> str:
+        coin = symbol.removesuffix("USDT")
+        return coin if coin in self.prices.mids else None
+
+    async def binance_exchange_info(self, request):
+        if (await self._binance(request, "GET /fapi/v1/exchangeInfo"))[1]:
+            return web.json_response(BINANCE_ERROR, status=503)
+        symbols = [{
+            "symbol": f"{coin}USDT", "status": "TRADING", "baseAsset": coin, "quoteAsset": "USDT",
+            "quantityPrecision": self._binance_decimals(coin),
+            "filters": [{"filterType": "PRICE_FILTER", "tickSize": format(self._binance_tick(coin), "f")},
+                        {"filterType": "MIN_NOTIONAL", "notional": "5"}],
+        } for coin in self.coins]
+        return web.json_response({"timezone": "UTC", "serverTime": int(time.time() * 1000), "symbols": symbols})
+
+    def _ticker(self, coin: str) -> dict:
+        price = Decimal(repr(self.prices.mid("binance", coin))).quantize(self._binance_tick(coin))
+        return {"symbol": f"{coin}USDT", "price": format(price, "f"), "time": int(time.time() * 1000)}
+
+    async def binance_ticker(self, request):
+        params, failed = await self._binance(request, "GET /fapi/v2/ticker/price")
+        if failed:
+            return web.json_response(BINANCE_ERROR, status=503)
+        if "symbol" not in params:
+            return web.json_response([self._ticker(coin) for coin in self.coins])
+        coin = self._binance_coin(params["symbol"])
+        if coin is None:
+            return web.json_response({"code": -1121, "msg": "Invalid symbol."}, status=400)
+        return web.json_response(self._ticker(coin))
+
+    async def binance_depth(self, request):
+        params, failed = await self._binance(request, "GET /fapi/v1/depth")
+        if failed:
+            return web.json_response(BINANCE_ERROR, status=503)
+        coin = self._binance_coin(params.get("symbol", ""))
+        if coin is None:
+            return web.json_response({"code": -1121, "msg": "Invalid symbol."}, status=400)
+        tick = float(self._binance_tick(coin))
+        mid = self.prices.mid("binance", coin)
+        size = round(self.depth_usd / mid, self._binance_decimals(coin))
+        levels = range(int(params.get("limit", 20)))
+        best_bid = math.floor(self._fill_price("binance", coin, False) / tick) * tick
+        best_ask = math.ceil(self._fill_price("binance", coin, True) / tick) * tick
+        return web.json_response({
+            "lastUpdateId": next(self._ids), "E": int(time.time() * 1000), "T": int(time.time() * 1000),
+            "bids": [[f"{best_bid - i * tick:.8g}", str(size)] for i in levels],
+            "asks": [[f"{best_ask + i * tick:.8g}", str(size)] for i in levels],
+        })
+
+    async def binance_new_order(self, request):
+        venue = self.venues["binance"]
+        params, failed = await self._binance(request, "POST /fapi/v1/order")
+        if failed and not venue.rng.random() < venue.placed_on_error:
+            return web.json_response(BINANCE_ERROR, status=503)
+
+        coin = self._binance_coin(params.get("symbol", ""))
+        if coin is None:
+            return web.json_response({"code": -1121, "msg": "Invalid symbol."}, status=400)
+        client_id = params.get("newClientOrderId") or f"sim{next(self._ids)}"
+        if client_id in venue.orders:
+            return web.json_response({"code": -4116, "msg": "ClientOrderId is duplicated."}, status=400)
+
+        is_buy = params["side"] == "BUY"
+        qty = Decimal(params["quantity"])
+        price = Decimal(repr(self._fill_price("binance", coin, is_buy))).quantize(self._binance_tick(coin))
+        filled = qty
+        if params["type"] == "LIMIT" and (price > Decimal(params["price"]) if is_buy else price < Decimal(params["price"])):
+            filled = Decimal(0)
+        if filled:
+            venue.fill(params["symbol"], filled if is_buy else -filled, price)
+        order = venue.orders[client_id] = {
+            "orderId": next(self._ids), "symbol": params["symbol"], "clientOrderId": client_id,
+            "status": "FILLED" if filled else "EXPIRED", "side": params["side"], "type": params["type"],
+            "timeInForce": params.get("timeInForce", "GTC"), "price": params.get("price", "0"),
+            "origQty": params["quantity"], "executedQty": format(filled, "f"),
+            "avgPrice": format(price if filled else Decimal(0), "f"), "cumQuote": format(filled * price, "f"),
+            "updateTime": int(time.time() * 1000),
+        }
+        self._publish_fill(order, price, filled)
+        if failed:
+            # Matched, but the client never hears about it
+            return web.json_response(BINANCE_ERROR, status=503)
+        if params.get("newOrderRespType") == "RESULT":
+            return web.json_response(order)
+        # The default ACK response leaves the fill to a later query
+        return web.json_response({**order, "status": "NEW", "executedQty": "0", "avgPrice": "0.00", "cumQuote": "0"})
+
+    async def binance_query_order(self, request):
+        params, failed = await self._binance(request, "GET /fapi/v1/order")
+        if failed:
+            return web.json_response(BINANCE_ERROR, status=503)
+        order = self.venues["binance"].orders.get(params.get("origClientOrderId"))
+        if order is None:
+            return web.json_response({"code": -2013, "msg": "Order does not exist."}, status=400)
+        return web.json_response(order)
+
+    async def binance_positions(self, request):
+        if (await self._binance(request, "GET /fapi/v2/positionRisk"))[1]:
+            return web.json_response(BINANCE_ERROR, status=503)
+        venue = self.venues["binance"]
+        return web.json_response([
+            {"symbol": f"{coin}USDT", "positionAmt": format(size, "f"), "entryPrice": format(entry, "f"),
+             "markPrice": repr(self.prices.mid("binance", coin)), "positionSide": "BOTH"}
+            for coin in self.coins
+            for size, entry in [venue.positions.get(f"{coin}USDT", (Decimal(0), Decimal(0)))]
+        ])
+
+    async def binance_listen_key(self, request):
+        _, failed = await self._binance(request, f"{request.method} /fapi/v1/listenKey")
+        if failed:
+            return web.json_response(BINANCE_ERROR, status=503)
+        return web.json_response({"listenKey": self.listen_key} if request.method == "POST" else {})
+
+    async def binance_user_stream(self, request):
+        if request.match_info["listen_key"] != self.listen_key:
+            return web.Response(status=404)
+        self.requests["binance WS user data stream"] += 1
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+        self.user_streams.add(ws)
+        try:
+            async for _ in ws:
+                pass
+        finally:
+            self.user_streams.discard(ws)
+        return ws
+
+    def _publish_fill(self, order: dict, price: Decimal, filled: Decimal):
+        """ORDER_TRADE_UPDATE, and ACCOUNT_UPDATE after a trade, to every user data stream, half a round trip later"""
+        if not self.user_streams:
+            return
+        now = int(time.time() * 1000)
+        fee = filled * price * self.taker_fee
+        events = [{"e": "ORDER_TRADE_UPDATE", "E": now, "T": now, "o": {
+            "s": order["symbol"], "c": order["clientOrderId"], "S": order["side"], "o": order["type"],
+            "f": order["timeInForce"], "q": order["origQty"], "p": order["price"], "ap": order["avgPrice"],
+            "x": "TRADE" if filled else "EXPIRED", "X": order["status"], "i": order["orderId"],
+            "l": order["executedQty"], "z": order["executedQty"], "L": format(price, "f"),
+            "n": format(fee, "f"), "N": "USDT", "T": now, "rp": "0",
+        }}]
+        if filled:
+            size, entry = self.venues["binance"].positions.get(order["symbol"], (Decimal(0), Decimal(0)))
+            events.append({"e": "ACCOUNT_UPDATE", "E": now, "T": now, "a": {"m": "ORDER", "B": [], "P": [
+                {"s": order["symbol"], "pa": format(size, "f"), "ep": format(entry, "f"), "ps": "BOTH"}]}})
+
+        async def send():
+            await self.venues["binance"].delay()
+            for ws in list(self.user_streams):
+                for event in events:
+                    await ws.send_json(event)
+        task = asyncio.ensure_future(send())
+        self._pushes.add(task)
+        task.add_done_callback(self._pushes.discard)
+
+    # Hyperliquid
+
+    async def _hyperliquid(self, request, endpoint: str) -> tuple[dict, bool]:
+        """Count the request; returns the payload and whether the request failed"""
+        venue = self.venues["hyperliquid"]
+        payload = await request.json()
+        if endpoint == "info":
+            endpoint = f"info {payload.get('type')}"
+        self.requests[f"hyperliquid {endpoint}"] += 1
+        failed = venue.fails()
+        if failed:
+            self.errors[f"hyperliquid {endpoint}"] += 1
+        return payload, failed
+
+    def _hyperliquid_px(self, coin: str, price: float) -> str:
+        return str(round(float(f"{price:.5g}"), 6 - self._hyperliquid_decimals(coin)))
+
+    async def hyperliquid_info(self, request):
+        payload, failed = await self._hyperliquid(request, "info")
+        if failed:
+            return web.Response(status=500, text="Internal server error")
+        venue = self.venues["hyperliquid"]
+        kind = payload.get("type")
+        if kind == "meta":
+            return web.json_response({"universe": [{"name": coin, "szDecimals": self._hyperliquid_decimals(coin), "maxLeverage": 50}
+                                                   for coin in self.coins]})
+        if kind == "spotMeta":
+            return web.json_response({"tokens": [], "universe": []})
+        if kind == "allMids":
+            return web.json_response({coin: self._hyperliquid_px(coin, self.prices.mid("hyperliquid", coin)) for coin in self.coins})
+        if kind == "clearinghouseState":
+            return web.json_response({"assetPositions": [
+                {"type": "oneWay", "position": {"coin": coin, "szi": format(size, "f"), "entryPx": format(entry, "f")}}
+                for coin, (size, entry) in venue.positions.items()
+            ], "time": int(time.time() * 1000)})
+        if kind == "orderStatus":
+            order = venue.orders.get(payload.get("oid"))
+            if order is None:
+                return web.json_response({"status": "unknownOid"})
+            return web.json_response({"status": "order", "order": order})
+        return web.json_response({"code": None, "msg": f"Unknown info type {kind}"}, status=422)
+
+    async def hyperliquid_exchange(self, request):
+        venue = self.venues["hyperliquid"]
+        payload, failed = await self._hyperliquid(request, "exchange")
+        if failed and not venue.rng.random() < venue.placed_on_error:
+            return web.Response(status=500, text="Internal server error")
+        action = payload.get("action", {})
+        if action.get("type") != "order":
+            return web.json_response({"status": "err", "response": f"Unsupported action {action.get('type')}"})
+
+        statuses = []
+        for wire in action["orders"]:
+            coin = self.coins[wire["a"]]
+            is_buy = wire["b"]
+            size = Decimal(wire["s"])
+            if wire.get("r"):
+                held = venue.positions.get(coin, (Decimal(0), Decimal(0)))[0]
+                size = min(size, abs(held)) if held and (held < 0) == is_buy else Decimal(0)
+            price = Decimal(self._hyperliquid_px(coin, self._fill_price("hyperliquid", coin, is_buy)))
+            crosses = price <= Decimal(wire["p"]) if is_buy else price >= Decimal(wire["p"])
+            oid = next(self._ids)
+            order = {"coin": coin, "side": "B" if is_buy else "A", "limitPx": wire["p"], "sz": "0.0", "oid": oid,
+                     "timestamp": int(time.time() * 1000), "origSz": wire["s"], "cloid": wire.get("c")}
+            if crosses and size:
+                venue.fill(coin, size if is_buy else -size, price)
+                statuses.append({"filled": {"totalSz": format(size, "f"), "avgPx": format(price, "f"), "oid": oid}})
+                status = "filled"
+            else:
+                statuses.append({"error": f"Order could not immediately match against any resting orders. asset={wire['a']}"})
+                status = "canceled"
+            if wire.get("c"):
+                venue.orders[wire["c"]] = {"order": order, "status": status, "statusTimestamp": order["timestamp"]}
+
+        if failed:
+            return web.Response(status=500, text="Internal server error")
+        return web.json_response({"status": "ok", "response": {"type": "order", "data": {"statuses": statuses}}})
+
+async def serve(cfg, port: int = None):
+    simulator = Simulator(cfg)
+    base_url = await simulator.start(cfg.get("host", "127.0.0.1"), port or cfg.get("port", 8400))
+    log(f"Simulating Binance and Hyperliquid at {base_url} for {', '.join(simulator.coins)}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.stop()
+
+if __name__ == "__main__":
+    try:
+        config = yaml.safe_load(open("config.yaml")) or {}
+    except FileNotFoundError:
+        config = {}
+    logger.configure(config.get("logging", {}))
+    try:
+        asyncio.run(serve(config.get("simulator", {}), int(sys.argv[1]) if len(sys.argv) > 1 else None))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        logger.shutdown()
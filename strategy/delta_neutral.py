@@ -1,7 +1,11 @@
-import asyncio
+import asyncio, time
 from decimal import Decimal
 from exchanges.base import Exchange
-from models.asset import ExchangeAsset, TradingPair
+from models.asset import ExchangeAsset, ExchangeName, TradingPair
+from strategy.execution import Leg, PairExecutor
+from strategy.ledger import ENTRY, EXIT
+from strategy.routing import PriceMatrix, route
+from utils import metrics, profiler
 from utils.logger import log
 from models.order import Order, Side
 
@@ -9,138 +13,447 @@ from models.order import Order, Side
 Delta Neutral Market Making Strategy
 1. Close existing positions on both exchanges
 2. Compute PnL for closed positions
-3. Fetch current prices from both exchanges
-4. Open a long position on Exchange A and a short position on Exchange B with equal notional value. Long should be opened on the exchange with the lower price.
+3. Fetch current prices from all exchanges
+4. Open a long position on the cheapest exchange and a short position on the richest one with equal notional value.
 5. Track entry prices for both positions
+
+The strategy trades across any number of venues (two or more Exchange implementations,
+see exchanges/registry.py). Prices are fetched from all of them concurrently and the
+long/short venues are picked in one pass over the prices, see strategy/routing.py.
+
+With `netting: true` steps 1-4 become one rebalance order per venue for the difference
+between the held and the target position, see rebalance_at().
+
+With a `trigger` config the strategy is event-driven instead: evaluate_spread() runs on
+every price update, opens when the spread reaches entry_bps and closes when it drops
+below exit_bps, with min_hold_seconds between the two.
 '''
 class DeltaNeutralStrategy:
-    def __init__(self, exA: Exchange, exB: Exchange, cfg):
-        self.A = exA    # Hyperliquid
-        self.B = exB    # Binance
+    def __init__(self, exchanges: list[Exchange], cfg, clock=time.monotonic):
+        # Optionally limited to the venues named in the pair's `venues` list
+        wanted = [name.lower() for name in cfg.get("venues", [])]
+        self.venues = [ex for ex in exchanges if not wanted or ex.name.value.lower() in wanted]
+        if len(self.venues) < 2:
+            raise Exception(f"{cfg['base_asset']} needs at least two venues, got {[ex.name.value for ex in self.venues]}")
+        self.venue_index = {ex.name: i for i, ex in enumerate(self.venues)}
+        self.clock = clock  # Seconds; replaced by a virtual clock when backtesting
         self.notional = Decimal(str(cfg["notional"]))
+        self.interval = cfg["interval_minutes"] * 60
+        self.min_spread_bps = cfg.get("min_spread_bps", 0)  # Skip opening below this spread
+        self.netting = cfg.get("netting", False)  # Rebalance instead of close + reopen each cycle
+        execution = cfg.get("execution", {})
+        # Opens both legs, retrying or unwinding a failed one; optionally pre-signed, see strategy/execution.py
+        self.pair_executor = PairExecutor(execution)
         self.pair = TradingPair(cfg["base_asset"], cfg["quote_asset"])
 
         self.last_long_order: Order = None   # Order from long position
         self.last_short_order: Order = None  # Order from short position
         
-        self.asset_A: ExchangeAsset = None  # ExchangeAsset for Hyperliquid
-        self.asset_B: ExchangeAsset = None  # ExchangeAsset for Binance
+        self.assets: list[ExchangeAsset] = []  # ExchangeAsset per venue, in venue order
+        self.opened_at: float = None         # clock() time of the last open
+        self.journal = None                  # Optional strategy.journal.Journal, set by Portfolio
+        self.ledger = None                   # Optional strategy.ledger.Ledger, set by Portfolio
+        self.ledger_cycle: int = None        # Ledger cycle id of the open legs
+        self.matrix: PriceMatrix = None      # Optional shared price matrix, set by Portfolio
+        self.matrix_row: int = None          # This pair's row in it
+        self.matrix_cols: list[int] = None   # and the columns of self.venues
+
+        # Optional event-driven mode, see evaluate_spread()
+        self.trigger = cfg.get("trigger")
+        if self.trigger:
+            self.entry_bps = self.trigger["entry_bps"]
+            self.exit_bps = self.trigger.get("exit_bps", 0)
+            self.min_hold = self.trigger.get("min_hold_seconds", 0)
+            self.poll_seconds = self.trigger.get("poll_seconds", 1)
+            if self.exit_bps >= self.entry_bps:
+                raise Exception(f"trigger.exit_bps ({self.exit_bps}) must be below entry_bps ({self.entry_bps})")
+
+    def names(self) -> str:
+        names = [ex.name.value for ex in self.venues]
+        return f"{', '.join(names[:-1])} and {names[-1]}"
 
     async def initialize(self):
-        log(f"Initializing Delta Neutral Strategy on {self.A.name.value} and {self.B.name.value} for {self.pair.base_asset}")
+        log(f"Initializing Delta Neutral Strategy on {self.names()} for {self.pair.base_asset}")
         try:
             # Fetch asset info concurrently
-            self.asset_A, self.asset_B = await asyncio.gather(
-                self.A.get_asset_info(self.pair),
-                self.B.get_asset_info(self.pair)
-            )
+            self.assets = list(await asyncio.gather(*(ex.get_asset_info(self.pair) for ex in self.venues)))
 
-            if self.asset_A.base_quantity_precision < self.asset_B.base_quantity_precision:
-                log(f"Using {self.A.name.value} precision: {self.asset_A.base_quantity_precision} decimal places")
-                self.asset_B.base_quantity_precision = self.asset_A.base_quantity_precision
-            else:
-                log(f"Using {self.B.name.value} precision: {self.asset_B.base_quantity_precision} decimal places")
-                self.asset_A.base_quantity_precision = self.asset_B.base_quantity_precision
+            # Every leg is sized with the coarsest precision, so both legs of any venue pair match
+            coarsest = min(range(len(self.assets)), key=lambda i: self.assets[i].base_quantity_precision)
+            precision = self.assets[coarsest].base_quantity_precision
+            log(f"Using {self.venues[coarsest].name.value} precision: {precision} decimal places")
+            for asset in self.assets:
+                asset.base_quantity_precision = precision
+
+            # Each leg must clear the largest of the venues' minimum order values
+            min_notional = max((a.min_notional for a in self.assets if a.min_notional), default=None)
+            if min_notional and self.notional < min_notional:
+                raise Exception(f"notional ${self.notional} is below the ${min_notional} minimum order value")
+
+            # Stream prices for this pair if the exchanges have market data feeds
+            await asyncio.gather(*(ex.watch(asset) for ex, asset in zip(self.venues, self.assets)))
         except Exception as e:
             raise Exception(f"Error during strategy initialization: {e}")
     async def cycle(self):
+        with metrics.span("cycle_seconds", pair=str(self.pair)), profiler.cycle(str(self.pair)):
+            await self._cycle()
+
+    async def _cycle(self):
         try:
             # Close existing positions if any
-            if self.last_long_order or self.last_short_order:
-                log("Closing positions...")
-                
-                close_orders = []
+            if (self.last_long_order or self.last_short_order) and not self.netting:
+                log(f"Closing {self.pair} positions...")
                 
                 # Fetch prices concurrently
-                price_A, price_B = await asyncio.gather(
-                    self.A.get_price(self.asset_A),
-                    self.B.get_price(self.asset_B)
-                )
-                
-                # Determine which exchange has which position and prepare close tasks
-                close_tasks = []
-                
-                # Check Hyperliquid
-                if self.last_long_order and self.last_long_order.asset.exchange == self.asset_A.exchange:
-                    close_tasks.append(self.A.close_position(price_A))
-                elif self.last_short_order and self.last_short_order.asset.exchange == self.asset_A.exchange:
-                    close_tasks.append(self.A.close_position(price_A))
-                
-                # Check Binance
-                if self.last_long_order and self.last_long_order.asset.exchange == self.asset_B.exchange:
-                    close_tasks.append(self.B.close_position(price_B))
-                elif self.last_short_order and self.last_short_order.asset.exchange == self.asset_B.exchange:
-                    close_tasks.append(self.B.close_position(price_B))
-                
-                # Close positions concurrently
-                if close_tasks:
-                    close_orders = await asyncio.gather(*close_tasks)
-                
-                # Compute PnL for closed positions
-                if len(close_orders) == 2:
-                    pnl = self.calculate_pnl(close_orders)
-                    log(f"Cycle Position PnL: ${str(pnl)}")
-
-            # Fetch current prices from both exchanges concurrently
-            price_A, price_B = await asyncio.gather(
-                self.A.get_price(self.asset_A),
-                self.B.get_price(self.asset_B)
-            )
-            
-            log(f"{self.A.name.value} price: ${str(price_A)}, {self.B.name.value} price: ${str(price_B)}")
-            # Determine which exchange has lower price for long position and open positions concurrently
-            if price_A < price_B:
-                log(f"Opening LONG on {self.A.name.value}, SHORT on {self.B.name.value}...")
-                self.last_long_order, self.last_short_order = await asyncio.gather(
-                    self.A.open_long(self.asset_A, price_A, self.notional),
-                    self.B.open_short(self.asset_B, price_B, self.notional)
-                )
-            else:
-                log(f"Opening LONG on {self.B.name.value}, SHORT on {self.A.name.value}...")
-                self.last_long_order, self.last_short_order = await asyncio.gather(
-                    self.B.open_long(self.asset_B, price_B, self.notional),
-                    self.A.open_short(self.asset_A, price_A, self.notional)
-                )
-            
-            # Calculate and log the price delta
-            delta = self.last_long_order.price * self.last_long_order.size - self.last_short_order.price * self.last_short_order.size
-            pct = delta / self.last_long_order.price * Decimal('100')
+                await self.close_at(await self.fetch_prices())
+
+            # Fetch current prices from all exchanges concurrently
+            prices = await self.fetch_prices()
             
-            log(f"Entry Delta: ${str(delta)} ({str(round(pct, 4))}%)")
+            log(f"{self.pair} " + ", ".join(f"{ex.name.value} price: ${str(price)}" for ex, price in zip(self.venues, prices)),
+                pair=str(self.pair), prices={ex.name.value: price for ex, price in zip(self.venues, prices)})
+            with metrics.span("strategy_phase_seconds", phase="decision"):
+                long_i, short_i = route(prices)
+                spread = self.spread_bps(prices[long_i], prices[short_i])
+                flat = spread < self.min_spread_bps
+            if flat:
+                log(f"{self.pair} spread {spread:.2f} bps below {self.min_spread_bps} bps, staying flat this cycle")
+            if self.netting:
+                await self.rebalance_at(prices, flat)
+            elif not flat:
+                await self.open_at(prices)
         except Exception as e:
             raise Exception(f"Error during cycle: {e}")
 
+    async def evaluate_spread(self):
+        """
+        Event-driven alternative to cycle(), called on every price update.
+        Opens when the best cross-venue spread reaches entry_bps and closes once the spread
+        captured by the open position falls below exit_bps (or flips) after min_hold_seconds.
+        """
+        with profiler.cycle(str(self.pair)):
+            await self._evaluate_spread()
+
+    async def _evaluate_spread(self):
+        try:
+            prices = await self.fetch_prices()
+
+            if not (self.last_long_order or self.last_short_order):
+                long_i, short_i = route(prices)
+                spread = self.spread_bps(prices[long_i], prices[short_i])
+                if spread >= self.entry_bps:
+                    log(f"{self.pair} spread {spread:.2f} bps >= {self.entry_bps} bps entry, "
+                        f"{self.venues[long_i].name.value} price: ${str(prices[long_i])}, {self.venues[short_i].name.value} price: ${str(prices[short_i])}",
+                        pair=str(self.pair), spread_bps=spread, prices={ex.name.value: price for ex, price in zip(self.venues, prices)})
+                    await self.open_at(prices)
+                return
+
+            if not (self.last_long_order and self.last_short_order):
+                # An unhedged leg, e.g. resumed after a crash partway through an open: close it now
+                leg = self.last_long_order or self.last_short_order
+                log(f"[WARN] {self.pair} holds only {leg.side.value} {leg.size} on {leg.asset.exchange.value}, closing the unhedged leg...",
+                    pair=str(self.pair))
+                await self.close_at(prices)
+                return
+
+            # Positive while the venue we are long on is still cheaper than the one we are short on
+            captured = self.spread_bps(prices[self.venue_index[self.last_long_order.asset.exchange]],
+                                       prices[self.venue_index[self.last_short_order.asset.exchange]])
+            held = self.clock() - self.opened_at
+            if captured < self.exit_bps and held >= self.min_hold:
+                log(f"{self.pair} spread {captured:.2f} bps < {self.exit_bps} bps exit after {held:.1f}s, closing positions...",
+                    pair=str(self.pair), spread_bps=captured, prices={ex.name.value: price for ex, price in zip(self.venues, prices)})
+                await self.close_at(prices)
+        except Exception as e:
+            raise Exception(f"Error evaluating spread: {e}")
+
+    async def fetch_prices(self) -> list[Decimal]:
+        """Current price on every venue, in venue order, fetched concurrently"""
+        prices = await metrics.gather_legs("price_fetch", *(ex.get_price(asset) for ex, asset in zip(self.venues, self.assets)))
+        if self.matrix is not None:
+            self.matrix.update_row(self.matrix_row, self.matrix_cols, prices)
+        return prices
+
+    @staticmethod
+    def spread_bps(price_long: Decimal, price_short: Decimal) -> float:
+        """Spread in basis points of the mid, positive when the long venue is cheaper"""
+        return float((price_short - price_long) / ((price_long + price_short) / 2)) * 10000
+
+    def held_legs(self) -> list[tuple[int, Order]]:
+        """(venue index, entry order) of each open leg"""
+        return [(self.venue_index[order.asset.exchange], order) for order in (self.last_long_order, self.last_short_order) if order]
+
+    async def close_at(self, prices: list[Decimal]):
+        """Close the open legs at their venues' prices and log the cycle PnL"""
+        close_orders = []
+
+        # Close each leg on the venue that holds it, concurrently
+        close_tasks = [self.venues[i].close_position(self.assets[i], prices[i]) for i, _ in self.held_legs()]
+        decided = {asset.exchange: price for asset, price in zip(self.assets, prices)}
+        self.record_intent("close")
+        if close_tasks:
+            close_orders = self.closed_orders(await metrics.gather_legs("close", *close_tasks, return_exceptions=True), decided)
+        
+        self.record_fills(EXIT, close_orders, decided)
+
+        # Compute PnL for closed positions
+        if len(close_orders) == 2:
+            with metrics.span("strategy_phase_seconds", phase="pnl"):
+                pnl = self.calculate_pnl(close_orders)
+            log(f"{self.pair} Cycle Position PnL: ${str(pnl)}", pair=str(self.pair), pnl=pnl)
+
+        self.last_long_order = None
+        self.last_short_order = None
+        self.record_position()
+
+    async def open_at(self, prices: list[Decimal]):
+        """Long the cheapest venue and short the richest one with equal notional"""
+        long_i, short_i = route(prices)
+        log(f"{self.pair} Opening LONG on {self.venues[long_i].name.value}, SHORT on {self.venues[short_i].name.value}...")
+        long_leg = Leg(self.venues[long_i], self.assets[long_i], Side.LONG, prices[long_i], self.notional)
+        short_leg = Leg(self.venues[short_i], self.assets[short_i], Side.SHORT, prices[short_i], self.notional)
+
+        self.record_intent("open", long=long_leg.exchange.name.value, short=short_leg.exchange.name.value)
+        try:
+            self.last_long_order, self.last_short_order = await self.pair_executor.open(long_leg, short_leg)
+        except Exception:
+            # Unwinding can fail too: follow whatever the venues still hold
+            self.track_positions()
+            raise
+        self.opened_at = self.clock()
+        self.record_position()
+        self.record_fills(ENTRY, [self.last_long_order, self.last_short_order], {long_leg.asset.exchange: long_leg.price, short_leg.asset.exchange: short_leg.price})
+        self.log_entry_delta()
+
+    async def rebalance_at(self, prices: list[Decimal], flat: bool = False):
+        """
+        Netting alternative to close_at() followed by open_at(). Each venue that holds or
+        should hold a leg gets one order for the difference between its held and its target
+        position: nothing or a rounding adjustment when the direction is unchanged, one
+        double-size order when it flips, a closing order when the route moves elsewhere.
+        For PnL the held legs are treated as closed, and the new legs as opened, at the
+        venue's fill price (or the polled price when no order was needed), so
+        calculate_pnl() reports the same cycle PnL as closing and reopening.
+        """
+        held = self.held_legs()
+        if flat and not held:
+            return
+        # Target side and size per venue; venues that only hold a leg go flat
+        targets = {i: (Side.LONG, Decimal(0)) for i, _ in held}
+        if not flat:
+            long_i, short_i = route(prices)
+            for i, side in ((long_i, Side.LONG), (short_i, Side.SHORT)):
+                targets[i] = (side, round(self.notional / prices[i], self.assets[i].base_quantity_precision))
+            self.keep_small_resize(targets, prices)
+
+        venues = sorted(targets)
+        log(f"{self.pair} Rebalancing to " + ", ".join(f"{targets[i][0].value} {targets[i][1]} on {self.venues[i].name.value}" for i in venues) + "...")
+        self.record_intent("rebalance", **{self.venues[i].name.value: f"{targets[i][0].value} {targets[i][1]}" for i in venues})
+        trades = await metrics.gather_legs(
+            "rebalance",
+            *(self.venues[i].rebalance(self.assets[i], *targets[i], prices[i]) for i in venues),
+            return_exceptions=True
+        )
+        errors = [trade for trade in trades if isinstance(trade, Exception)]
+        if errors:
+            # The other venues have traded: follow what each venue now holds before failing
+            self.track_positions()
+            raise Exception(f"Rebalance failed: {'; '.join(str(e) for e in errors)}")
+        polled = {asset.exchange: price for asset, price in zip(self.assets, prices)}
+        # Each venue's one real order is booked with the new legs, or with the exits when a venue goes flat
+        traded = {self.assets[i].exchange: trade.size if trade else Decimal(0) for i, trade in zip(venues, trades)}
+        mark = {self.assets[i].exchange: trade.price if trade else prices[i] for i, trade in zip(venues, trades)}
+
+        entries = [] if flat else [
+            Order(asset=self.assets[i], side=targets[i][0], price=mark[self.assets[i].exchange], size=targets[i][1])
+            for i in (long_i, short_i)
+        ]
+        if self.last_long_order and self.last_short_order:
+            exits = [
+                Order(asset=order.asset, side=Side.SHORT if order.side == Side.LONG else Side.LONG,
+                      price=mark[order.asset.exchange], size=order.size)
+                for order in (self.last_long_order, self.last_short_order)
+            ]
+            with metrics.span("strategy_phase_seconds", phase="pnl"):
+                pnl = self.calculate_pnl(exits)
+            log(f"{self.pair} Cycle Position PnL: ${str(pnl)}", pair=str(self.pair), pnl=pnl)
+            # A venue that keeps a leg books its trade with the entry, one that goes flat with the exit
+            entry_venues = {order.asset.exchange for order in entries}
+            self.record_fills(EXIT, exits, polled, {exchange: Decimal(0) if exchange in entry_venues else size for exchange, size in traded.items()})
+
+        self.last_long_order = self.last_short_order = None
+        if flat:
+            self.record_position()
+            return
+        self.last_long_order, self.last_short_order = entries
+        self.opened_at = self.clock()
+        self.record_position()
+        self.record_fills(ENTRY, entries, polled, traded)
+        self.log_entry_delta()
+
+    def closed_orders(self, results: list, decided: dict[ExchangeName, Decimal] = None) -> list[Order]:
+        """
+        The close orders of a gather run with return_exceptions. If any leg failed, the legs
+        that did close are booked, the open legs are taken from what the venues still hold
+        and the failure is raised, so the next cycle only retries the leg still open.
+        """
+        errors = [result for result in results if isinstance(result, Exception)]
+        orders = [result for result in results if not isinstance(result, Exception)]
+        if errors:
+            self.record_fills(EXIT, orders, decided or {order.asset.exchange: order.price for order in orders})
+            self.track_positions()
+            raise Exception(f"Close failed: {'; '.join(str(e) for e in errors)}")
+        return orders
+
+    def track_positions(self):
+        """Take the open legs from the positions the venues' adapters hold, after a partly failed order phase"""
+        self.last_long_order = self.last_short_order = None
+        for exchange, asset in zip(self.venues, self.assets):
+            order = exchange.positions.get(asset.exchange_symbol)
+            if order is None:
+                continue
+            if order.side == Side.LONG and self.last_long_order is None:
+                self.last_long_order = order
+            elif order.side == Side.SHORT and self.last_short_order is None:
+                self.last_short_order = order
+        legs = [f"{o.side.value} {o.size} on {o.asset.exchange.value}" for o in (self.last_long_order, self.last_short_order) if o]
+        log(f"[WARN] {self.pair} now holds {', '.join(legs) or 'nothing'}", pair=str(self.pair))
+        self.record_position()
+
+    def keep_small_resize(self, targets: dict[int, tuple[Side, Decimal]], prices: list[Decimal]):
+        """
+        When both legs stay on their venues and sides, a resize worth less than a venue's
+        minimum order value would be rejected there while the other venue trades. Keep both
+        held sizes instead, so the legs stay equal.
+        """
+        held = dict(self.held_legs())
+        if set(held) != set(targets) or any(held[i].side != targets[i][0] for i in targets):
+            return
+        small = [i for i in targets if held[i].size != targets[i][1] and self.assets[i].min_notional
+                 and abs(targets[i][1] - held[i].size) * prices[i] < self.assets[i].min_notional]
+        if small:
+            log(f"{self.pair} keeping the held sizes: the resize on {', '.join(self.venues[i].name.value for i in small)} "
+                f"is below the minimum order value")
+            for i in targets:
+                targets[i] = (held[i].side, held[i].size)
+
+    def record_intent(self, action: str, **legs):
+        """Journal an order about to be sent, so a crash mid-order is visible on restart"""
+        if self.journal:
+            self.journal.append(str(self.pair), "intent", action=action, **legs)
+
+    def record_position(self):
+        """Journal the legs now held (None when flat)"""
+        if self.journal:
+            self.journal.append(
+                str(self.pair), "position",
+                long=self.last_long_order.to_dict() if self.last_long_order else None,
+                short=self.last_short_order.to_dict() if self.last_short_order else None,
+                opened_ts=time.time() - (self.clock() - self.opened_at) if self.last_long_order or self.last_short_order else None,
+            )
+
+    def record_fills(self, kind: int, orders: list[Order], decided: dict[ExchangeName, Decimal], traded: dict[ExchangeName, Decimal] = None):
+        """
+        Add entry or exit fills to the ledger. decided holds the price each venue's order was
+        sent at, traded the size each venue actually traded when it differs from the orders'.
+        """
+        if self.ledger is None or not orders:
+            return
+        if kind == ENTRY or self.ledger_cycle is None:
+            self.ledger_cycle = self.ledger.next_cycle()
+        for order in orders:
+            self.ledger.record(str(self.pair), self.ledger_cycle, kind, order, decided[order.asset.exchange],
+                               traded[order.asset.exchange] if traded else None)
+        if kind == EXIT:
+            self.ledger_cycle = None
+
+    def restore(self, journaled: dict, live: dict[ExchangeName, dict], adopt_unknown: bool = False):
+        """
+        Resume the legs the exchanges still hold for this pair instead of flattening them.
+        live maps each exchange to its live_positions(); journaled is this pair's journal
+        state (or None). Legs that match the journal keep its entry price, which is what
+        PnL is measured from. A leg the journal does not know, such as a position opened by
+        hand, is adopted at the exchange's entry price only with adopt_unknown; otherwise
+        the pair is refused with an exception before anything is resumed.
+        """
+        journaled = journaled or {}
+        journal_legs = [leg for leg in (journaled.get("long"), journaled.get("short")) if leg]
+        if journaled.get("pending"):
+            log(f"[WARN] {self.pair} was interrupted during {journaled['pending']['action']}, using the live positions")
+
+        found = []
+        for exchange, asset in zip(self.venues, self.assets):
+            held = live[exchange.name].get(asset.exchange_symbol)
+            if held is None:
+                continue
+            side, size, entry_price = held
+            match = next((leg for leg in journal_legs if leg["exchange"] == exchange.name.value and leg["side"] == side.value
+                          and Decimal(leg["size"]) == size), None)
+            if match:
+                entry_price = Decimal(match["price"])
+            elif not adopt_unknown:
+                raise Exception(f"{exchange.name.value} holds {side.value} {size} {asset.exchange_symbol} that the journal does not know; "
+                                f"close it or set journal.adopt_unknown: true to trade it")
+            else:
+                log(f"[WARN] {self.pair} adopting {side.value} {size} on {exchange.name.value} not found in the journal")
+            found.append((exchange, asset, Order(asset=asset, side=side, price=entry_price, size=size)))
+
+        for exchange, asset, order in found:
+            side = order.side
+            if (self.last_long_order if side == Side.LONG else self.last_short_order) is not None:
+                log(f"[ERROR] {self.pair} holds {side.value} on both venues, leaving {exchange.name.value} untracked")
+                continue
+            exchange.positions[asset.exchange_symbol] = order
+            if side == Side.LONG:
+                self.last_long_order = order
+            else:
+                self.last_short_order = order
+
+        if self.last_long_order or self.last_short_order:
+            opened_ts = journaled.get("opened_ts") or time.time()
+            self.opened_at = self.clock() - (time.time() - opened_ts)
+            resumed = [o for o in (self.last_long_order, self.last_short_order) if o]
+            # The resumed legs start a new ledger cycle at their entry prices
+            self.record_fills(ENTRY, resumed, {o.asset.exchange: o.price for o in resumed})
+            legs = [f"{o.side.value} {o.size} on {o.asset.exchange.value} @ ${o.price}" for o in resumed]
+            if len(resumed) == 1:
+                log(f"[WARN] {self.pair} resumed a single unhedged leg, {legs[0]}; it is closed on the next cycle or price update",
+                    pair=str(self.pair))
+            else:
+                log(f"{self.pair} resumed {', '.join(legs)}", pair=str(self.pair))
+        elif journal_legs:
+            log(f"[WARN] {self.pair} journal shows open legs but both venues are flat, starting flat")
+
+    def log_entry_delta(self):
+        """Calculate and log the price delta between the open legs"""
+        delta = self.last_long_order.price * self.last_long_order.size - self.last_short_order.price * self.last_short_order.size
+        pct = delta / self.last_long_order.price * Decimal('100')
+        
+        log(f"{self.pair} Entry Delta: ${str(delta)} ({str(round(pct, 4))}%)", pair=str(self.pair), delta=delta, delta_pct=pct)
+
     async def close_positions(self):
         """
-        Close any open positions on both exchanges concurrently.
+        Close any open positions on their exchanges concurrently.
         This is called at the end of the cycle to ensure no positions are left open.
         """
         try:
-            log(f"Closing positions...")
-            close_tasks = []
-            
-            if self.last_long_order:
-                if self.last_long_order.asset.exchange == self.A.name:
-                    close_tasks.append(self.A.close_position(self.last_long_order.price))
-                else:
-                    close_tasks.append(self.B.close_position(self.last_long_order.price))
-            
-            if self.last_short_order:
-                if self.last_short_order.asset.exchange == self.A.name:
-                    close_tasks.append(self.A.close_position(self.last_short_order.price))
-                else:
-                    close_tasks.append(self.B.close_position(self.last_short_order.price))
+            log(f"Closing {self.pair} positions...")
+            close_tasks = [self.venues[i].close_position(self.assets[i], order.price) for i, order in self.held_legs()]
+            close_orders = []
             
             # Close all positions concurrently
+            self.record_intent("close")
             if close_tasks:
-                close_orders = await asyncio.gather(*close_tasks)
+                close_orders = self.closed_orders(await asyncio.gather(*close_tasks, return_exceptions=True))
+            self.record_fills(EXIT, close_orders, {order.asset.exchange: order.price for order in close_orders})
 
             # Calculate PnL for closed positions
             pnl = self.calculate_pnl(close_orders)
-            log(f"Cycle Position PnL: ${str(pnl)}")
+            log(f"{self.pair} Cycle Position PnL: ${str(pnl)}", pair=str(self.pair), pnl=pnl)
 
             self.last_long_order = None
             self.last_short_order = None
+            self.record_position()
         except Exception as e:
             raise Exception(f"Error closing positions: {e}")
     
@@ -183,8 +496,10 @@ class DeltaNeutralStrategy:
             
             total_pnl = long_pnl + short_pnl
             
-            log(f"Long PnL: ${str(long_pnl)} (Entry: ${str(self.last_long_order.price)}, Exit: ${str(long_exit.price)})")
-            log(f"Short PnL: ${str(short_pnl)} (Entry: ${str(self.last_short_order.price)}, Exit: ${str(short_exit.price)})")
+            log(f"Long PnL: ${str(long_pnl)} (Entry: ${str(self.last_long_order.price)}, Exit: ${str(long_exit.price)})",
+                exchange=long_exit.asset.exchange, side=Side.LONG, pnl=long_pnl, entry=self.last_long_order.price, exit=long_exit.price)
+            log(f"Short PnL: ${str(short_pnl)} (Entry: ${str(self.last_short_order.price)}, Exit: ${str(short_exit.price)})",
+                exchange=short_exit.asset.exchange, side=Side.SHORT, pnl=short_pnl, entry=self.last_short_order.price, exit=short_exit.price)
             
             return total_pnl
         except Exception as e:
@@ -0,0 +1,117 @@
+import asyncio
+from decimal import Decimal
+from exchanges.base import Exchange
+from models.asset import ExchangeAsset
+from models.order import Order, PreparedOrder, Side
+from utils import metrics
+from utils.logger import log
+
+class Leg:
+    """One side of a paired open: which venue, asset and direction, at what price and notional"""
+    def __init__(self, exchange: Exchange, asset: ExchangeAsset, side: Side, price: Decimal, notional: Decimal):
+        self.exchange = exchange
+        self.asset = asset
+        self.side = side
+        self.price = price
+        self.notional = notional
+
+    async def prepare(self) -> PreparedOrder:
+        return await self.exchange.prepare_order(self.asset, self.side, self.price, self.notional)
+
+    async def open(self) -> Order:
+        """Open the leg with a plain market order (sliced when the venue has a slicer)"""
+        opener = self.exchange.open_long if self.side == Side.LONG else self.exchange.open_short
+        return await opener(self.asset, self.price, self.notional)
+
+class PairExecutor:
+    """
+    Opens both legs of a pair, so that one failing leg never leaves the other unhedged.
+
+    By default the legs are plain market orders sent concurrently. With presigned,
+    prepare() sizes, rate-limits and signs both orders concurrently; fire() then starts
+    both sends in the same event-loop iteration, so the only thing between the two
+    submissions is writing the first request. The gap between them is recorded as
+    leg_submit_skew_seconds. Either way, if exactly one leg fails it is retried (with
+    freshly signed orders when pre-signed) until leg_deadline_ms; if it still has not
+    filled, the filled leg is closed again so the bot is never left with a naked position.
+    """
+    def __init__(self, cfg):
+        self.presigned = cfg.get("presigned", False)
+        self.leg_deadline = cfg.get("leg_deadline_ms", 2000) / 1000
+        self.retry_interval = cfg.get("retry_interval_ms", 100) / 1000
+        self.expiry_margin = cfg.get("expiry_margin_ms", 500) / 1000  # Re-sign orders this close to expiring
+
+    async def prepare(self, *legs: Leg) -> list[PreparedOrder]:
+        with metrics.span("strategy_phase_seconds", phase="prepare"):
+            return await asyncio.gather(*(leg.prepare() for leg in legs))
+
+    async def fire(self, legs: list[Leg], prepared: list[PreparedOrder]) -> list[Order]:
+        # A signature that expires in flight would be rejected by the venue, so re-sign it first
+        for i, order in enumerate(prepared):
+            if order.expired(self.expiry_margin):
+                prepared[i] = await legs[i].prepare()
+
+        with metrics.span("strategy_phase_seconds", phase="open"):
+            results = await asyncio.gather(*(order.send() for order in prepared), return_exceptions=True)
+        sent = [order.sent_at for order in prepared if order.sent_at is not None]
+        if len(sent) > 1:
+            metrics.observe("leg_submit_skew_seconds", max(sent) - min(sent), phase="open")
+
+        return await self._settle(legs, results, presigned=True)
+
+    async def open(self, *legs: Leg) -> list[Order]:
+        if self.presigned:
+            return await self.fire(list(legs), await self.prepare(*legs))
+        results = await metrics.gather_legs("open", *(leg.open() for leg in legs), return_exceptions=True)
+        return await self._settle(list(legs), results, presigned=False)
+
+    async def _send(self, leg: Leg, presigned: bool) -> Order:
+        if presigned:
+            return await (await leg.prepare()).send()
+        return await leg.open()
+
+    async def _settle(self, legs: list[Leg], results: list, presigned: bool) -> list[Order]:
+        failed = [i for i, result in enumerate(results) if isinstance(result, BaseException)]
+        if not failed:
+            return results
+        if len(failed) == len(results):
+            raise Exception(f"All legs failed: {'; '.join(str(results[i]) for i in failed)}")
+        return await self._recover(legs, results, failed, presigned)
+
+    async def _recover(self, legs: list[Leg], results: list, failed: list[int], presigned: bool) -> list[Order]:
+        """Retry the failed legs until the deadline, otherwise close the ones that filled"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.leg_deadline
+        started = loop.time()
+        for i in failed:
+            log(f"[WARN] {legs[i].asset.pair} leg on {legs[i].exchange.name.value} failed: {results[i]}, retrying",
+                exchange=legs[i].exchange.name, side=legs[i].side)
+
+        # Never cancel a send mid-flight (the order may already be live), only stop retrying
+        while failed and loop.time() < deadline:
+            await asyncio.sleep(self.retry_interval)
+            still_failed = []
+            for i in failed:
+                try:
+                    results[i] = await self._send(legs[i], presigned)
+                except Exception as e:
+                    results[i] = e
+                    still_failed.append(i)
+            failed = still_failed
+
+        if not failed:
+            metrics.observe("leg_recovery_seconds", loop.time() - started, outcome="retried")
+            return results
+
+        filled = [i for i in range(len(legs)) if i not in failed]
+        log(f"[ERROR] {legs[0].asset.pair} legs on {', '.join(legs[i].exchange.name.value for i in failed)} "
+            f"did not fill within {self.leg_deadline:g}s, unwinding the filled legs")
+        unwound = await asyncio.gather(
+            *(legs[i].exchange.close_position(legs[i].asset, results[i].price) for i in filled),
+            return_exceptions=True
+        )
+        metrics.observe("leg_recovery_seconds", loop.time() - started, outcome="unwound")
+        errors = [str(e) for e in unwound if isinstance(e, BaseException)]
+        if errors:
+            raise Exception(f"Leg failed ({results[failed[0]]}) and unwinding failed: {'; '.join(errors)}")
+        raise Exception(f"Leg failed and the filled leg was unwound: {results[failed[0]]}")
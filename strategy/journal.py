@@ -0,0 +1,122 @@
+import asyncio, json, os, time
+from utils.logger import log
+
+class Journal:
+    """
+    Append-only journal of order intents and resulting positions, one JSON record per line:
+
+        {"seq": 42, "ts": 1760000000.1, "pair": "BTC-USDT", "kind": "intent", "action": "open", ...}
+        {"seq": 43, "ts": 1760000000.3, "pair": "BTC-USDT", "kind": "position", "long": {...}, "short": {...}}
+
+    append() applies the record to the in-memory state and returns at once; records are
+    written and fsynced in batches every batch_ms (group commit), so a crash loses at
+    most that window, which startup reconciliation against the exchanges covers.
+
+    Every snapshot_every records the state is written to snapshot.json and the log is
+    truncated, so startup reads one snapshot plus a bounded tail no matter how long the
+    bot has been running. The snapshot carries the last seq it covers and replay skips
+    older records, so a crash between writing the snapshot and truncating is harmless.
+    """
+    def __init__(self, root: str = "journal", batch_ms: float = 50, snapshot_every: int = 1000):
+        self.root = root
+        self.batch = batch_ms / 1000
+        self.snapshot_every = snapshot_every
+        self.state: dict[str, dict] = {}   # pair -> {"long", "short", "opened_ts", "pending"}
+        self.seq = 0
+        self._since_snapshot = 0
+        self._buffer: list[str] = []
+        self._flush_handle: asyncio.TimerHandle = None
+        self._flush_lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task] = set()
+
+        os.makedirs(root, exist_ok=True)
+        self.log_path = os.path.join(root, "journal.log")
+        self.snapshot_path = os.path.join(root, "snapshot.json")
+        self._replay()
+        self._file = open(self.log_path, "a")
+
+    def _replay(self):
+        started = time.perf_counter()
+        snapshot_seq = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path) as f:
+                snapshot = json.load(f)
+            self.state = snapshot["pairs"]
+            self.seq = snapshot_seq = snapshot["seq"]
+        replayed = 0
+        if os.path.exists(self.log_path):
+            with open(self.log_path) as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A torn final line from a crash mid-write; everything before it is intact
+                        log(f"[WARN] Skipping unreadable journal record: {line[:80]!r}")
+                        continue
+                    if record["seq"] > snapshot_seq:
+                        self._apply(record)
+                        self.seq = record["seq"]
+                        replayed += 1
+        self._since_snapshot = replayed
+        log(f"Journal replayed snapshot@{snapshot_seq} + {replayed} records for {len(self.state)} pairs "
+            f"in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    def _apply(self, record: dict):
+        state = self.state.setdefault(record["pair"], {"long": None, "short": None, "opened_ts": None, "pending": None})
+        if record["kind"] == "intent":
+            state["pending"] = record
+        elif record["kind"] == "position":
+            state["long"] = record["long"]
+            state["short"] = record["short"]
+            state["opened_ts"] = record.get("opened_ts")
+            state["pending"] = None
+
+    def append(self, pair: str, kind: str, **fields):
+        self.seq += 1
+        record = {"seq": self.seq, "ts": time.time(), "pair": pair, "kind": kind, **fields}
+        self._apply(record)
+        self._buffer.append(json.dumps(record, separators=(",", ":")) + "\n")
+        self._since_snapshot += 1
+        if self._flush_handle is None:
+            loop = asyncio.get_running_loop()
+            self._flush_handle = loop.call_later(self.batch, self._schedule_flush)
+
+    def _schedule_flush(self):
+        self._flush_handle = None
+        task = asyncio.ensure_future(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self):
+        """Write and fsync every buffered record, compacting if the log has grown long enough"""
+        async with self._flush_lock:
+            if not self._buffer:
+                return
+            lines, self._buffer = self._buffer, []
+            snapshot = None
+            if self._since_snapshot >= self.snapshot_every:
+                # Taken together with the buffer swap, so it covers exactly the records being written
+                snapshot = json.dumps({"seq": self.seq, "pairs": self.state}, separators=(",", ":"))
+                self._since_snapshot = 0
+            await asyncio.get_running_loop().run_in_executor(None, self._write, lines, snapshot)
+
+    def _write(self, lines: list[str], snapshot: str):
+        self._file.write("".join(lines))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        if snapshot is None:
+            return
+        with open(self.snapshot_path + ".tmp", "w") as f:
+            f.write(snapshot)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(self.snapshot_path + ".tmp", self.snapshot_path)
+        self._file.truncate(0)
+        self._file.seek(0)
+
+    async def close(self):
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        await self.flush()
+        self._file.close()
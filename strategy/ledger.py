@@ -0,0 +1,255 @@
+import json, os, time
+import numpy as np
+from decimal import Decimal
+from models.order import Order, Side
+
+SCALE = 10 ** 8
+ENTRY, EXIT = 0, 1
+DTYPES = {
+    "ts": np.float64,       # epoch seconds
+    "cycle": np.int64,
+    "pair": np.int16,
+    "exchange": np.int8,    # index into Ledger.venues
+    "side": np.int8,        # +1 buy, -1 sell
+    "kind": np.int8,        # ENTRY or EXIT
+    "price": np.int64,      # fill price * SCALE
+    "size": np.int64,       # base size * SCALE
+    "ref_price": np.int64,  # decision price * SCALE
+    "fee": np.int64,        # reported or estimated fee in quote * SCALE
+}
+
+def _fixed(value: Decimal) -> int:
+    return int(Decimal(value).scaleb(8).to_integral_value())
+
+class Ledger:
+    """
+    Every entry and exit Order of every pair, stored column-wise in typed NumPy arrays.
+
+    Prices and sizes are fixed-point int64 (value * 10^8), side is +1 buy / -1 sell,
+    exchange and pair are small integer codes, and each row carries the price the
+    strategy decided on (ref_price), so slippage is the fill's distance from it.
+    The rows of one position lifecycle (its entries and exits) share a cycle id.
+
+    Analytics are whole-array operations (bincount, cumsum, percentile), so they run
+    over millions of cycles without a Python object per row. fee_bps maps exchange
+    name to the taker fee behind the fee estimates, used for orders that carry no
+    reported fee (Order.fee).
+    """
+    def __init__(self, capacity: int = 1024, fee_bps: dict[str, float] = None, clock=time.time):
+        self.clock = clock  # Epoch seconds; the virtual clock when backtesting
+        self.columns = {name: np.empty(capacity, dtype) for name, dtype in DTYPES.items()}
+        self.n = 0
+        self.cycles = 0
+        self.pairs: list[str] = []
+        self._pair_codes: dict[str, int] = {}
+        self.venues: list[str] = []
+        self._venue_codes: dict[str, int] = {}
+        self._fee_rates: list[Decimal] = []
+        self.fee_bps = fee_bps or {}
+
+    def __len__(self) -> int:
+        return self.n
+
+    def _reserve(self, rows: int):
+        capacity = len(self.columns["ts"])
+        if self.n + rows <= capacity:
+            return
+        capacity = max(capacity * 2, self.n + rows)
+        for name, column in self.columns.items():
+            grown = np.empty(capacity, column.dtype)
+            grown[:self.n] = column[:self.n]
+            self.columns[name] = grown
+
+    def pair_code(self, pair: str) -> int:
+        code = self._pair_codes.get(pair)
+        if code is None:
+            code = self._pair_codes[pair] = len(self.pairs)
+            self.pairs.append(pair)
+        return code
+
+    def venue_code(self, venue: str) -> int:
+        code = self._venue_codes.get(venue)
+        if code is None:
+            code = self._venue_codes[venue] = len(self.venues)
+            self.venues.append(venue)
+            self._fee_rates.append(Decimal(str(self.fee_bps.get(venue, 0))) / 10000)
+        return code
+
+    def next_cycle(self) -> int:
+        """Id for a new position lifecycle; its entries and exits are recorded under it"""
+        self.cycles += 1
+        return self.cycles - 1
+
+    def record(self, pair: str, cycle: int, kind: int, order: Order, ref_price: Decimal, traded: Decimal = None):
+        """
+        Add one fill. traded is the size that actually went to the venue when it differs from
+        order.size, as for the netting legs rebalance_at() books as closed and reopened.
+        """
+        self._reserve(1)
+        i = self.n
+        c = self.columns
+        c["ts"][i] = self.clock()
+        c["cycle"][i] = cycle
+        c["pair"][i] = self.pair_code(pair)
+        c["exchange"][i] = venue = self.venue_code(order.asset.exchange.value)
+        c["side"][i] = 1 if order.side == Side.LONG else -1
+        c["kind"][i] = kind
+        c["price"][i] = _fixed(order.price)
+        c["size"][i] = _fixed(order.size)
+        c["ref_price"][i] = _fixed(ref_price)
+        if order.fee is not None:
+            c["fee"][i] = _fixed(order.fee)
+        else:
+            c["fee"][i] = _fixed(order.price * (order.size if traded is None else traded) * self._fee_rates[venue])
+        self.n += 1
+
+    def extend(self, **columns: np.ndarray):
+        """Bulk-append rows given as arrays, one per column, with pair and exchange codes from pair_code()/venue_code()"""
+        rows = len(columns["ts"])
+        self._reserve(rows)
+        for name, dtype in DTYPES.items():
+            self.columns[name][self.n:self.n + rows] = np.asarray(columns[name], dtype)
+        self.n += rows
+        self.cycles = max(self.cycles, int(self.columns["cycle"][:self.n].max()) + 1 if self.n else 0)
+
+    def col(self, name: str) -> np.ndarray:
+        return self.columns[name][:self.n]
+
+    def save(self, path: str):
+        """Write every column to an .npz file, via a temporary file renamed into place"""
+        with open(path + ".tmp", "wb") as f:
+            np.savez(f, pairs=np.array(self.pairs), venues=np.array(self.venues), fee_bps=np.array(json.dumps(self.fee_bps)),
+                     **{name: self.col(name) for name in DTYPES})
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path: str, fee_bps: dict[str, float] = None, clock=time.time) -> "Ledger":
+        """A ledger holding the saved rows; fee_bps replaces the saved fee rates for new rows when given"""
+        data = np.load(path)
+        ledger = cls(max(len(data["ts"]), 1024), fee_bps or json.loads(str(data["fee_bps"])), clock)
+        for pair in data["pairs"]:
+            ledger.pair_code(str(pair))
+        for venue in data["venues"]:
+            ledger.venue_code(str(venue))
+        ledger.extend(**{name: data[name] for name in DTYPES})
+        return ledger
+
+    # --- Analytics --------------------------------------------------------------
+
+    def _float(self, name: str) -> np.ndarray:
+        return self.col(name) / SCALE
+
+    def notional(self) -> np.ndarray:
+        return self._float("price") * self._float("size")
+
+    def fees(self) -> np.ndarray:
+        """Reported or estimated fee per row"""
+        return self._float("fee")
+
+    def _closed_cycles(self) -> tuple[np.ndarray, np.ndarray]:
+        """(cycle ids, close times) of the cycles that have exits, in closing order"""
+        cycle = self.col("cycle")
+        is_exit = self.col("kind") == EXIT
+        closed_at = np.full(self.cycles, -np.inf)
+        np.maximum.at(closed_at, cycle[is_exit], self.col("ts")[is_exit])
+        closed = np.flatnonzero(np.isfinite(closed_at))
+        closed = closed[np.argsort(closed_at[closed], kind="stable")]
+        return closed, closed_at[closed]
+
+    def cycle_pnl(self, net: bool = False) -> tuple[np.ndarray, np.ndarray]:
+        """(close time, PnL) of every closed cycle in closing order; net subtracts fees"""
+        cash = -self.col("side") * self.notional()
+        if net:
+            cash = cash - self.fees()
+        pnl = np.bincount(self.col("cycle"), weights=cash, minlength=self.cycles)
+        closed, closed_at = self._closed_cycles()
+        return closed_at, pnl[closed]
+
+    def cumulative_pnl(self, net: bool = False) -> np.ndarray:
+        return np.cumsum(self.cycle_pnl(net)[1])
+
+    def rolling_pnl(self, window: int, net: bool = False) -> np.ndarray:
+        """PnL over the last `window` closed cycles, at each closed cycle"""
+        cumulative = np.concatenate(([0.0], self.cumulative_pnl(net)))
+        return cumulative[1:] - cumulative[np.maximum(np.arange(1, len(cumulative)) - window, 0)]
+
+    def max_drawdown(self, net: bool = False) -> float:
+        cumulative = np.concatenate(([0.0], self.cumulative_pnl(net)))
+        return float(np.max(np.maximum.accumulate(cumulative) - cumulative))
+
+    def sharpe(self, net: bool = False) -> float:
+        """Annualized Sharpe of per-cycle returns on the long leg's entry notional, at the median cycle spacing"""
+        closed_at, pnl = self.cycle_pnl(net)
+        if len(pnl) < 3:
+            return 0.0
+        long_entry = (self.col("kind") == ENTRY) & (self.col("side") == 1)
+        notional = np.bincount(self.col("cycle")[long_entry], weights=self.notional()[long_entry], minlength=self.cycles)
+        notional = notional[self._closed_cycles()[0]]
+        returns = pnl[notional > 0] / notional[notional > 0]
+        spacing = np.median(np.diff(closed_at))
+        if len(returns) < 2 or returns.std() == 0 or spacing <= 0:
+            return 0.0
+        return float(returns.mean() / returns.std() * np.sqrt(365 * 24 * 3600 / spacing))
+
+    def entry_delta(self) -> np.ndarray:
+        """Long minus short entry notional per cycle that has entries"""
+        entry = self.col("kind") == ENTRY
+        cycle = self.col("cycle")[entry]
+        delta = np.bincount(cycle, weights=(self.col("side")[entry] * self.notional()[entry]), minlength=self.cycles)
+        return delta[np.bincount(cycle, minlength=self.cycles) > 0]
+
+    def slippage_bps(self) -> np.ndarray:
+        """Per row: how much worse than the decision price the fill was, in bps (negative = better)"""
+        ref = self._float("ref_price")
+        return self.col("side") * (self._float("price") - ref) / ref * 10000
+
+    def spread_bps(self) -> tuple[np.ndarray, np.ndarray]:
+        """(decided, filled) entry spread per cycle: short price minus long price over their mean, in bps"""
+        entry = self.col("kind") == ENTRY
+        cycle = self.col("cycle")[entry]
+        side = self.col("side")[entry]
+        result = []
+        for prices in (self._float("ref_price")[entry], self._float("price")[entry]):
+            signed = np.bincount(cycle, weights=-side * prices, minlength=self.cycles)
+            total = np.bincount(cycle, weights=prices, minlength=self.cycles)
+            legs = np.bincount(cycle, minlength=self.cycles)
+            both = legs >= 2
+            result.append(signed[both] / (total[both] / legs[both]) * 10000)
+        return result[0], result[1]
+
+    def fill_quality(self) -> dict[str, dict[str, float]]:
+        """Per venue: fills, mean/p50/p95 slippage in bps and the share of fills worse than decided"""
+        slippage = self.slippage_bps()
+        exchange = self.col("exchange")
+        quality = {}
+        for code in np.unique(exchange):
+            s = slippage[exchange == code]
+            quality[self.venues[code]] = {
+                "fills": int(len(s)),
+                "mean_bps": float(s.mean()),
+                "p50_bps": float(np.percentile(s, 50)),
+                "p95_bps": float(np.percentile(s, 95)),
+                "adverse": float(np.mean(s > 0)),
+            }
+        return quality
+
+    def summary(self) -> list[str]:
+        if self.n == 0:
+            return ["ledger empty"]
+        _, gross = self.cycle_pnl()
+        _, net = self.cycle_pnl(net=True)
+        fees = float(self.fees().sum())
+        decided, filled = self.spread_bps()
+        delta = self.entry_delta()
+        lines = [
+            f"{len(gross)} closed cycles, {self.n} fills: gross PnL ${gross.sum():.4f}, fees ${fees:.4f}, "
+            f"net PnL ${net.sum():.4f}, max drawdown ${self.max_drawdown(net=True):.4f}, Sharpe {self.sharpe(net=True):.2f}",
+        ]
+        if len(decided):
+            lines.append(f"entry spread: decided {decided.mean():.2f} bps, filled {filled.mean():.2f} bps, "
+                         f"slippage {(decided - filled).mean():.2f} bps | entry delta mean ${delta.mean():.4f}, "
+                         f"p95 |delta| ${np.percentile(np.abs(delta), 95):.4f}")
+        for venue, q in self.fill_quality().items():
+            lines.append(f"{venue} fills {q['fills']}: slippage mean {q['mean_bps']:.2f} bps, p50 {q['p50_bps']:.2f}, "
+                         f"p95 {q['p95_bps']:.2f}, adverse {q['adverse']:.0%}")
+        return lines
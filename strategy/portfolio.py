@@ -0,0 +1,153 @@
+import asyncio
+from exchanges.base import Exchange
+from strategy.delta_neutral import DeltaNeutralStrategy
+from strategy.journal import Journal
+from strategy.ledger import Ledger
+from strategy.routing import PriceMatrix
+from utils.logger import log
+
+def pair_configs(cfg) -> list[dict]:
+    """
+    Expand config.yaml into one config per pair.
+    Pairs come from the `pairs` list; each entry inherits `notional`, `interval_minutes`,
+    `quote_asset`, `min_spread_bps`, `netting`, `execution`, `trigger` and `venues`
+    from the top level unless it sets its own. A config with only a top-level
+    `base_asset` is treated as a single pair.
+    """
+    inherited = ("quote_asset", "notional", "interval_minutes", "min_spread_bps", "netting", "execution", "trigger", "venues")
+    defaults = {key: cfg[key] for key in inherited if key in cfg}
+    pairs = cfg.get("pairs") or [{"base_asset": cfg["base_asset"]}]
+    return [{**defaults, **pair} for pair in pairs]
+
+class Portfolio:
+    """
+    Runs one DeltaNeutralStrategy per configured pair in a single event loop.
+    Every pair keeps its own positions, while the exchange connections, the
+    market data feeds, the price matrix and the scheduler are shared.
+    """
+    def __init__(self, exchanges: list[Exchange], cfg, journal: Journal = None, ledger: Ledger = None):
+        self.exchanges = exchanges
+        self.journal = journal
+        # Resume positions the journal does not know (e.g. opened by hand) instead of refusing the pair
+        self.adopt_unknown = cfg.get("journal", {}).get("adopt_unknown", False)
+        self.ledger = ledger
+        self.strategies = [DeltaNeutralStrategy(exchanges, pair_cfg) for pair_cfg in pair_configs(cfg)]
+        self.matrix = PriceMatrix([str(s.pair) for s in self.strategies], [ex.name for ex in exchanges])
+        for row, strategy in enumerate(self.strategies):
+            strategy.journal = journal
+            strategy.ledger = ledger
+            strategy.matrix = self.matrix
+            strategy.matrix_row = row
+            strategy.matrix_cols = [self.matrix.cols[ex.name] for ex in strategy.venues]
+
+    async def initialize(self):
+        results = await asyncio.gather(*(s.initialize() for s in self.strategies), return_exceptions=True)
+        ready = []
+        for strategy, result in zip(self.strategies, results):
+            if isinstance(result, Exception):
+                log(f"[ERROR] Skipping {strategy.pair}: {result}")
+            else:
+                ready.append(strategy)
+        if not ready:
+            raise Exception("No pair could be initialized")
+        self.strategies = ready
+        if self.journal:
+            await self.restore()
+
+    async def restore(self, attempts: int = 3, delay: float = 1.0):
+        """
+        Reconcile the journal with the positions the exchanges hold and resume them without
+        trading. A venue whose positions cannot be read after attempts tries, and a pair the
+        exchanges disagree with (see DeltaNeutralStrategy.restore), is left out with an
+        error rather than stopping the other pairs.
+        """
+        live = {}
+        for attempt in range(1, attempts + 1):
+            pending = [ex for ex in self.exchanges if ex.name not in live]
+            results = await asyncio.gather(*(ex.live_positions() for ex in pending), return_exceptions=True)
+            for ex, result in zip(pending, results):
+                if isinstance(result, Exception):
+                    log(f"[WARN] Reading {ex.name.value} positions failed (attempt {attempt}/{attempts}): {result}")
+                else:
+                    live[ex.name] = result
+            if len(live) == len(self.exchanges):
+                break
+            if attempt < attempts:
+                await asyncio.sleep(delay * 2 ** (attempt - 1))
+
+        ready = []
+        for strategy in self.strategies:
+            unknown = [ex.name.value for ex in strategy.venues if ex.name not in live]
+            if unknown:
+                log(f"[ERROR] Skipping {strategy.pair}: could not read its positions on {', '.join(unknown)}")
+                continue
+            try:
+                strategy.restore(self.journal.state.get(str(strategy.pair)), live, self.adopt_unknown)
+            except Exception as e:
+                log(f"[ERROR] Skipping {strategy.pair}: {e}")
+                continue
+            ready.append(strategy)
+        if not ready:
+            raise Exception("No pair could be reconciled with the exchanges")
+        self.strategies = ready
+
+    async def run(self, max_runtime: float):
+        """Cycle every pair on its own interval until max_runtime seconds have passed"""
+        end_time = asyncio.get_running_loop().time() + max_runtime
+        await asyncio.gather(*(self._run_pair(s, end_time) for s in self.strategies))
+
+    async def _run_pair(self, strategy: DeltaNeutralStrategy, end_time: float):
+        if strategy.trigger:
+            return await self._run_pair_on_updates(strategy, end_time)
+        loop = asyncio.get_running_loop()
+        while loop.time() < end_time:
+            try:
+                await strategy.cycle()
+                log(f"{strategy.pair} waiting {strategy.interval / 60:g} minutes...\n")
+            except Exception as e:
+                log(f"[ERROR] {strategy.pair} cycle failed: {e}")
+            await asyncio.sleep(max(min(strategy.interval, end_time - loop.time()), 0))
+
+    async def _run_pair_on_updates(self, strategy: DeltaNeutralStrategy, end_time: float):
+        """
+        Re-evaluate the spread whenever a venue streams a new price for the pair.
+        Each update goes into the price matrix first; a flat pair is only woken when its best
+        spread across all venues reaches entry_bps, an open one on every update to check the exit.
+        Without feeds (or if they go quiet) it falls back to polling every poll_seconds.
+        Updates that arrive while an evaluation is running are coalesced into one.
+        """
+        loop = asyncio.get_running_loop()
+        updated = asyncio.Event()
+        row = strategy.matrix_row
+
+        def on_quote(col: int):
+            def callback(symbol, quote):
+                self.matrix.update(row, col, quote.mid)
+                if strategy.last_long_order or strategy.last_short_order or self.matrix.best(row)[2] >= strategy.entry_bps:
+                    updated.set()
+            return callback
+
+        streaming = [ex.on_price(asset, on_quote(col)) for ex, asset, col in zip(strategy.venues, strategy.assets, strategy.matrix_cols)]
+        mode = "price updates" if all(streaming) else f"polling every {strategy.poll_seconds}s"
+        log(f"{strategy.pair} trading on spread: entry {strategy.entry_bps} bps, exit {strategy.exit_bps} bps, "
+            f"min hold {strategy.min_hold}s ({mode})")
+
+        while loop.time() < end_time:
+            try:
+                await asyncio.wait_for(updated.wait(), timeout=max(min(strategy.poll_seconds, end_time - loop.time()), 0))
+            except asyncio.TimeoutError:
+                pass
+            updated.clear()
+            try:
+                await strategy.evaluate_spread()
+            except Exception as e:
+                log(f"[ERROR] {strategy.pair} spread evaluation failed: {e}")
+                await asyncio.sleep(strategy.poll_seconds)
+
+    async def close_positions(self):
+        """Close every pair that still holds positions, concurrently"""
+        open_strategies = [s for s in self.strategies if s.last_long_order or s.last_short_order]
+        results = await asyncio.gather(*(s.close_positions() for s in open_strategies), return_exceptions=True)
+        for strategy, result in zip(open_strategies, results):
+            if isinstance(result, Exception):
+                log(f"[ERROR] Failed to close {strategy.pair} positions on shutdown: {result}")
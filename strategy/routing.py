@@ -0,0 +1,54 @@
+import numpy as np
+from decimal import Decimal
+from models.asset import ExchangeName
+
+def route(prices: list[Decimal]) -> tuple[int, int]:
+    """
+    Indices of the cheapest venue (to go long) and the richest (to go short), in one pass.
+    Ties go long on the later venue and short on the earlier one, so with two or more venues
+    the two always differ, and two venues behave exactly like a `price_A < price_B` comparison.
+    """
+    long_i = short_i = 0
+    for i, price in enumerate(prices):
+        if price <= prices[long_i]:
+            long_i = i
+        if price > prices[short_i]:
+            short_i = i
+    return long_i, short_i
+
+class PriceMatrix:
+    """
+    Latest price of every pair on every venue, as one pairs x venues float64 array
+    (NaN until a venue has been seen). Strategies write the prices they fetch and, in
+    event-driven mode, every streamed quote into it. best() finds a pair's cheapest and
+    richest venue with one pass over its row, so a streamed update is judged in O(venues)
+    without waiting for the other venues to be fetched again.
+    """
+    def __init__(self, pairs: list[str], venues: list[ExchangeName]):
+        self.rows = {pair: i for i, pair in enumerate(pairs)}
+        self.cols = {venue: j for j, venue in enumerate(venues)}
+        self.prices = np.full((len(pairs), len(venues)), np.nan)
+
+    def update(self, row: int, col: int, price: Decimal):
+        self.prices[row, col] = float(price)
+
+    def update_row(self, row: int, cols: list[int], prices: list[Decimal]):
+        self.prices[row, cols] = [float(p) for p in prices]
+
+    def best(self, row: int) -> tuple[int, int, float]:
+        """(long col, short col, spread bps) for a pair over the venues it has prices for, (-1, -1, 0) below two"""
+        prices = self.prices[row].tolist()
+        long_j = short_j = -1
+        seen = 0
+        for j, price in enumerate(prices):
+            if price != price:   # NaN, not seen yet
+                continue
+            seen += 1
+            if long_j < 0 or price <= prices[long_j]:
+                long_j = j
+            if short_j < 0 or price > prices[short_j]:
+                short_j = j
+        if seen < 2:
+            return -1, -1, 0.0
+        low, high = prices[long_j], prices[short_j]
+        return long_j, short_j, (high - low) / ((high + low) / 2) * 10000
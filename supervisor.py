@@ -0,0 +1,302 @@
+import asyncio, math, multiprocessing, os, signal, sys, time, yaml
+from exchanges import registry
+from exchanges.metadata import MetadataCache
+from market_data.board import BoardFeed, PriceBoard
+from market_data.recorder import TickRecorder
+from models.asset import TradingPair
+from strategy.journal import Journal
+from strategy.ledger import Ledger
+from strategy.portfolio import Portfolio, pair_configs
+from utils import logger, metrics, profiler
+from utils.logger import log
+
+def shard_path(path: str, name: str) -> str:
+    """bot.log -> bot.shard-2.log, so every process keeps its own files"""
+    root, ext = os.path.splitext(path)
+    return f"{root}.{name}{ext}"
+
+def process_logging(cfg: dict, name: str) -> dict:
+    logging_cfg = dict(cfg.get("logging", {}))
+    for key, default in (("file", logger.LOG_FILE), ("jsonl_file", logger.JSONL_FILE)):
+        path = logging_cfg.get(key, default)
+        if path:
+            logging_cfg[key] = shard_path(path, name)
+    return logging_cfg
+
+def attach_metadata(cfg: dict, exchanges: list):
+    metadata = cfg.get("metadata", {})
+    if metadata.get("enabled", True):
+        cache = MetadataCache(metadata.get("dir", "metadata"), metadata.get("ttl_hours", 24) * 3600)
+        for ex in exchanges:
+            ex.metadata = cache
+
+async def stop_on_sigterm() -> asyncio.Event:
+    """Event set on SIGTERM, so the supervisor can stop a process through its finally blocks"""
+    stop = asyncio.Event()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+    return stop
+
+async def publish(cfg: dict, board_name: str, ready):
+    """Market-data process: stream every configured pair on every venue into the price board"""
+    logger.configure(process_logging(cfg, "market-data"))
+    board = PriceBoard(board_name)
+    exchanges = []
+    feeds = []
+    recorder = None
+    try:
+        stop = await stop_on_sigterm()
+        exchanges = registry.create_all(cfg)
+        attach_metadata(cfg, exchanges)
+        market_data = cfg.get("market_data", {})
+        record = market_data.get("record")
+        if record:
+            recorder = TickRecorder(record.get("dir", "ticks"), record.get("segment_ticks", 1 << 20))
+
+        for ex in exchanges:
+            ex.feed = ex.create_feed(market_data.get("max_price_age_ms", 2000))
+            if not ex.feed:
+                log(f"[WARN] {ex.name.value} has no market data stream, shard workers will poll it over REST")
+                continue
+            feeds.append(ex.feed)
+            venue = ex.name.value
+
+            def write(symbol, quote, venue=venue):
+                board.write(board.slot(f"{venue}:{symbol}", allocate=True),
+                            math.nan if quote.bid is None else float(quote.bid),
+                            math.nan if quote.ask is None else float(quote.ask), float(quote.mid), quote.ts)
+            ex.feed.cache.add_listener(None, write)
+            if recorder:
+                ex.feed.cache.add_listener(None, recorder.listener(venue))
+
+        # Initializing here also warms the metadata cache the workers start from
+        await asyncio.gather(*(ex.initialize() for ex in exchanges))
+        for pair_cfg in pair_configs(cfg):
+            pair = TradingPair(pair_cfg["base_asset"], pair_cfg["quote_asset"])
+            for ex in exchanges:
+                try:
+                    await ex.watch(await ex.get_asset_info(pair))
+                except Exception as e:
+                    log(f"[WARN] Not publishing {pair} on {ex.name.value}: {e}")
+        await asyncio.gather(*(feed.start() for feed in feeds))
+        log(f"Publishing {len(pair_configs(cfg))} pairs from {len(feeds)} venues to price board {board.name}")
+        ready.set()
+        await stop.wait()
+    finally:
+        await asyncio.gather(*(feed.stop() for feed in feeds), return_exceptions=True)
+        await asyncio.gather(*(ex.close() for ex in exchanges), return_exceptions=True)
+        if recorder:
+            recorder.close()
+        board.close()
+        logger.shutdown()
+
+async def work(cfg: dict, shard: int, workers: int, pairs: list[dict], board_name: str, deadline: float) -> bool:
+    """
+    Shard worker: the pairs of one shard in a Portfolio, like main.py, with prices read
+    from the price board. The journal and ledger are per shard, so a restarted worker
+    resumes exactly the positions its predecessor held. Returns False if it failed.
+    """
+    name = f"shard-{shard}"
+    logger.configure(process_logging(cfg, name))
+    board = PriceBoard(board_name)
+    exchanges = []
+    feeds = []
+    journal = None
+    ledger = None
+    try:
+        stop = await stop_on_sigterm()
+        supervisor = cfg.get("supervisor", {})
+        exchanges = registry.create_all(cfg)
+        attach_metadata(cfg, exchanges)
+        profiling = cfg.get("profiling", {})
+        profiler.start({**profiling, "dir": os.path.join(profiling.get("dir", "profiles"), name)})
+        for ex in exchanges:
+            ex.feed = BoardFeed(board, ex.name.value, cfg.get("market_data", {}).get("max_price_age_ms", 2000),
+                                supervisor.get("poll_ms", 5))
+            feeds.append(ex.feed)
+            # All workers trade on the same accounts, so each gets an equal share of the rate limits
+            if ex.limiter:
+                ex.limiter.scale(1 / workers)
+
+        journal_cfg = cfg.get("journal", {})
+        if journal_cfg.get("enabled", True):
+            journal = Journal(os.path.join(journal_cfg.get("dir", "journal"), name), journal_cfg.get("batch_ms", 50),
+                              journal_cfg.get("snapshot_every", 1000))
+        ledger_cfg = cfg.get("ledger", {})
+        if ledger_cfg.get("enabled", True):
+            ledger_path = shard_path(ledger_cfg.get("path", "ledger.npz"), name)
+            fee_bps = ledger_cfg.get("fee_bps", {"Hyperliquid": 4.5, "Binance": 5.0})
+            ledger = Ledger.load(ledger_path, fee_bps) if os.path.exists(ledger_path) else Ledger(fee_bps=fee_bps)
+
+        portfolio = Portfolio(exchanges, {**cfg, "pairs": pairs}, journal, ledger)
+        await asyncio.gather(*(ex.initialize() for ex in exchanges))
+        await portfolio.initialize()
+        await asyncio.gather(*(feed.start() for feed in feeds))
+        log(f"{name} trading {', '.join(str(s.pair) for s in portfolio.strategies)} (pid {os.getpid()})")
+
+        # Runs to the supervisor's deadline; SIGTERM stops early and leaves positions to the journal
+        run = asyncio.ensure_future(portfolio.run(max(deadline - time.time(), 0)))
+        stopped = asyncio.ensure_future(stop.wait())
+        await asyncio.wait([run, stopped], return_when=asyncio.FIRST_COMPLETED)
+        if not run.done():
+            run.cancel()
+            log(f"{name} stopped, open positions stay in the journal")
+            return True
+        stopped.cancel()
+        log(f"{name} reached the runtime limit, closing positions")
+        await portfolio.close_positions()
+        return True
+    except Exception as e:
+        log(f"[ERROR] {name} failed: {e}")
+        return False
+    finally:
+        profiler.stop()
+        await asyncio.gather(*(feed.stop() for feed in feeds), return_exceptions=True)
+        await asyncio.gather(*(ex.close() for ex in exchanges), return_exceptions=True)
+        if journal:
+            await journal.close()
+        if ledger is not None:
+            ledger.save(ledger_path)
+            for line in ledger.summary():
+                log(f"[LEDGER] {line}")
+        for line in metrics.summary():
+            log(f"[METRICS] {line}")
+        board.close()
+        logger.shutdown()
+
+def run_market_data(cfg: dict, board_name: str, ready):
+    asyncio.run(publish(cfg, board_name, ready))
+
+def run_worker(cfg: dict, shard: int, workers: int, pairs: list[dict], board_name: str, deadline: float):
+    if not asyncio.run(work(cfg, shard, workers, pairs, board_name, deadline)):
+        sys.exit(1)
+
+class Supervisor:
+    """
+    Runs the configured pairs across worker processes instead of one event loop.
+
+    One market-data process owns the WebSocket streams and publishes every quote into a
+    shared-memory PriceBoard. The pairs are split round-robin into `workers` shards, each
+    a separate process (spawned, not forked) running its own Portfolio that reads prices
+    straight from the board. JSON parsing, signing and the blocking Hyperliquid SDK then
+    run on as many cores as there are workers.
+
+    A worker that exits with an error is restarted after restart_delay_seconds, up to
+    max_restarts times. Its journal (journal/shard-<n>) and the exchanges' live positions
+    let the new process resume what the old one held. Shards are assigned by position in
+    `pairs`, so keep the list and `workers` unchanged while positions are open. A crashed
+    market-data process is restarted the same way; meanwhile, and after it has used up
+    its restarts, workers fall back to REST prices.
+    """
+    def __init__(self, cfg: dict):
+        self.cfg = cfg
+        supervisor = cfg.get("supervisor", {})
+        pairs = pair_configs(cfg)
+        self.workers = max(min(supervisor.get("workers") or os.cpu_count(), len(pairs)), 1)
+        self.shards = [pairs[i::self.workers] for i in range(self.workers)]
+        self.restart_delay = supervisor.get("restart_delay_seconds", 1)
+        self.max_restarts = supervisor.get("max_restarts", 5)
+        self.startup_timeout = supervisor.get("startup_timeout_seconds", 60)
+        self.shutdown_timeout = supervisor.get("shutdown_timeout_seconds", 30)
+        self.board_slots = supervisor.get("board_slots", 1024)
+        self.deadline = time.time() + cfg.get("max_runtime_minutes", 30) * 60
+        self.ctx = multiprocessing.get_context("spawn")
+        self.board: PriceBoard = None
+        self.publisher = None
+        self.processes: dict[int, multiprocessing.Process] = {}
+        self.restarts = [0] * self.workers
+        self.publisher_restarts = 0
+
+    def _start_publisher(self):
+        ready = self.ctx.Event()
+        self.publisher = self.ctx.Process(target=run_market_data, args=(self.cfg, self.board.name, ready), name="market-data")
+        self.publisher.start()
+        return ready
+
+    def _start_worker(self, shard: int):
+        process = self.ctx.Process(target=run_worker, name=f"shard-{shard}",
+                                   args=(self.cfg, shard, self.workers, self.shards[shard], self.board.name, self.deadline))
+        process.start()
+        self.processes[shard] = process
+        log(f"Started shard-{shard} (pid {process.pid}): {', '.join(p['base_asset'] for p in self.shards[shard])}")
+
+    def run(self):
+        self.board = PriceBoard(slots=self.board_slots, create=True)
+        try:
+            if not self._start_publisher().wait(self.startup_timeout):
+                log(f"[WARN] Market data not ready after {self.startup_timeout}s, starting workers anyway")
+            for shard in range(self.workers):
+                self._start_worker(shard)
+            while self.processes:
+                time.sleep(1)
+                self._check()
+            log("All shards finished")
+        except KeyboardInterrupt:
+            log("Interrupted, stopping shards")
+        finally:
+            self._stop()
+
+    def _check(self):
+        if self.publisher and not self.publisher.is_alive():
+            exitcode = self.publisher.exitcode
+            if time.time() >= self.deadline:
+                log(f"[ERROR] Market data process exited with code {exitcode} after the runtime limit, not restarting")
+                self.publisher = None
+            elif self.publisher_restarts >= self.max_restarts:
+                log(f"[ERROR] Market data process exited with code {exitcode}, giving up after {self.max_restarts} restarts; "
+                    f"workers use REST prices")
+                self.publisher = None
+            else:
+                self.publisher_restarts += 1
+                log(f"[WARN] Market data process exited with code {exitcode}, restart {self.publisher_restarts}/{self.max_restarts} "
+                    f"in {self.restart_delay}s")
+                time.sleep(self.restart_delay)
+                self._start_publisher()
+        for shard, process in list(self.processes.items()):
+            if process.is_alive():
+                continue
+            del self.processes[shard]
+            if process.exitcode == 0:
+                log(f"shard-{shard} finished")
+            elif time.time() >= self.deadline:
+                log(f"[ERROR] shard-{shard} exited with code {process.exitcode} after the runtime limit, not restarting")
+            elif self.restarts[shard] >= self.max_restarts:
+                log(f"[ERROR] shard-{shard} exited with code {process.exitcode}, giving up after {self.max_restarts} restarts")
+            else:
+                self.restarts[shard] += 1
+                log(f"[WARN] shard-{shard} exited with code {process.exitcode}, restart {self.restarts[shard]}/{self.max_restarts} "
+                    f"in {self.restart_delay}s")
+                time.sleep(self.restart_delay)
+                self._start_worker(shard)
+
+    def _stop(self):
+        # Workers get SIGTERM first and stop through their finally blocks; stragglers are killed
+        processes = list(self.processes.values()) + ([self.publisher] if self.publisher else [])
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join(self.shutdown_timeout)
+            if process.is_alive():
+                log(f"[WARN] {process.name} did not stop within {self.shutdown_timeout}s, killing it")
+                process.kill()
+                process.join()
+        self.board.close(unlink=True)
+
+def main():
+    try:
+        cfg = yaml.safe_load(open("config.yaml"))
+    except FileNotFoundError:
+        log("[ERROR] config.yaml not found. Please create the config file.")
+        return
+    logger.configure(process_logging(cfg, "supervisor"))
+    supervisor = Supervisor(cfg)
+    log(f"Running {sum(len(s) for s in supervisor.shards)} pairs on {supervisor.workers} worker processes")
+    try:
+        supervisor.run()
+    except Exception as e:
+        log(f"[ERROR] Supervisor failed: {e}")
+    finally:
+        logger.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,111 @@
+import atexit, json, queue, sys, threading, time
 from datetime import datetime
+from enum import Enum
 
-LOG_FILE = "bot.log"
+LOG_FILE = "bot.log"          # Human-readable log, None to disable
+JSONL_FILE = None             # Optional machine-readable log, one JSON object per line
+CONSOLE = True                # Echo log lines to stdout
+FLUSH_INTERVAL = 0.25         # Seconds between flushes of a partial batch
+BATCH_SIZE = 256              # Flush as soon as this many records are queued
 
-def log(msg: str):
-    ts = datetime.now().strftime("[%H:%M:%S]")
-    log_msg = f"{ts} {msg}"
-    print(log_msg)
-    
-    # Append to log file
-    with open(LOG_FILE, "a", encoding="utf-8") as f:
-        f.write(log_msg + "\n")
+_queue = queue.SimpleQueue()
+_writer: threading.Thread = None
+_writer_lock = threading.Lock()
+_STOP = object()
+
+def configure(cfg: dict):
+    """Apply the optional `logging` section of config.yaml"""
+    global LOG_FILE, JSONL_FILE, CONSOLE, FLUSH_INTERVAL, BATCH_SIZE
+    LOG_FILE = cfg.get("file", LOG_FILE)
+    JSONL_FILE = cfg.get("jsonl_file", JSONL_FILE)
+    CONSOLE = cfg.get("console", CONSOLE)
+    FLUSH_INTERVAL = cfg.get("flush_interval_ms", FLUSH_INTERVAL * 1000) / 1000
+    BATCH_SIZE = cfg.get("batch_size", BATCH_SIZE)
+
+def log(msg: str, **fields):
+    """
+    Queue a log line; formatting and file I/O happen on a background writer thread.
+    Keyword fields (exchange, side, price, size, pnl, latency_ms, ...) are only
+    written to the JSONL log.
+    """
+    _queue.put((time.time(), msg, fields))
+    if _writer is None:
+        _start_writer()
+
+def flush():
+    """Block until everything logged so far has been written"""
+    if _writer is None:
+        return
+    done = threading.Event()
+    _queue.put(done)
+    done.wait()
+
+def shutdown():
+    """Flush and stop the writer thread. Logging afterwards starts a new writer."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            return
+        _queue.put(_STOP)
+        _writer.join()
+        _writer = None
+
+def _start_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_write_loop, name="logger", daemon=True)
+            _writer.start()
+
+def _json_value(value):
+    return value.value if isinstance(value, Enum) else str(value)
+
+def _write_batch(batch: list):
+    lines = []
+    records = []
+    for ts, msg, fields in batch:
+        lines.append(f"{datetime.fromtimestamp(ts).strftime('[%H:%M:%S]')} {msg}\n")
+        if JSONL_FILE:
+            records.append(json.dumps({"ts": ts, "msg": msg, **fields}, default=_json_value) + "\n")
+    text = "".join(lines)
+
+    if CONSOLE:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+    if LOG_FILE:
+        with open(LOG_FILE, "a", encoding="utf-8") as f:
+            f.write(text)
+    if records:
+        with open(JSONL_FILE, "a", encoding="utf-8") as f:
+            f.write("".join(records))
+
+def _write_loop():
+    batch = []
+    deadline = time.monotonic() + FLUSH_INTERVAL
+    while True:
+        try:
+            item = _queue.get(timeout=max(deadline - time.monotonic(), 0))
+        except queue.Empty:
+            item = None
+
+        if item is None or item is _STOP or isinstance(item, threading.Event):
+            pass
+        else:
+            batch.append(item)
+            if len(batch) < BATCH_SIZE and time.monotonic() < deadline:
+                continue
+
+        if batch:
+            try:
+                _write_batch(batch)
+            except Exception as e:
+                sys.stderr.write(f"[logger] failed to write {len(batch)} records: {e}\n")
+            batch = []
+        deadline = time.monotonic() + FLUSH_INTERVAL
+
+        if isinstance(item, threading.Event):
+            item.set()
+        elif item is _STOP:
+            return
+
+atexit.register(shutdown)
@@ -0,0 +1,154 @@
+import asyncio, bisect, time
+from aiohttp import web
+
+'''
+In-process latency metrics.
+
+    with span("exchange_request_seconds", exchange="Binance", endpoint="/fapi/v1/order"):
+        ...
+
+Every (name, labels) combination gets a Histogram with fixed log-spaced buckets,
+so recording is O(log buckets) with no per-sample allocation. MetricsServer
+serves them in the Prometheus text format and summary() renders p50/p99/max.
+'''
+
+# Bucket upper bounds in seconds: 10us to ~100s, four buckets per doubling (~19% wide)
+BUCKETS = [1e-5 * 2 ** (i / 4) for i in range(94)]
+# Every series exposes all of them, so the set of le values is the same on every scrape
+_LE = ['le="%.6g"' % bound for bound in BUCKETS] + ['le="+Inf"']
+
+class Histogram:
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Estimate by linear interpolation inside the bucket holding the q-th sample"""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                lower = BUCKETS[i - 1] if i > 0 else 0.0
+                upper = BUCKETS[i] if i < len(BUCKETS) else self.max
+                return min(lower + (upper - lower) * (rank - seen) / n, self.max)
+            seen += n
+        return self.max
+
+_histograms: dict[tuple[str, tuple], Histogram] = {}
+
+def histogram(name: str, **labels) -> Histogram:
+    key = (name, tuple(sorted(labels.items())))
+    hist = _histograms.get(key)
+    if hist is None:
+        hist = _histograms[key] = Histogram()
+    return hist
+
+def observe(name: str, seconds: float, **labels):
+    histogram(name, **labels).observe(seconds)
+
+class span:
+    """Context manager that records its wall time (perf_counter) into a histogram"""
+    __slots__ = ("hist", "start")
+
+    def __init__(self, name: str, **labels):
+        self.hist = histogram(name, **labels)
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.hist.observe(time.perf_counter() - self.start)
+        return False
+
+async def gather_legs(phase: str, *legs, return_exceptions: bool = False):
+    """
+    asyncio.gather for the legs of one paired operation. Records the phase duration as
+    strategy_phase_seconds{phase=...} and the gap between the first and last leg to
+    finish as leg_skew_seconds{phase=...}. With return_exceptions a failed leg's
+    exception is returned in its place, so the caller sees what the other legs did.
+    """
+    finished = []
+
+    async def timed(leg):
+        result = await leg
+        finished.append(time.perf_counter())
+        return result
+
+    with span("strategy_phase_seconds", phase=phase):
+        results = await asyncio.gather(*(timed(leg) for leg in legs), return_exceptions=return_exceptions)
+    if len(finished) > 1:
+        observe("leg_skew_seconds", max(finished) - min(finished), phase=phase)
+    return results
+
+def reset():
+    _histograms.clear()
+
+def _label_text(labels: tuple, extra: str = "") -> str:
+    parts = [f'{k}="{v}"' for k, v in labels]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+def render_prometheus() -> str:
+    lines = []
+    for name in sorted({name for name, _ in _histograms}):
+        lines.append(f"# TYPE {name} histogram")
+        for (metric, labels), hist in sorted(_histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for le, n in zip(_LE, hist.counts):
+                cumulative += n
+                lines.append(f"{name}_bucket{_label_text(labels, le)} {cumulative}")
+            lines.append(f"{name}_sum{_label_text(labels)} {hist.sum:.9f}")
+            lines.append(f"{name}_count{_label_text(labels)} {hist.count}")
+        lines.append(f"# TYPE {name}_max gauge")
+        for (metric, labels), hist in sorted(_histograms.items()):
+            if metric == name:
+                lines.append(f"{name}_max{_label_text(labels)} {hist.max:.9f}")
+    return "\n".join(lines) + "\n"
+
+def summary() -> list[str]:
+    """One line per histogram: count, p50, p99 and max in milliseconds"""
+    lines = []
+    for (name, labels), hist in sorted(_histograms.items()):
+        if hist.count:
+            lines.append(f"{name}{_label_text(labels)} n={hist.count} p50={hist.quantile(0.5) * 1e3:.2f}ms "
+                         f"p99={hist.quantile(0.99) * 1e3:.2f}ms max={hist.max * 1e3:.2f}ms")
+    return lines
+
+class MetricsServer:
+    """Serves /metrics in the Prometheus text format on a local port"""
+    def __init__(self, host: str = "127.0.0.1", port: int = 9108):
+        self.host = host
+        self.port = port
+        self._runner: web.AppRunner = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/metrics", self._metrics)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _metrics(self, request):
+        return web.Response(text=render_prometheus(), content_type="text/plain")
@@ -0,0 +1,279 @@
+import asyncio, contextlib, os, sys, threading, time, weakref
+from collections import Counter
+from contextvars import ContextVar
+from utils import metrics
+from utils.logger import log
+
+'''
+Opt-in production profiling, configured under `profiling:` in config.yaml.
+
+    profiler.start(cfg.get("profiling", {}))   # inside the running event loop
+    with profiler.cycle("BTC-USDT"):
+        ...
+
+Loop-block watchdog: a callback on the event loop stamps a heartbeat every quarter of
+block_threshold_ms and a watchdog thread compares it with the clock. Once the loop has not
+run for block_threshold_ms, the thread reads the loop thread's stack and logs the call site
+holding it, such as a synchronous SDK call made on the loop. The lateness of every
+heartbeat is recorded as event_loop_lag_seconds, and blocks as event_loop_block_seconds.
+
+Slow-cycle capture: while a cycle() is open the same thread samples, every sample_ms, what
+each of its tasks is doing: the loop thread's stack for the task that is running and the
+chain of awaited coroutines for those that are waiting. Anything else holding the loop,
+and executor threads running a work item (the Hyperliquid SDK), are sampled too and
+attributed to every open cycle. Tasks belong to a cycle through a task factory that tags
+each task created inside it, so its gather() legs are included. A cycle slower than
+cycle_budget_ms has its samples written as folded stacks (flamegraph.pl and speedscope
+read them) to dir, which keeps the newest max_files. Files are written by the watchdog
+thread, never on the loop, and nothing is sampled while no cycle is open.
+'''
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+EXECUTOR = os.path.join("concurrent", "futures", "thread.py")
+_scope: ContextVar["CycleScope"] = ContextVar("profiler_cycle", default=None)
+
+_labels: dict[tuple, str] = {}
+
+def _where(frame) -> str:
+    """function (path:line), with paths relative to the repository or site-packages"""
+    code = frame.f_code
+    key = (code, frame.f_lineno)
+    label = _labels.get(key)
+    if label is None:
+        path = code.co_filename
+        if path.startswith(ROOT + os.sep):
+            path = os.path.relpath(path, ROOT)
+        elif f"site-packages{os.sep}" in path:
+            path = path.split(f"site-packages{os.sep}", 1)[1]
+        else:
+            path = os.path.basename(path)
+        label = _labels[key] = f"{code.co_name} ({path}:{frame.f_lineno})"
+    return label
+
+def _stack(frame) -> list:
+    """Frames from the outermost call to frame"""
+    frames = []
+    while frame is not None:
+        frames.append(frame)
+        frame = frame.f_back
+    frames.reverse()
+    return frames
+
+def _after(frames: list, function: str, filename: str) -> list:
+    """The frames called from the innermost function in filename, or None if there is none"""
+    for i in range(len(frames) - 1, -1, -1):
+        code = frames[i].f_code
+        if code.co_name == function and code.co_filename.endswith(filename):
+            return frames[i + 1:]
+    return None
+
+def _awaiting(task: asyncio.Task) -> list[str]:
+    """Coroutine frames of a suspended task, outermost first"""
+    labels = []
+    awaitable = task.get_coro()
+    while awaitable is not None:
+        frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None)
+        if frame is None:  # A Future, whose owner shows up as its own task or thread
+            break
+        labels.append(_where(frame))
+        awaitable = getattr(awaitable, "cr_await", None) or getattr(awaitable, "gi_yieldfrom", None)
+    return labels
+
+class CycleScope:
+    """One open cycle: the tasks created inside it and the stack samples taken while it ran"""
+    __slots__ = ("profiler", "label", "started", "elapsed", "tasks", "samples", "token")
+
+    def __init__(self, profiler: "Profiler", label: str):
+        self.profiler = profiler
+        self.label = label
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        self.elapsed = None
+        self.tasks = weakref.WeakSet()
+        task = asyncio.current_task()
+        if task is not None:
+            self.tasks.add(task)
+        self.samples = Counter()
+        self.token = _scope.set(self)
+        self.profiler.scopes.add(self)
+        return self
+
+    def __exit__(self, *exc):
+        _scope.reset(self.token)
+        self.profiler.scopes.discard(self)
+        self.elapsed = time.perf_counter() - self.started
+        if self.elapsed > self.profiler.budget:
+            # Written by the watchdog thread, which also owns samples
+            self.profiler.finished.append(self)
+        return False
+
+class Profiler:
+    def __init__(self, cfg):
+        self.block_threshold = cfg.get("block_threshold_ms", 100) / 1000
+        self.check = self.block_threshold / 4
+        self.budget = cfg.get("cycle_budget_ms", 2000) / 1000
+        self.sample_interval = cfg.get("sample_ms", 10) / 1000
+        self.dir = cfg.get("dir", "profiles")
+        self.max_files = cfg.get("max_files", 50)
+
+        self.scopes: set[CycleScope] = set()     # Open cycles, changed on the loop thread only
+        self.finished: list[CycleScope] = []     # Slow cycles waiting to be written
+        self.loop: asyncio.AbstractEventLoop = None
+        self._loop_thread: int = None
+        self._factory = None
+        self._beat = time.monotonic()
+        self._blocked_at: str = None             # Call site of the block being reported
+        self._handle: asyncio.TimerHandle = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread = None
+
+    def start(self):
+        self.loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        os.makedirs(self.dir, exist_ok=True)
+        self._factory = self.loop.get_task_factory()
+        self.loop.set_task_factory(self._task_factory)
+        self._beat = time.monotonic()
+        self._handle = self.loop.call_later(self.check, self._heartbeat)
+        self._thread = threading.Thread(target=self._watch, name="profiler", daemon=True)
+        self._thread.start()
+        log(f"Profiling: loop blocks over {self.block_threshold * 1000:.0f} ms, cycles over {self.budget * 1000:.0f} ms to {self.dir}/")
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        if self._handle:
+            self._handle.cancel()
+        if self.loop and not self.loop.is_closed() and self.loop.get_task_factory() == self._task_factory:
+            self.loop.set_task_factory(self._factory)
+
+    def cycle(self, label: str) -> CycleScope:
+        return CycleScope(self, label)
+
+    def _task_factory(self, loop, coro, **kwargs):
+        task = self._factory(loop, coro, **kwargs) if self._factory else asyncio.Task(coro, loop=loop, **kwargs)
+        scope = _scope.get()
+        if scope is not None:
+            scope.tasks.add(task)
+        return task
+
+    def _heartbeat(self):
+        now = time.monotonic()
+        lag = max(now - self._beat - self.check, 0.0)
+        metrics.observe("event_loop_lag_seconds", lag)
+        if lag >= self.block_threshold:
+            metrics.observe("event_loop_block_seconds", lag)
+            log(f"[WARN] Event loop was blocked for {lag * 1000:.0f} ms" + (f" in {self._blocked_at}" if self._blocked_at else ""))
+        self._blocked_at = None
+        self._beat = now
+        self._handle = self.loop.call_later(self.check, self._heartbeat)
+
+    def _watch(self):
+        while not self._stop.wait(self.sample_interval if self.scopes else self.check):
+            try:
+                stalled = time.monotonic() - self._beat - self.check
+                blocked = stalled >= self.block_threshold and self._blocked_at is None
+                if blocked or self.scopes:
+                    frames = sys._current_frames()
+                    if blocked and self._loop_thread in frames:
+                        self._report_block(stalled, _stack(frames[self._loop_thread]))
+                    if self.scopes:
+                        self._sample(frames)
+                while self.finished:
+                    self._save(self.finished.pop())
+            except Exception as e:
+                log(f"[WARN] Profiler sample failed: {e}")
+        while self.finished:
+            self._save(self.finished.pop())
+
+    def _report_block(self, stalled: float, frames: list):
+        own = [f for f in frames if f.f_code.co_filename.startswith(ROOT + os.sep)]
+        site = _where(own[-1]) if own else _where(frames[-1])
+        innermost = _where(frames[-1])
+        self._blocked_at = site
+        path = self._write("block", "\n".join(_where(f) for f in frames) + "\n")
+        log(f"[WARN] Event loop blocked for {stalled * 1000:.0f} ms so far in {site}"
+            + (f", inside {innermost}" if innermost != site else "") + f" (stack in {path})")
+
+    def _sample(self, frames: dict):
+        loop_frames = _stack(frames.get(self._loop_thread))
+        innermost = loop_frames[-1].f_code if loop_frames else None
+        idle = innermost is None or (innermost.co_name == "select" and innermost.co_filename.endswith("selectors.py"))
+        running = None if idle else asyncio.current_task(self.loop)
+        running_stack = None if idle else ";".join(_where(f) for f in _after(loop_frames, "_run", "events.py") or loop_frames)
+
+        scopes = list(self.scopes)
+        owned = set()
+        for scope in scopes:
+            try:
+                owned.update(scope.tasks)
+            except RuntimeError:  # Changed on the loop thread while being read
+                pass
+        shared = []
+        if running_stack and running not in owned:
+            shared.append(f"[loop];{running_stack}")
+        for ident, frame in frames.items():
+            if ident == self._loop_thread or ident == threading.get_ident():
+                continue
+            # Executor threads only count while they run a work item
+            work = _after(_stack(frame), "run", EXECUTOR)
+            if work:
+                thread = threading._active.get(ident)
+                shared.append(f"[thread {thread.name if thread else ident}];" + ";".join(_where(f) for f in work))
+
+        for scope in scopes:
+            samples = scope.samples
+            for task in list(owned):
+                if task.done() or task not in scope.tasks:
+                    continue
+                if task is running:
+                    samples[f"[running];{running_stack}"] += 1
+                else:
+                    samples["[awaiting];" + ";".join(_awaiting(task))] += 1
+            for stack in shared:
+                samples[stack] += 1
+
+    def _save(self, scope: CycleScope):
+        if not scope.samples:
+            return
+        lines = "".join(f"{stack} {count}\n" for stack, count in scope.samples.most_common())
+        path = self._write(f"cycle-{scope.label}-{scope.elapsed * 1000:.0f}ms", lines, ".folded")
+        log(f"[WARN] {scope.label} cycle took {scope.elapsed * 1000:.0f} ms (budget {self.budget * 1000:.0f} ms), "
+            f"{sum(scope.samples.values())} samples in {path}")
+
+    def _write(self, kind: str, text: str, ext: str = ".txt") -> str:
+        """Write one profile file named after the time and kind, then drop the oldest beyond max_files"""
+        now = time.time()
+        name = time.strftime("%Y%m%d-%H%M%S", time.localtime(now)) + f".{int(now * 1000) % 1000:03d}-{kind}".replace(os.sep, "_") + ext
+        path = os.path.join(self.dir, name)
+        with open(path, "w") as f:
+            f.write(text)
+        files = sorted((os.path.join(self.dir, n) for n in os.listdir(self.dir)), key=os.path.getmtime)
+        for old in files[:max(len(files) - self.max_files, 0)]:
+            os.remove(old)
+        return path
+
+_profiler: Profiler = None
+_NOT_PROFILED = contextlib.nullcontext()
+
+def start(cfg: dict) -> Profiler:
+    """Start profiling the running event loop when cfg has enabled: true"""
+    global _profiler
+    if not cfg.get("enabled", False) or _profiler is not None:
+        return _profiler
+    _profiler = Profiler(cfg)
+    _profiler.start()
+    return _profiler
+
+def stop():
+    global _profiler
+    if _profiler is not None:
+        _profiler.stop()
+        _profiler = None
+
+def cycle(label: str):
+    """Context manager around one strategy cycle; a no-op unless profiling was started"""
+    return _profiler.cycle(label) if _profiler is not None else _NOT_PROFILED
@@ -0,0 +1,113 @@
+import asyncio, heapq, time
+from enum import IntEnum
+from itertools import count
+
+class Priority(IntEnum):
+    """Lower value is served first. Orders and closes never wait behind metadata calls."""
+    ORDER = 0
+    INFO = 1
+
+class TokenBucket:
+    """Refills `capacity` tokens evenly over `period` seconds"""
+    def __init__(self, capacity: float, period: float):
+        self.capacity = capacity
+        self.period = period
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.capacity / self.period)
+        self.updated = now
+
+    def wait_time(self, cost: float) -> float:
+        """Seconds until `cost` tokens are available (0 if they are now)"""
+        if cost <= 0:
+            return 0
+        missing = cost - self.tokens
+        return 0 if missing <= 0 else missing * self.period / self.capacity
+
+    def sync_used(self, used: float):
+        """Trust the exchange's own usage count when it is higher than our estimate"""
+        self.tokens = min(self.tokens, self.capacity - used)
+
+class RateLimiter:
+    """
+    Token buckets for one exchange with a priority queue in front of them.
+    acquire() waits instead of failing; only the highest-priority waiter may take
+    tokens, so a queued order is always sent before any queued informational call.
+    """
+    def __init__(self, buckets: dict[str, TokenBucket]):
+        self.buckets = buckets
+        self.paused_until = 0.0
+        self.share = 1.0   # Fraction of the venue's limits this process may use, see scale()
+        self._waiting: list[tuple[int, int]] = []
+        self._seq = count()
+        self._changed = asyncio.Event()
+
+    async def acquire(self, priority: Priority, **costs: float):
+        ticket = (int(priority), next(self._seq))
+        heapq.heappush(self._waiting, ticket)
+        try:
+            while True:
+                wait = None
+                if self._waiting[0] == ticket:
+                    wait = self._wait_time(costs)
+                    if wait <= 0:
+                        heapq.heappop(self._waiting)
+                        for name, cost in costs.items():
+                            self.buckets[name].tokens -= cost
+                        self._notify()
+                        return
+                changed = self._changed
+                try:
+                    await asyncio.wait_for(changed.wait(), timeout=wait)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            if ticket in self._waiting:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._notify()
+            raise
+
+    def pause(self, seconds: float):
+        """Stop handing out tokens, e.g. after a 429 with Retry-After"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+        self._notify()
+
+    def scale(self, share: float):
+        """
+        Keep only share of every bucket, for processes that split one account's limits.
+        Usage reported by the exchange covers all of them and is counted at the same share.
+        """
+        self.share = share
+        for bucket in self.buckets.values():
+            bucket.capacity *= share
+            bucket.tokens = min(bucket.tokens, bucket.capacity)
+
+    def sync_used(self, name: str, used: float):
+        if name in self.buckets:
+            self.buckets[name].refill(time.monotonic())
+            self.buckets[name].sync_used(used * self.share)
+
+    def headroom(self) -> dict[str, float]:
+        """Fraction of each bucket currently available, 0.0 (exhausted) to 1.0 (idle)"""
+        now = time.monotonic()
+        result = {}
+        for name, bucket in self.buckets.items():
+            bucket.refill(now)
+            result[name] = max(bucket.tokens, 0) / bucket.capacity
+        return result
+
+    def _wait_time(self, costs: dict[str, float]) -> float:
+        now = time.monotonic()
+        wait = self.paused_until - now
+        for name, cost in costs.items():
+            bucket = self.buckets[name]
+            bucket.refill(now)
+            wait = max(wait, bucket.wait_time(cost))
+        return wait
+
+    def _notify(self):
+        self._changed.set()
+        self._changed = asyncio.Event()
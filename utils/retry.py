@@ -0,0 +1,107 @@
+import asyncio, random, uuid
+from utils import metrics
+from utils.logger import log
+
+'''
+Deadlines, bounded retries and hedged requests for exchange calls.
+
+    policy = RetryPolicy(cfg.get("timeouts", {}))
+    data = await policy.retry(lambda: fetch(), "ticker/price", retry_on=(asyncio.TimeoutError,))
+    data = await policy.hedged(lambda: fetch(), "ticker/price", budget=policy.hedge_budget(...))
+
+Each helper takes a zero-argument function returning a fresh coroutine, since a
+retried or hedged call needs a new one for every attempt.
+'''
+
+class TransientError(Exception):
+    """A failure that is safe to retry, e.g. a venue reporting an internal error or an unknown order status"""
+
+def client_order_id() -> str:
+    """Unique client order ID (Binance allows up to 36 characters)"""
+    return f"dn-{uuid.uuid4().hex[:32]}"
+
+class RetryPolicy:
+    """
+    Per-exchange limits from the `timeouts:` config section:
+    request_seconds bounds one HTTP attempt, read/order_deadline_seconds bound a whole
+    operation including its retries, attempts caps how often it is tried, and backoff
+    is exponential with full jitter between backoff_ms and max_backoff_ms. Reads are
+    hedged once they have taken longer than the hedge_quantile of their own latency
+    history (hedge_after_ms until enough samples exist).
+    """
+    def __init__(self, cfg):
+        self.request_timeout = cfg.get("request_seconds", 5)
+        self.read_deadline = cfg.get("read_deadline_seconds", 10)
+        self.order_deadline = cfg.get("order_deadline_seconds", 15)
+        self.attempts = cfg.get("attempts", 3)
+        self.backoff = cfg.get("backoff_ms", 100) / 1000
+        self.max_backoff = cfg.get("max_backoff_ms", 2000) / 1000
+        self.hedge = cfg.get("hedge", True)
+        self.hedge_after = cfg.get("hedge_after_ms", 300) / 1000
+        self.hedge_quantile = cfg.get("hedge_quantile", 0.95)
+        self.hedge_min_samples = cfg.get("hedge_min_samples", 20)
+
+    def delay(self, attempt: int) -> float:
+        """Full-jitter backoff before the given retry (1 = first retry)"""
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** (attempt - 1)))
+
+    def hedge_budget(self, name: str, **labels) -> float:
+        """How long to wait for a read before sending a second copy"""
+        hist = metrics.histogram(name, **labels)
+        if hist.count < self.hedge_min_samples:
+            return self.hedge_after
+        return hist.quantile(self.hedge_quantile)
+
+    async def retry(self, call, what: str, retry_on: tuple = (asyncio.TimeoutError,), deadline: float = None, recover=None):
+        """
+        Run call() until it succeeds, raises something not in retry_on, runs out of
+        attempts or would sleep past the deadline (read_deadline by default). Before
+        giving up, recover() (if given) gets one request_seconds to return a result
+        instead, e.g. an order the last attempt placed before it was cut off.
+        """
+        loop = asyncio.get_running_loop()
+        end = loop.time() + (deadline if deadline is not None else self.read_deadline)
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return await asyncio.wait_for(call(), max(end - loop.time(), 0))
+            except retry_on as e:
+                wait = self.delay(attempt)
+                if attempt >= self.attempts or loop.time() + wait >= end:
+                    if recover is not None:
+                        try:
+                            found = await asyncio.wait_for(recover(), self.request_timeout)
+                        except Exception as lookup_error:
+                            log(f"[WARN] {what} final lookup failed ({lookup_error!r})")
+                            found = None
+                        if found is not None:
+                            return found
+                    raise Exception(f"{what} failed after {attempt} attempts: {e!r}")
+                log(f"[WARN] {what} attempt {attempt} failed ({e!r}), retrying in {wait * 1000:.0f}ms")
+                await asyncio.sleep(wait)
+
+    async def hedged(self, call, what: str, budget: float):
+        """
+        Start call(); if it has not answered within budget seconds, start a second one
+        and return whichever succeeds first. Only for idempotent reads.
+        """
+        if not self.hedge:
+            return await call()
+        tasks = {asyncio.ensure_future(call())}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=budget)
+            if not done:
+                metrics.observe("hedge_budget_seconds", budget, request=what)
+                tasks.add(asyncio.ensure_future(call()))
+            error = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()